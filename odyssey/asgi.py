@@ -2,6 +2,8 @@
 ASGI config for odyssey project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+This is the entry point served in production: the live board event stream
+(``tickets.views_live.board_events``) needs an async server to stay open.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -60,6 +61,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'tickets.context_processors.active_theme',
             ],
         },
     },
@@ -115,3 +117,24 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Live board updates (server-sent events, served by odyssey.asgi).
+# InProcessBroker fans out within one worker; use
+# 'tickets.live.DatabasePollingBroker' when running several workers.
+TICKETS_LIVE_BROKER = os.environ.get('TICKETS_LIVE_BROKER', 'tickets.live.InProcessBroker')
+
+# Activity logging. Off: each change inserts its activity row in the request.
+# On: each worker buffers rows and bulk-writes them every
+# TICKETS_ACTIVITY_FLUSH_INTERVAL seconds or TICKETS_ACTIVITY_BUFFER_SIZE rows;
+# buffered rows are journaled next to TICKETS_ACTIVITY_SPOOL (so a killed worker's
+# rows are replayed by the others) and rows that cannot be written are kept in
+# the spool and retried.
+TICKETS_ACTIVITY_WRITE_BEHIND = os.environ.get('TICKETS_ACTIVITY_WRITE_BEHIND') == '1'
+TICKETS_ACTIVITY_BUFFER_SIZE = 200
+TICKETS_ACTIVITY_FLUSH_INTERVAL = 2.0
+TICKETS_ACTIVITY_SPOOL = os.environ.get('TICKETS_ACTIVITY_SPOOL', str(BASE_DIR / 'activity_spool.jsonl'))
+
+# Activity retention: `manage.py archive_activity` moves activities older than
+# this many days into gzipped JSON-lines files here (see tickets/retention.py).
+TICKETS_ACTIVITY_RETENTION_DAYS = 90
+TICKETS_ACTIVITY_ARCHIVE_DIR = os.environ.get('TICKETS_ACTIVITY_ARCHIVE_DIR', str(BASE_DIR / 'archive'))
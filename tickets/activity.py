@@ -0,0 +1,269 @@
+"""Activity logging for single-ticket mutations, optionally write-behind.
+
+``record_activity`` is what views call after changing a ticket. With
+``settings.TICKETS_ACTIVITY_WRITE_BEHIND`` off (the default, and what the
+test suite runs) it inserts the row right away. With it on, each worker
+buffers rows once their transaction commits and an ``ActivityWriter`` writes
+them with one ``bulk_create`` and one version bump per board when:
+
+* ``TICKETS_ACTIVITY_BUFFER_SIZE`` rows are waiting (on the request thread
+  that fills the buffer), or
+* the oldest row has waited ``TICKETS_ACTIVITY_FLUSH_INTERVAL`` seconds (on
+  a background thread), or
+* the worker exits (``atexit``).
+
+With ``TICKETS_ACTIVITY_SPOOL`` set, every buffered row is also appended
+to the worker's journal (``<spool>.<pid>``, JSON lines) as it is buffered,
+and the journal is discarded once its rows are written. A flush that fails
+appends its rows to the shared spool instead of dropping them; the next
+flush replays the spool first, along with the journals of workers that
+died (e.g. SIGKILL) before flushing. The journal isn't fsynced per row, so
+only a crash of the whole machine can lose rows that were still buffered.
+
+Buffered rows take their board version when written, so delta-sync clients
+see them up to one flush interval late.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Board, Ticket, TicketActivity
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER_SIZE = 200
+DEFAULT_FLUSH_INTERVAL = 2.0
+
+
+def write_behind_enabled():
+    return getattr(settings, 'TICKETS_ACTIVITY_WRITE_BEHIND', False)
+
+
+def record_activity(ticket, user, activity_type, description):
+    """Log an activity on ``ticket``: now, or buffered once the transaction commits."""
+    if not write_behind_enabled():
+        return TicketActivity.objects.create(
+            ticket=ticket, user=user, activity_type=activity_type, description=description,
+        )
+    entry = {
+        'board_id': ticket.board_id,
+        'ticket_id': ticket.pk,
+        'user_id': getattr(user, 'pk', None),
+        'activity_type': activity_type,
+        'description': description,
+        'timestamp': timezone.now().isoformat(),
+    }
+    # A rolled-back request leaves no activity behind, same as the direct insert.
+    transaction.on_commit(lambda: get_writer().add(entry))
+    return None
+
+
+def write_activities(entries):
+    """Insert buffered entries: one version bump per board, one ``bulk_create``."""
+    by_board = defaultdict(list)
+    for entry in entries:
+        by_board[entry['board_id']].append(entry)
+    rows = []
+    with transaction.atomic():
+        # A ticket deleted before the flush keeps its trail, unlinked (as SET_NULL would).
+        live = set(Ticket.objects.filter(id__in={e['ticket_id'] for e in entries}).values_list('id', flat=True))
+        for board_id, board_entries in by_board.items():
+            seq = (Board.bump_version(board_id) or 0) if board_id is not None else 0
+            rows.extend(
+                TicketActivity(
+                    ticket_id=entry['ticket_id'] if entry['ticket_id'] in live else None,
+                    board_id=board_id,
+                    user_id=entry['user_id'],
+                    activity_type=entry['activity_type'],
+                    description=entry['description'],
+                    timestamp=datetime.fromisoformat(entry['timestamp']),
+                    change_seq=seq,
+                )
+                for entry in board_entries
+            )
+        return TicketActivity.objects.bulk_create(rows, batch_size=DEFAULT_BUFFER_SIZE)
+
+
+class ActivityWriter:
+    """Per-process buffer of activity entries, flushed by size, age or exit.
+
+    ``interval=None`` disables the background thread; flushes then happen
+    only on size, ``flush()`` and ``close()``.
+    """
+
+    def __init__(self, max_size=DEFAULT_BUFFER_SIZE, interval=DEFAULT_FLUSH_INTERVAL, spool_path=None):
+        self.max_size = max_size
+        self.interval = interval
+        self.spool_path = spool_path
+        self._entries = []
+        self._oldest = None
+        self._journal = None
+        self._lock = threading.Lock()
+        # Serialises flushes so the spool is never replayed twice.
+        self._flush_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, entry):
+        with self._lock:
+            self._entries.append(entry)
+            self._journal_write(entry)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            full = len(self._entries) >= self.max_size
+        self._ensure_thread()
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Write everything buffered (and spooled); returns the number of rows written."""
+        with self._flush_lock:
+            claimed, spooled = self._claim_spool()
+            with self._lock:
+                entries, self._entries, self._oldest = self._entries, [], None
+                journal = self._rotate_journal()
+            done = claimed + ([journal] if journal else [])
+            batch = spooled + entries
+            if batch:
+                try:
+                    write_activities(batch)
+                except Exception:
+                    logger.exception('Could not write %d activities; spooling them', len(batch))
+                    self._spool(batch)
+                    batch = []
+            # Only once the rows are in the database or the spool.
+            for path in done:
+                os.remove(path)
+            return len(batch)
+
+    def close(self):
+        """Stop the background thread and write what is left."""
+        self._stopped.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.interval)
+        self.flush()
+
+    def _journal_path(self):
+        return f'{self.spool_path}.{os.getpid()}'
+
+    def _held_path(self):
+        """A fresh name for a file this worker has taken over."""
+        return f'{self.spool_path}.{os.getpid()}.{uuid.uuid4().hex}'
+
+    def _journal_write(self, entry):
+        if not self.spool_path:
+            return
+        if self._journal is None:
+            path = self._journal_path()
+            if os.path.exists(path):
+                # Left by an earlier worker with the same pid; replayed by the next flush.
+                os.replace(path, self._held_path())
+            self._journal = open(path, 'a', encoding='utf-8')
+        self._journal.write(json.dumps(entry) + '\n')
+        self._journal.flush()
+
+    def _rotate_journal(self):
+        """Move the journal aside; its rows are the ones just taken from the buffer."""
+        if self._journal is None:
+            return None
+        self._journal.close()
+        self._journal = None
+        held = self._held_path()
+        os.replace(self._journal_path(), held)
+        return held
+
+    def _claim_spool(self):
+        """Take over the shared spool and every file left by dead workers, and read them.
+
+        Each file is renamed first, so two workers never replay the same one.
+        """
+        if not self.spool_path:
+            return [], []
+        directory, name = os.path.split(self.spool_path)
+        candidates = [self.spool_path]
+        for filename in os.listdir(directory or '.'):
+            owner = filename[len(name) + 1:].split('.')[0] if filename.startswith(f'{name}.') else ''
+            if owner.isdigit() and (int(owner) == os.getpid() or not _pid_alive(int(owner))):
+                path = os.path.join(directory, filename)
+                if path != self._journal_path():
+                    candidates.append(path)
+        claimed, entries = [], []
+        for path in candidates:
+            held = self._held_path()
+            try:
+                os.replace(path, held)
+            except FileNotFoundError:
+                continue
+            claimed.append(held)
+            with open(held, encoding='utf-8') as spool:
+                entries.extend(json.loads(line) for line in spool if line.strip())
+        return claimed, entries
+
+    def _spool(self, entries):
+        if not self.spool_path:
+            logger.error('No TICKETS_ACTIVITY_SPOOL configured; %d activities lost', len(entries))
+            return
+        with open(self.spool_path, 'a', encoding='utf-8') as spool:
+            for entry in entries:
+                spool.write(json.dumps(entry) + '\n')
+            spool.flush()
+            os.fsync(spool.fileno())
+
+    def _ensure_thread(self):
+        if self.interval is None or self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='activity-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval / 2):
+            oldest = self._oldest
+            if oldest is not None and time.monotonic() - oldest >= self.interval:
+                try:
+                    self.flush()
+                finally:
+                    # This thread's connection would otherwise stay open between flushes.
+                    connection.close()
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = ActivityWriter(
+                    max_size=getattr(settings, 'TICKETS_ACTIVITY_BUFFER_SIZE', DEFAULT_BUFFER_SIZE),
+                    interval=getattr(settings, 'TICKETS_ACTIVITY_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL),
+                    spool_path=getattr(settings, 'TICKETS_ACTIVITY_SPOOL', None),
+                )
+                atexit.register(_writer.close)
+    return _writer
@@ -1,12 +1,50 @@
 from django import forms
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.auth.models import User
+from django.db import router, transaction
 from django.utils.safestring import mark_safe
 
-from .models import Board, Ticket, TicketActivity
+from .admin_scale import AutocompleteFilter, ScalableAdminMixin
+from .audit import ActivityLog, bulk_delete_tickets, bulk_update_tickets, describe_changes
+from .models import Board, Ticket, TicketActivity, TicketActivitySummary
+from .search import search_tokens, ticket_search_filter
+
+
+class ActivityTypeFilter(admin.SimpleListFilter):
+    """Activity type choices from the model, not a DISTINCT over the whole log."""
+    title = 'activity type'
+    parameter_name = 'activity_type'
+
+    def lookups(self, request, model_admin):
+        return [(t, t.capitalize()) for t in TicketActivity.ACTIVITY_TYPES]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(activity_type=self.value())
+        return queryset
+
+
 @admin.register(TicketActivity)
-class TicketActivityAdmin(admin.ModelAdmin):
+class TicketActivityAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'ticket', 'user', 'activity_type', 'timestamp')
-    list_filter = ('user', 'activity_type', 'ticket')
+    list_filter = (('user', AutocompleteFilter), ActivityTypeFilter, ('ticket', AutocompleteFilter))
+    list_select_related = ('ticket', 'user')
+    autocomplete_fields = ('ticket', 'user')
+
+
+@admin.register(TicketActivitySummary)
+class TicketActivitySummaryAdmin(ScalableAdminMixin, admin.ModelAdmin):
+    """Read-only history of archived activity (see ``archive_activity``)."""
+    list_display = ('day', 'ticket', 'board', 'activity_type', 'count', 'last_at')
+    list_filter = (('board', AutocompleteFilter), ActivityTypeFilter, ('ticket', AutocompleteFilter))
+    list_select_related = ('ticket', 'board')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
 
 
 class MatrixWidget(forms.Select):
@@ -138,76 +176,96 @@ class BoardAdmin(admin.ModelAdmin):
     list_display = ('id', 'name', 'created_at')
     search_fields = ('name',)
 
+class TicketActionForm(ActionForm):
+    assignee = forms.CharField(required=False, label='Assignee username')
+
+
+def _set_field_action(field, value, label):
+    """Admin action setting ``field`` to ``value`` on the whole selection in bulk."""
+    def action(modeladmin, request, queryset):
+        changed = bulk_update_tickets(queryset, request.user, **{field: value})
+        modeladmin.message_user(request, f'Set {field} to {label} on {changed} ticket(s).')
+    action.__name__ = f'set_{field}_{value}'
+    return admin.action(description=f'Set {field} to {label}')(action)
+
+
 @admin.register(Ticket)
-class TicketAdmin(admin.ModelAdmin):
+class TicketAdmin(ScalableAdminMixin, admin.ModelAdmin):
     form = TicketAdminForm
+    action_form = TicketActionForm
+    actions = [
+        *(_set_field_action('status', value, label) for value, label in Ticket.STATUS_CHOICES),
+        *(_set_field_action('priority', value, label) for value, label in Ticket.PRIORITY_CHOICES),
+        'assign_to_user', 'unassign',
+    ]
     list_display = (
         'id', 'title', 'status', 'priority', 'importance', 'urgency', 'priority_score', 'ticket_type', 'parent', 'board',
         'assignee', 'updated_by', 'created_at', 'updated_at'
     )
     list_editable = ('status', 'priority', 'importance', 'urgency')
     list_filter = (
-        'status', 'priority', 'importance', 'urgency', 'ticket_type', 'board', 'updated_by',
+        'status', 'priority', 'importance', 'urgency', 'ticket_type',
+        ('board', AutocompleteFilter), ('updated_by', AutocompleteFilter),
         ('parent', admin.EmptyFieldListFilter),  # filter for has/has not parent
     )
+    list_select_related = ('parent', 'board', 'assignee', 'updated_by')
+    autocomplete_fields = ('parent', 'board', 'assignee', 'updated_by', 'related_tickets')
+    # Kept so the changelist shows a search box; matching goes through the full-text index.
     search_fields = ('title', 'description')
 
-    def priority_score(self, obj):
-        return obj.importance * obj.urgency
-    priority_score.short_description = 'Prio Score'
+    def get_search_results(self, request, queryset, search_term):
+        if not search_tokens(search_term):
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(ticket_search_filter(search_term)), False
+
+    def changelist_view(self, request, extra_context=None):
+        if request.method != 'POST':
+            return super().changelist_view(request, extra_context)
+        # list_editable saves queue their activities here; one bulk_create at the end.
+        # Django's own save block nests inside this one, so the edits and their
+        # audit rows commit (or roll back) together.
+        request._activity_log = ActivityLog(request.user)
+        with transaction.atomic(using=router.db_for_write(self.model)):
+            response = super().changelist_view(request, extra_context)
+            if response.status_code == 302:
+                request._activity_log.flush()
+            else:
+                # An invalid formset saved nothing
+                request._activity_log.clear()
+        return response
 
     def save_model(self, request, obj, form, change):
-        if change:  # If this is an edit of an existing object
-            old_obj = self.model.objects.get(pk=obj.pk)
-            changed_fields = []
-            
-            # Check which fields have changed
-            for field in ['status', 'priority', 'importance', 'urgency', 'ticket_type', 'parent', 'assignee', 'title', 'description']:
-                old_value = getattr(old_obj, field)
-                new_value = getattr(obj, field)
-                if old_value != new_value:
-                    changed_fields.append(f"{field}: {old_value} → {new_value}")
-
-            # Set updated_by
-            obj.updated_by = request.user
-            obj.save()
-
-            # Create activity log if fields changed
-            if changed_fields:
-                details = "Changed " + ", ".join(changed_fields)
-                TicketActivity.objects.create(
-                    ticket=obj,
-                    user=request.user,
-                    action='edited',
-                    details=details
-                )
-        else:  # This is a new ticket
-            obj.updated_by = request.user
-            obj.save()
-            TicketActivity.objects.create(
-                ticket=obj,
-                user=request.user,
-                action='created',
-                details='Ticket created'
-            )
+        obj.updated_by = request.user
+        # Diffed against the values loaded with the row; save() then writes only those columns
+        changes = obj.audited_changes()
+        obj.save()
+        log = getattr(request, '_activity_log', None) or ActivityLog(request.user)
+        if change:
+            description = describe_changes(changes)
+            if description:
+                log.add(obj.board_id, obj.pk, 'updated', description)
+        else:
+            log.add(obj.board_id, obj.pk, 'created', f'Created {obj.ticket_type} {obj.title}')
+        if log is not getattr(request, '_activity_log', None):
+            log.flush()
 
     def delete_model(self, request, obj):
-        # Log deletion before deleting the ticket
-        TicketActivity.objects.create(
-            ticket=obj,
-            user=request.user,
-            action='deleted',
-            details='Ticket deleted'
-        )
-        super().delete_model(request, obj)
+        bulk_delete_tickets(Ticket.objects.filter(pk=obj.pk), request.user)
 
     def delete_queryset(self, request, queryset):
-        # Log bulk deletions
-        for obj in queryset:
-            TicketActivity.objects.create(
-                ticket=obj,
-                user=request.user,
-                action='deleted',
-                details='Ticket deleted in bulk operation'
-            )
-        super().delete_queryset(request, queryset)
+        bulk_delete_tickets(queryset, request.user)
+
+    @admin.action(description='Assign selected tickets to the user named above')
+    def assign_to_user(self, request, queryset):
+        username = request.POST.get('assignee', '').strip()
+        user = User.objects.filter(username=username).first() if username else None
+        if user is None:
+            self.message_user(request, f'No user named "{username}".', messages.ERROR)
+            return
+        changed = bulk_update_tickets(queryset, request.user, assignee=user)
+        self.message_user(request, f'Assigned {changed} ticket(s) to {user.username}.')
+
+    @admin.action(description='Unassign selected tickets')
+    def unassign(self, request, queryset):
+        changed = bulk_update_tickets(queryset, request.user, assignee=None)
+        self.message_user(request, f'Unassigned {changed} ticket(s).')
@@ -0,0 +1,181 @@
+"""Changelist building blocks for admin pages over very large tables.
+
+The stock changelist counts the whole table, renders every related row in
+each FK filter sidebar and pages with ``OFFSET``. ``ScalableAdminMixin``
+replaces those with:
+
+* ``AutocompleteFilter`` -- FK filters that only render the selected value
+  and look others up through the admin's own autocomplete endpoint;
+* ``ApproximateCountPaginator`` -- an exact count up to a threshold, a
+  catalogue estimate beyond it;
+* ``KeysetChangeList`` -- "next page" links that continue below the last
+  primary key shown instead of skipping rows with ``OFFSET``.
+"""
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max
+from django.urls import reverse
+from django.utils.functional import cached_property
+
+DEFAULT_APPROXIMATE_COUNT_THRESHOLD = 10_000
+CURSOR_VAR = 'cursor'
+
+
+def approximate_count_threshold():
+    return getattr(settings, 'ADMIN_APPROXIMATE_COUNT_THRESHOLD', DEFAULT_APPROXIMATE_COUNT_THRESHOLD)
+
+
+def estimated_row_count(model, using='default'):
+    """Cheap estimate of a table's size: planner statistics or the highest id."""
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [model._meta.db_table])
+            row = cursor.fetchone()
+        if row and row[0] > 0:
+            return row[0]
+    # Ids are handed out in order, so the largest one bounds the row count (one index probe).
+    return model._base_manager.using(using).aggregate(top=Max('pk'))['top'] or 0
+
+
+class ApproximateCountPaginator(Paginator):
+    """Paginator whose ``count`` never scans more than the threshold of rows.
+
+    Below the threshold the count is exact. Above it, an unfiltered changelist
+    reports the table estimate and a filtered one reports the threshold;
+    ``approximate`` tells the template to say "about".
+    """
+
+    approximate = False
+
+    @cached_property
+    def count(self):
+        threshold = approximate_count_threshold()
+        queryset = self.object_list
+        capped = queryset.order_by()[:threshold + 1].count()
+        if capped <= threshold:
+            return capped
+        self.approximate = True
+        if not queryset.query.where:
+            return max(estimated_row_count(queryset.model, queryset.db), capped)
+        return threshold
+
+
+class KeysetChangeList(ChangeList):
+    """Changelist paged by primary key rather than page number.
+
+    While the list is in its default newest-first order, ``?cursor=<pk>``
+    shows the rows just below that key; a column sort falls back to the
+    regular numbered pages.
+    """
+
+    def __init__(self, request, *args, **kwargs):
+        self.cursor = None
+        self.next_cursor = None
+        raw = request.GET.get(CURSOR_VAR)
+        if raw:
+            try:
+                self.cursor = int(raw)
+            except ValueError:
+                self.cursor = None
+        super().__init__(request, *args, **kwargs)
+        # Filter, search and sort links start again from the first page
+        self.params.pop(CURSOR_VAR, None)
+
+    @property
+    def keyset(self):
+        return ORDER_VAR not in self.params
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_ordering(self, request, queryset):
+        if self.keyset:
+            return ['-pk']
+        return super().get_ordering(request, queryset)
+
+    def get_results(self, request):
+        if not self.keyset:
+            super().get_results(request)
+            self.approximate_count = getattr(self.paginator, 'approximate', False)
+            return
+        paginator = self.model_admin.get_paginator(request, self.queryset, self.list_per_page)
+        page = self.queryset
+        if self.cursor is not None:
+            page = page.filter(pk__lt=self.cursor)
+        ids = list(page.values_list('pk', flat=True)[:self.list_per_page + 1])
+        if len(ids) > self.list_per_page:
+            ids = ids[:self.list_per_page]
+            self.next_cursor = ids[-1]
+        # Still a queryset (not a list) so list_editable formsets keep working
+        self.result_list = self.queryset.filter(pk__in=ids)
+        self.result_count = paginator.count
+        self.approximate_count = paginator.approximate
+        self.show_full_result_count = False
+        self.full_result_count = None
+        self.show_admin_actions = True
+        self.can_show_all = False
+        self.multi_page = self.next_cursor is not None or self.cursor is not None
+        self.paginator = paginator
+
+    def next_page_url(self):
+        if self.next_cursor is None:
+            return None
+        return self.get_query_string({CURSOR_VAR: self.next_cursor})
+
+    def first_page_url(self):
+        return self.get_query_string(remove=[CURSOR_VAR])
+
+
+class AutocompleteFilter(admin.RelatedFieldListFilter):
+    """FK filter that renders only the chosen object plus a typeahead box.
+
+    Matches come from the admin's autocomplete view, so the related model's
+    admin must define ``search_fields``.
+    """
+
+    template = 'admin/tickets/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.source_model = model
+        super().__init__(field, request, params, model, model_admin, field_path)
+
+    def field_choices(self, field, request, model_admin):
+        if not self.lookup_val:
+            return []
+        related = field.remote_field.model._default_manager.filter(pk=self.lookup_val)
+        try:
+            return [(obj.pk, str(obj)) for obj in related]
+        except (ValueError, TypeError):
+            return []
+
+    def has_output(self):
+        return True
+
+    @property
+    def autocomplete_url(self):
+        return reverse('admin:autocomplete')
+
+    @property
+    def autocomplete_params(self):
+        return {
+            'app_label': self.source_model._meta.app_label,
+            'model_name': self.source_model._meta.model_name,
+            'field_name': self.field.name,
+        }
+
+
+class ScalableAdminMixin:
+    """Keyset paging and bounded counts; pair with ``list_select_related`` and ``AutocompleteFilter``."""
+
+    change_list_template = 'admin/tickets/scalable_change_list.html'
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
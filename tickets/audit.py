@@ -0,0 +1,109 @@
+"""Audit trail for set-based ticket changes.
+
+``ActivityLog`` buffers activity rows and writes them with one
+``bulk_create``, stamping each board's rows with a single version bump.
+``bulk_update_tickets`` and ``bulk_delete_tickets`` change a whole queryset
+with a handful of statements and log one activity per ticket through it.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from .live import publish_on_commit
+from .models import Board, Ticket, TicketActivity
+
+AUDIT_BATCH_SIZE = 500
+
+
+def _chunks(ids, size=AUDIT_BATCH_SIZE):
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def describe_changes(changes):
+    """``field=old→new`` pairs of a ``{field: (old, new)}`` diff, joined the way ticket edits are logged."""
+    return '; '.join(f'{k}={old}→{new}' for k, (old, new) in changes.items() if old != new)
+
+
+class ActivityLog:
+    """Collects activity rows and writes them in one ``bulk_create``."""
+
+    def __init__(self, user):
+        self.user = user
+        self.entries = []
+
+    def add(self, board_id, ticket_id, activity_type, description):
+        """Queue a row; ``ticket_id`` is ``None`` for deleted tickets."""
+        self.entries.append((board_id, ticket_id, activity_type, description))
+
+    def clear(self):
+        """Drop the queued rows unwritten."""
+        self.entries = []
+
+    def flush(self, seqs=None):
+        """Write the queued rows. ``seqs`` maps boards already bumped to their version."""
+        if not self.entries:
+            return []
+        seqs = dict(seqs or {})
+        for board_id in {board_id for board_id, *_ in self.entries if board_id is not None} - seqs.keys():
+            seqs[board_id] = Board.bump_version(board_id) or 0
+        rows = [
+            TicketActivity(
+                ticket_id=ticket_id,
+                board_id=board_id,
+                user=self.user,
+                activity_type=activity_type,
+                description=description,
+                change_seq=seqs.get(board_id, 0),
+            )
+            for board_id, ticket_id, activity_type, description in self.entries
+        ]
+        self.entries = []
+        return TicketActivity.objects.bulk_create(rows, batch_size=AUDIT_BATCH_SIZE)
+
+
+def bulk_update_tickets(queryset, user, **changes):
+    """Set ``changes`` on every ticket in ``queryset`` and log one activity per changed ticket.
+
+    Runs one UPDATE per board (per 500 ids) and a single version bump per
+    board; viewers get a ``resync`` event. Returns the number of tickets changed.
+    """
+    values = {}
+    for name, value in changes.items():
+        values[Ticket._meta.get_field(name).attname] = getattr(value, 'pk', value)
+    attnames = list(values)
+    target = tuple(values.values())
+    with transaction.atomic():
+        rows = list(queryset.order_by().select_for_update().values_list('id', 'board_id', *attnames))
+        changed = [row for row in rows if tuple(row[2:]) != target]
+        log = ActivityLog(user)
+        by_board = defaultdict(list)
+        for pk, board_id, *old in changed:
+            by_board[board_id].append(pk)
+            log.add(board_id, pk, 'updated', describe_changes({k: (o, values[k]) for k, o in zip(attnames, old)}))
+        now = timezone.now()
+        seqs = {}
+        for board_id, ids in by_board.items():
+            seqs[board_id] = seq = Board.bump_version(board_id) or 0
+            for chunk in _chunks(ids):
+                Ticket.objects.filter(id__in=chunk).update(**values, updated_by=user, updated_at=now, change_seq=seq)
+            publish_on_commit(board_id, lambda: {'type': 'resync'})
+        log.flush(seqs)
+    return len(changed)
+
+
+def bulk_delete_tickets(queryset, user):
+    """Delete ``queryset`` and log one ``deleted`` activity per ticket. Returns the count.
+
+    The rows carry their board and its version, so feeds and delta sync
+    show the deletions.
+    """
+    with transaction.atomic():
+        rows = list(queryset.order_by().values_list('id', 'board_id', 'ticket_type', 'title'))
+        queryset.delete()
+        log = ActivityLog(user)
+        for pk, board_id, ticket_type, title in rows:
+            log.add(board_id, None, 'deleted', f'Deleted {ticket_type} #{pk} {title}')
+        log.flush()
+    return len(rows)
@@ -0,0 +1,118 @@
+"""Typeahead lookups behind the ticket form's parent and assignee pickers.
+
+Both lookups are keyset-paginated in label order so a page costs one bounded
+indexed query, no matter how many tickets or users exist. Cursors are opaque
+tokens encoding the last ``(label, id)`` that was returned.
+
+Search terms go through indexes too: parent titles through the full-text
+search table (``search.py``), user names through the ``lower(name)``
+expression indexes of migration 0031.
+"""
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .models import Ticket
+from .search import ticket_search_filter
+
+DEFAULT_AUTOCOMPLETE_PAGE_SIZE = 20
+MAX_AUTOCOMPLETE_PAGE_SIZE = 100
+
+# Ticket type of the row being edited -> ticket type its parent must have
+PARENT_TYPE_FOR = {'ticket': 'epic', 'bug': 'ticket'}
+# User columns with a lower() expression index (migration 0031)
+USER_NAME_FIELDS = ('username', 'first_name', 'last_name')
+
+
+def autocomplete_page_size():
+    return getattr(settings, 'AUTOCOMPLETE_PAGE_SIZE', DEFAULT_AUTOCOMPLETE_PAGE_SIZE)
+
+
+def _encode(label, pk):
+    raw = json.dumps([label, pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _decode(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        label, pk = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as exc:
+        raise ValueError('Invalid cursor') from exc
+    if not isinstance(label, str) or not isinstance(pk, int):
+        raise ValueError('Invalid cursor')
+    return label, pk
+
+
+def _page(queryset, label_field, cursor, limit):
+    """One ``(label, id)``-ordered page of ``queryset`` plus the next cursor."""
+    limit = min(limit or autocomplete_page_size(), MAX_AUTOCOMPLETE_PAGE_SIZE)
+    if cursor:
+        label, pk = _decode(cursor)
+        queryset = queryset.filter(Q(**{f'{label_field}__gt': label}) | Q(**{label_field: label, 'id__gt': pk}))
+    rows = list(queryset.order_by(label_field, 'id')[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode(getattr(rows[-1], label_field), rows[-1].id)
+    return rows, next_cursor
+
+
+def parent_candidates(board_id, ticket_type):
+    """Tickets on ``board_id`` that may parent a ticket of ``ticket_type``."""
+    parent_type = PARENT_TYPE_FOR.get(ticket_type)
+    if parent_type is None:
+        return Ticket.objects.none()
+    return Ticket.objects.filter(board_id=board_id, ticket_type=parent_type)
+
+
+def parent_choices(board_id, ticket_type, term='', cursor=None, limit=None, exclude_id=None):
+    """Page of possible parents whose title has words starting with ``term``'s.
+
+    Returns ``(tickets, next_cursor)``; raises ``ValueError`` on a bad cursor.
+    """
+    queryset = parent_candidates(board_id, ticket_type).only('id', 'title', 'ticket_type')
+    if term:
+        queryset = queryset.filter(ticket_search_filter(term, titles_only=True))
+    if exclude_id is not None:
+        queryset = queryset.exclude(id=exclude_id)
+    return _page(queryset, 'title', cursor, limit)
+
+
+def _lower_prefix(field, term):
+    """Case-insensitive prefix match on ``lower(field)`` (aliased as ``<field>_lower``).
+
+    The range bounds let SQLite use the expression index (its ``LIKE`` is
+    case-insensitive and cannot); PostgreSQL serves the ``LIKE`` itself.
+    """
+    term = term.lower()
+    upper = term[:-1] + chr(ord(term[-1]) + 1)
+    return Q(**{
+        f'{field}_lower__gte': term,
+        f'{field}_lower__lt': upper,
+        f'{field}_lower__startswith': term,
+    })
+
+
+def user_choices(term='', cursor=None, limit=None):
+    """Page of active users whose username (or first/last name) starts with ``term``."""
+    queryset = get_user_model().objects.filter(is_active=True).only('id', 'username', 'first_name', 'last_name')
+    if term:
+        queryset = queryset.alias(**{f'{field}_lower': Lower(field) for field in USER_NAME_FIELDS}).filter(
+            _lower_prefix('username', term) | _lower_prefix('first_name', term) | _lower_prefix('last_name', term)
+        )
+    return _page(queryset, 'username', cursor, limit)
+
+
+def serialize_parent(ticket):
+    return {'id': ticket.id, 'label': ticket.title, 'ticket_type': ticket.ticket_type}
+
+
+def serialize_user(user):
+    full_name = user.get_full_name()
+    return {'id': user.id, 'label': f'{user.username} ({full_name})' if full_name else user.username}
@@ -0,0 +1,155 @@
+import base64
+import binascii
+
+from django.conf import settings
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+from django.urls import reverse
+
+from .models import Ticket
+
+# Cards rendered per column on the initial board page; the rest stream in
+# through the column API as the user scrolls.
+DEFAULT_COLUMN_PAGE_SIZE = 50
+MAX_COLUMN_PAGE_SIZE = 200
+
+
+# Column orderings; ``id`` always comes last so keyset cursors are stable.
+COLUMN_ORDERINGS = {
+    'rank': ('sort_order', 'id'),
+    'priority': ('-priority_score', 'sort_order', 'id'),
+}
+DEFAULT_COLUMN_ORDER = 'rank'
+
+
+def column_page_size():
+    return getattr(settings, 'BOARD_COLUMN_PAGE_SIZE', DEFAULT_COLUMN_PAGE_SIZE)
+
+
+def encode_cursor(ticket, order=DEFAULT_COLUMN_ORDER):
+    """Opaque keyset cursor pointing just past ``ticket`` in column order."""
+    raw = ':'.join(str(getattr(ticket, field.lstrip('-'))) for field in COLUMN_ORDERINGS[order]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, order=DEFAULT_COLUMN_ORDER):
+    """Inverse of :func:`encode_cursor`. Raises ``ValueError`` on garbage."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = [int(v) for v in base64.urlsafe_b64decode(padded.encode()).decode().split(':')]
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError('Invalid cursor') from exc
+    if len(values) != len(COLUMN_ORDERINGS[order]):
+        raise ValueError('Invalid cursor')
+    return tuple(values)
+
+
+def _after_cursor(order, values):
+    """Keyset filter for rows sorting strictly after ``values`` in ``order``."""
+    condition = Q()
+    equal = {}
+    for field, value in zip(COLUMN_ORDERINGS[order], values):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition |= Q(**equal, **{f'{name}__{lookup}': value})
+        equal[name] = value
+    return condition
+
+
+def serialize_ticket(ticket):
+    """JSON-safe card payload; expects ``parent`` to be select_related.
+
+    ``blocked`` is only included once the dependency graph has marked the
+    ticket (see ``graph.BoardGraph.mark_blocked``).
+    """
+    data = {
+        'id': ticket.id,
+        'title': ticket.title,
+        'description': ticket.description,
+        'status': ticket.status,
+        'priority': ticket.priority,
+        'ticket_type': ticket.ticket_type,
+        'sort_order': ticket.sort_order,
+        'importance': ticket.importance,
+        'urgency': ticket.urgency,
+        'priority_score': ticket.priority_score,
+        'descendant_count': ticket.descendant_count,
+        'descendant_done_count': ticket.descendant_done_count,
+        'open_bug_count': ticket.open_bug_count,
+        'descendant_score_sum': ticket.descendant_score_sum,
+        'parent_id': ticket.parent_id,
+        'parent_title': ticket.parent.title if ticket.parent_id else None,
+        'assignee_id': ticket.assignee_id,
+        'updated_at': ticket.updated_at.isoformat() if ticket.updated_at else None,
+        'change_seq': ticket.change_seq,
+        'edit_url': reverse('tickets:ticket-edit', args=[ticket.id]),
+    }
+    if hasattr(ticket, 'is_blocked'):
+        data['blocked'] = ticket.is_blocked
+    return data
+
+
+def column_page(board, status, types=None, cursor=None, limit=None, order=DEFAULT_COLUMN_ORDER):
+    """Return one keyset-paginated page of a board column.
+
+    Ordering is ``(sort_order, id)`` (or ``(-priority_score, sort_order, id)``
+    for ``order='priority'``) so the cursor is stable even when several cards
+    share a sort key. Returns ``(tickets, next_cursor)`` where ``next_cursor``
+    is ``None`` once the column is exhausted.
+    """
+    limit = min(limit or column_page_size(), MAX_COLUMN_PAGE_SIZE)
+    qs = Ticket.objects.filter(board=board, status=status).select_related('parent')
+    if types:
+        qs = qs.filter(ticket_type__in=types)
+    if cursor:
+        qs = qs.filter(_after_cursor(order, decode_cursor(cursor, order)))
+    rows = list(qs.order_by(*COLUMN_ORDERINGS[order])[:limit + 1])
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1], order)
+    return rows, None
+
+
+def load_board(board, column_limit=None, order=DEFAULT_COLUMN_ORDER):
+    """Fetch the board's tickets in one query and group them in memory.
+
+    Returns the same ``grouped`` structure the board template has always
+    consumed (``tickets``, ``by_status`` and ``by_type``) but backed by plain
+    lists, so iterating a column never triggers another query. Parents are
+    joined in so the card's parent badge is free.
+
+    With ``column_limit`` only the first page of each status column is loaded
+    (ranked in SQL with a window function, still a single query) and
+    ``next_cursor`` carries the keyset cursor for columns that have more.
+    ``order`` picks one of ``COLUMN_ORDERINGS`` for the columns.
+    """
+    ordering = COLUMN_ORDERINGS[order]
+    qs = Ticket.objects.filter(board=board).select_related('parent')
+    if column_limit:
+        qs = qs.annotate(column_rank=Window(
+            expression=RowNumber(),
+            partition_by=[F('status')],
+            order_by=[F(f[1:]).desc() if f.startswith('-') else F(f).asc() for f in ordering],
+        )).filter(column_rank__lte=column_limit + 1)
+    tickets = list(qs.order_by(*ordering))
+    by_status = {key: [] for key, _ in Ticket.STATUS_CHOICES}
+    next_cursor = {key: None for key in by_status}
+    overflow = set()
+    for ticket in tickets:
+        column = by_status.setdefault(ticket.status, [])
+        if column_limit and len(column) >= column_limit:
+            # The extra (limit + 1)th row only tells us the column continues.
+            next_cursor[ticket.status] = encode_cursor(column[-1], order)
+            overflow.add(ticket.id)
+            continue
+        column.append(ticket)
+    visible = [t for t in tickets if t.id not in overflow]
+    by_type = {key: [] for key, _ in Ticket.TICKET_TYPE_CHOICES}
+    for ticket in visible:
+        by_type.setdefault(ticket.ticket_type, []).append(ticket)
+    return {
+        'tickets': visible,
+        'by_status': by_status,
+        'by_type': by_type,
+        'next_cursor': next_cursor,
+    }
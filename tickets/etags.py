@@ -0,0 +1,62 @@
+"""ETag functions for ``django.views.decorators.http.etag``.
+
+Each function is cheap (one or two indexed lookups) so a matching
+``If-None-Match`` is answered with a 304 before the view renders anything.
+Returning ``None`` disables conditional handling for that request.
+"""
+import hashlib
+
+from django.contrib.messages import get_messages
+from django.middleware.csrf import get_token
+from django.db.models import Count, Max
+
+from .models import Board
+from .models_theme import ThemePreference, UserTheme
+from .themes import gallery_version, resolve_theme
+
+
+def board_version(board_id):
+    return Board.objects.filter(pk=board_id).values_list('version', flat=True).first()
+
+
+def theme_fingerprint(user):
+    """Changes whenever one of ``user``'s themes or their preference changes."""
+    agg = UserTheme.objects.filter(user=user).aggregate(n=Count('id'), latest=Max('updated_at'))
+    pref = ThemePreference.objects.filter(user=user).values_list('theme_id', 'updated_at').first()
+    latest = agg['latest'].timestamp() if agg['latest'] else 0
+    pref_part = f'{pref[0]}@{pref[1].timestamp()}' if pref else '-'
+    return f"{agg['n']}.{latest}.{pref_part}"
+
+
+def board_page_etag(request, board_id):
+    # Flash messages are consumed by rendering; never let a 304 swallow them.
+    if len(get_messages(request)):
+        return None
+    version = board_version(board_id)
+    if version is None:
+        return None
+    # From the theme cache; the view reuses the resolved theme.
+    theme = resolve_theme(request)['fingerprint']
+    # The page embeds a CSRF token; once login rotates the secret a cached copy must not be reused.
+    # get_token() settles the secret first, so a visitor without the cookie yet is tagged with the one it is sent.
+    get_token(request)
+    csrf = hashlib.md5(request.META['CSRF_COOKIE'].encode()).hexdigest()[:12]
+    return f'board-{board_id}-v{version}-u{request.user.pk}-t{theme}-c{csrf}'
+
+
+def board_data_etag(request, board_id, **kwargs):
+    version = board_version(board_id)
+    if version is None:
+        return None
+    return f'board-{board_id}-v{version}'
+
+
+def themes_etag(request):
+    return f'themes-u{request.user.pk}-{theme_fingerprint(request.user)}'
+
+
+def public_themes_etag(request):
+    # The gallery is the same for everyone; the version token changes on any theme write.
+    # Kept on the request so the view's cache lookup reuses it.
+    request._gallery_version = gallery_version()
+    return f'theme-gallery-{request._gallery_version}-{request.GET.urlencode()}'
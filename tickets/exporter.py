@@ -0,0 +1,228 @@
+"""Streaming export of a board's tickets, comments and activities.
+
+``BoardExport.rows`` yields one dict per record, reading the database with
+chunked ``iterator()`` queries in id order. Only the requested columns are
+selected. A ticket's ``related`` ids are fetched with one query per chunk.
+``BoardExport.lines`` turns the records into CSV or JSON-lines text, one
+line at a time, and ``BoardExport.chunks`` joins those lines into blocks of
+up to ``EXPORT_CHUNK_SIZE`` lines or ``EXPORT_CHUNK_BYTES`` characters.
+Memory therefore stays at one chunk however large the board is; the export
+view streams the blocks and the ``export_board`` command the lines.
+
+Filters (status, ticket type, updated since) apply to the tickets. Comments
+and activities are those of the matching tickets, and ``updated_since``
+also limits them to rows written since then.
+"""
+import csv
+import json
+from datetime import date, datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .importer import normalize_format
+from .models import Ticket, TicketActivity, TicketComment
+
+EXPORT_CHUNK_SIZE = 1000
+# Roughly how much text the view hands the server per write.
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+# Column -> ``values()`` lookup, per record kind. ``related`` is not a
+# column of the row; it is filled in per chunk.
+EXPORT_COLUMNS = {
+    'tickets': {
+        'id': 'id',
+        'title': 'title',
+        'description': 'description',
+        'status': 'status',
+        'priority': 'priority',
+        'ticket_type': 'ticket_type',
+        'importance': 'importance',
+        'urgency': 'urgency',
+        'priority_score': 'priority_score',
+        'assignee': 'assignee__username',
+        'parent': 'parent_id',
+        'related': None,
+        'sort_order': 'sort_order',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    },
+    'comments': {
+        'id': 'id',
+        'ticket_id': 'ticket_id',
+        'user': 'user__username',
+        'body': 'body',
+        'created_at': 'created_at',
+    },
+    'activities': {
+        'id': 'id',
+        'ticket_id': 'ticket_id',
+        'user': 'user__username',
+        'activity_type': 'activity_type',
+        'description': 'description',
+        'timestamp': 'timestamp',
+        'change_seq': 'change_seq',
+    },
+}
+EXPORT_KINDS = tuple(EXPORT_COLUMNS)
+# Timestamp each kind is filtered on for ``updated_since``.
+SINCE_FIELDS = {'tickets': 'updated_at', 'comments': 'created_at', 'activities': 'timestamp'}
+
+
+class ExportError(ValueError):
+    """Raised for export options that can't be honoured; nothing is streamed."""
+
+
+def parse_since(value):
+    """Aware datetime from an ISO date or datetime string; raises ``ExportError``."""
+    parsed = parse_datetime(value) or parse_date(value)
+    if parsed is None:
+        raise ExportError('updated_since must be an ISO date or datetime')
+    if not isinstance(parsed, datetime):
+        parsed = datetime.combine(parsed, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+class BoardExport:
+    """What to export from one board; validated on construction.
+
+    ``columns`` applies when a single kind is exported (``None`` means all
+    of its columns). CSV output takes exactly one kind.
+    """
+
+    def __init__(self, board_id, fmt='csv', kinds=None, columns=None, statuses=None, types=None, since=None):
+        try:
+            self.fmt = normalize_format(fmt)
+        except ValueError as exc:
+            raise ExportError(str(exc))
+        self.board_id = board_id
+        self.kinds = list(dict.fromkeys(kinds or ['tickets']))
+        unknown = [k for k in self.kinds if k not in EXPORT_COLUMNS]
+        if unknown:
+            raise ExportError(f'Unknown record kind. Must be one of: {", ".join(EXPORT_KINDS)}')
+        if self.fmt == 'csv' and len(self.kinds) != 1:
+            raise ExportError('CSV exports take exactly one record kind')
+        if columns and len(self.kinds) != 1:
+            raise ExportError('columns can only be chosen when exporting one record kind')
+        self.columns = {kind: list(EXPORT_COLUMNS[kind]) for kind in self.kinds}
+        if columns:
+            available = EXPORT_COLUMNS[self.kinds[0]]
+            unknown = [c for c in columns if c not in available]
+            if unknown:
+                raise ExportError(f'Unknown column {unknown[0]!r}. Must be one of: {", ".join(available)}')
+            self.columns[self.kinds[0]] = list(dict.fromkeys(columns))
+        valid_statuses, valid_types = dict(Ticket.STATUS_CHOICES), dict(Ticket.TICKET_TYPE_CHOICES)
+        if any(s not in valid_statuses for s in statuses or ()):
+            raise ExportError('Invalid status')
+        if any(t not in valid_types for t in types or ()):
+            raise ExportError('Invalid ticket type')
+        self.statuses = statuses or []
+        self.types = types or []
+        self.since = since
+
+    @property
+    def content_type(self):
+        return 'text/csv; charset=utf-8' if self.fmt == 'csv' else 'application/x-ndjson'
+
+    @property
+    def filename(self):
+        extension = 'csv' if self.fmt == 'csv' else 'jsonl'
+        return f"board-{self.board_id}-{'-'.join(self.kinds)}.{extension}"
+
+    def _queryset(self, kind):
+        model = {'tickets': Ticket, 'comments': TicketComment, 'activities': TicketActivity}[kind]
+        prefix = '' if kind == 'tickets' else 'ticket__'
+        filters = {f'{prefix}board_id': self.board_id}
+        if self.statuses:
+            filters[f'{prefix}status__in'] = self.statuses
+        if self.types:
+            filters[f'{prefix}ticket_type__in'] = self.types
+        if self.since is not None:
+            filters[f'{SINCE_FIELDS[kind]}__gte'] = self.since
+        return model.objects.filter(**filters).order_by('id')
+
+    def rows(self, kind):
+        """Records of ``kind`` as ``{column: value}``, streamed in id order."""
+        columns = self.columns[kind]
+        lookups = {c: EXPORT_COLUMNS[kind][c] for c in columns if EXPORT_COLUMNS[kind][c] is not None}
+        fetch = {*lookups.values(), 'id'}
+        chunk = []
+        for values in self._queryset(kind).values(*fetch).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            chunk.append(values)
+            if len(chunk) == EXPORT_CHUNK_SIZE:
+                yield from self._finish(kind, columns, lookups, chunk)
+                chunk = []
+        if chunk:
+            yield from self._finish(kind, columns, lookups, chunk)
+
+    def _finish(self, kind, columns, lookups, chunk):
+        related = {}
+        if kind == 'tickets' and 'related' in columns:
+            through = Ticket.related_tickets.through
+            links = through.objects.filter(from_ticket_id__in=[v['id'] for v in chunk]).order_by('to_ticket_id')
+            for from_id, to_id in links.values_list('from_ticket_id', 'to_ticket_id'):
+                related.setdefault(from_id, []).append(to_id)
+        for values in chunk:
+            yield {
+                c: related.get(values['id'], []) if c == 'related' else values[lookups[c]]
+                for c in columns
+            }
+
+    def records(self):
+        """``(kind, row)`` for every exported record, kind by kind."""
+        for kind in self.kinds:
+            for row in self.rows(kind):
+                yield kind, row
+
+    def lines(self):
+        """The export as text, one line (CSV row or JSON object) at a time."""
+        if self.fmt == 'csv':
+            kind = self.kinds[0]
+            writer = csv.writer(_Echo())
+            yield writer.writerow(self.columns[kind])
+            for row in self.rows(kind):
+                yield writer.writerow([_csv_value(v) for v in row.values()])
+            return
+        tag = len(self.kinds) > 1
+        for kind, row in self.records():
+            if tag:
+                row = {'record': kind, **row}
+            yield json.dumps(row, default=_json_default) + '\n'
+
+    def chunks(self, max_lines=None, max_chars=None):
+        """``lines()`` joined into blocks, so each block is one write (and one thread hop under ASGI)."""
+        max_lines, max_chars = max_lines or EXPORT_CHUNK_SIZE, max_chars or EXPORT_CHUNK_BYTES
+        block, size = [], 0
+        for line in self.lines():
+            block.append(line)
+            size += len(line)
+            if len(block) >= max_lines or size >= max_chars:
+                yield ''.join(block)
+                block, size = [], 0
+        if block:
+            yield ''.join(block)
+
+
+class _Echo:
+    """File-like object whose ``write`` hands the formatted line back."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        return ';'.join(str(v) for v in value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
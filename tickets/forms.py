@@ -1,11 +1,41 @@
 from django import forms
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from .autocomplete import parent_candidates
 from .models import Ticket
 
+
+class AutocompleteSelect(forms.Select):
+    """Select that renders only the chosen option.
+
+    The remaining options are fetched page by page from the JSON endpoint in
+    ``data-autocomplete-url`` as the user types, so the page never ships the
+    whole queryset.
+    """
+
+    def optgroups(self, name, value, attrs=None):
+        selected = [v for v in value if v not in ('', None)]
+        field = getattr(self.choices, 'field', None)
+        choices = [('', getattr(field, 'empty_label', None) or '---------')]
+        if selected and field is not None:
+            try:
+                chosen = list(self.choices.queryset.filter(pk__in=selected))
+            except (ValueError, TypeError, ValidationError):
+                chosen = []
+            choices += [(obj.pk, field.label_from_instance(obj)) for obj in chosen]
+        all_choices, self.choices = self.choices, choices
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = all_choices
+
+
 class TicketForm(forms.ModelForm):
     ticket_type = forms.ChoiceField(choices=Ticket.TICKET_TYPE_CHOICES, required=True)
     parent = forms.ModelChoiceField(
         queryset=Ticket.objects.none(),  # dynamically set in __init__ based on type
         required=False,
+        widget=AutocompleteSelect(),
         help_text='Parent ticket (Epic for tickets, Ticket for bugs).'
     )
 
@@ -42,6 +72,7 @@ class TicketForm(forms.ModelForm):
             'title', 'description', 'status', 'priority', 'importance', 'urgency',
             'ticket_type', 'parent', 'assignee', 'board'
         ]
+        widgets = {'assignee': AutocompleteSelect()}
         # Importance & urgency now shown as normal selects (no matrix widget)
 
     def __init__(self, *args, **kwargs):
@@ -72,13 +103,24 @@ class TicketForm(forms.ModelForm):
             t_type = self.instance.ticket_type
         else:
             t_type = 'ticket'
-        # Filter parent queryset based on desired parent type
-        if t_type == 'ticket':
-            self.fields['parent'].queryset = Ticket.objects.filter(ticket_type='epic')
-        elif t_type == 'bug':
-            self.fields['parent'].queryset = Ticket.objects.filter(ticket_type='ticket')
-        else:  # epic
-            self.fields['parent'].queryset = Ticket.objects.none()
-        # If epic, hide parent field visually (optional; template may handle)
-        if t_type == 'epic':
-            self.fields['parent'].widget = forms.HiddenInput()
+        # Parents come from the ticket's own board; both pickers search server-side
+        board_id = self._board_id()
+        if board_id is not None:
+            self.fields['parent'].queryset = parent_candidates(board_id, t_type)
+            self.fields['parent'].widget.attrs.update({
+                'data-autocomplete-url': reverse('tickets:parent-autocomplete', args=[board_id]),
+                'data-autocomplete-type-field': 'id_ticket_type',
+                'data-autocomplete-exclude': self.instance.pk or '',
+            })
+        self.fields['assignee'].widget.attrs['data-autocomplete-url'] = reverse('tickets:assignee-autocomplete')
+
+    def _board_id(self):
+        """Board the ticket belongs to, from the instance, posted data or initial."""
+        if self.instance and self.instance.board_id:
+            return self.instance.board_id
+        board = self.data.get('board') or self.initial.get('board')
+        board_id = getattr(board, 'pk', board)
+        try:
+            return int(board_id) if board_id is not None else None
+        except (TypeError, ValueError):
+            return None
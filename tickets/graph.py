@@ -0,0 +1,233 @@
+"""Dependency graph over ``Ticket.related_tickets``.
+
+An edge ``a.related_tickets -> b`` reads "a depends on b": ``b`` is one of
+``a``'s blockers and has to be done first. A board's graph is loaded with
+two bulk queries (its tickets and every edge leaving them), analysed once
+in memory, and cached under the board's version. Every ticket save and
+link change advances that version. A ticket that opens or closes also
+advances the boards of all its dependents (``restamp_dependents``), even
+on other boards, so a cached graph is never stale.
+"""
+from collections import defaultdict, deque
+
+from django.core.cache import cache
+
+from .live import publish_on_commit
+from .models import Board, Ticket
+
+GRAPH_CACHE_TIMEOUT = 60 * 60
+
+
+class BoardGraph:
+    def __init__(self, board_id, version, statuses, edges):
+        self.board_id = board_id
+        self.version = version
+        self.statuses = statuses
+        self.blockers = defaultdict(set)
+        self.dependents = defaultdict(set)
+        for ticket_id, blocker_id in edges:
+            self.blockers[ticket_id].add(blocker_id)
+            self.dependents[blocker_id].add(ticket_id)
+        self.cycles = self._find_cycles()
+        self.topological_order = self._topological_order()
+        self.blocked = self._find_blocked()
+        self.critical_path = self._critical_path()
+
+    def is_open(self, ticket_id):
+        return self.statuses.get(ticket_id) != 'done'
+
+    def _reach(self, start, adjacency):
+        seen = set()
+        queue = deque(adjacency.get(start, ()))
+        while queue:
+            node = queue.popleft()
+            if node in seen:
+                continue
+            seen.add(node)
+            queue.extend(adjacency.get(node, ()))
+        seen.discard(start)
+        return seen
+
+    def transitive_blockers(self, ticket_id):
+        """Everything ``ticket_id`` waits on, directly or through other tickets."""
+        return self._reach(ticket_id, self.blockers)
+
+    def transitive_dependents(self, ticket_id):
+        """Everything that waits on ``ticket_id``."""
+        return self._reach(ticket_id, self.dependents)
+
+    def _find_cycles(self):
+        """Strongly connected components that form cycles (Tarjan, iterative)."""
+        index, low, on_stack, stack = {}, {}, set(), []
+        cycles = []
+        counter = 0
+        nodes = set(self.blockers) | set(self.dependents)
+        for root in sorted(nodes):
+            if root in index:
+                continue
+            work = [(root, iter(sorted(self.blockers.get(root, ()))))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, children = work[-1]
+                child = next(children, None)
+                if child is not None:
+                    if child not in index:
+                        index[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(sorted(self.blockers.get(child, ())))))
+                    elif child in on_stack:
+                        low[node] = min(low[node], index[child])
+                    continue
+                work.pop()
+                if work:
+                    low[work[-1][0]] = min(low[work[-1][0]], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in self.blockers.get(node, ()):
+                        cycles.append(sorted(component))
+        return cycles
+
+    def _topological_order(self):
+        """Blockers before dependents (Kahn); tickets on a cycle are left out."""
+        in_cycle = {pk for cycle in self.cycles for pk in cycle}
+        nodes = (set(self.blockers) | set(self.dependents)) - in_cycle
+        pending = {pk: len(self.blockers.get(pk, set()) - in_cycle) for pk in nodes}
+        ready = sorted(pk for pk, count in pending.items() if count == 0)
+        order = []
+        while ready:
+            node = ready.pop(0)
+            order.append(node)
+            for dependent in sorted(self.dependents.get(node, ())):
+                if dependent in pending:
+                    pending[dependent] -= 1
+                    if pending[dependent] == 0:
+                        ready.append(dependent)
+        return order
+
+    def _find_blocked(self):
+        """Tickets with at least one open blocker somewhere upstream.
+
+        One multi-source walk down the dependent edges of every open blocker.
+        """
+        blocked = set()
+        queue = deque(
+            dependent
+            for blocker_id, dependents in self.dependents.items() if self.is_open(blocker_id)
+            for dependent in dependents
+        )
+        while queue:
+            node = queue.popleft()
+            if node in blocked:
+                continue
+            blocked.add(node)
+            # A done ticket still passes on the wait for its own open blockers.
+            queue.extend(self.dependents.get(node, ()))
+        return blocked
+
+    def _critical_path(self):
+        """Longest chain of open tickets through the acyclic part of the graph, blocker first."""
+        length, previous = {}, {}
+        for node in self.topological_order:
+            if not self.is_open(node):
+                continue
+            best = None
+            for blocker_id in self.blockers.get(node, ()):
+                if blocker_id in length and (best is None or length[blocker_id] > length[best]):
+                    best = blocker_id
+            length[node] = length[best] + 1 if best is not None else 1
+            previous[node] = best
+        if not length:
+            return []
+        node = max(length, key=lambda pk: (length[pk], -pk))
+        path = []
+        while node is not None:
+            path.append(node)
+            node = previous[node]
+        return path[::-1]
+
+    def mark_blocked(self, tickets):
+        """Set ``is_blocked`` on ticket instances for templates and serializers."""
+        for ticket in tickets:
+            ticket.is_blocked = ticket.id in self.blocked
+        return tickets
+
+    def as_dict(self):
+        return {
+            'version': self.version,
+            'edges': sorted([pk, blocker] for pk, blockers in self.blockers.items() for blocker in blockers),
+            'blocked': sorted(self.blocked),
+            'topological_order': self.topological_order,
+            'cycles': self.cycles,
+            'critical_path': self.critical_path,
+        }
+
+
+def _load_graph(board_id, version):
+    statuses = dict(Ticket.objects.filter(board_id=board_id).values_list('id', 'status'))
+    through = Ticket.related_tickets.through
+    edges = list(through.objects.filter(from_ticket_id__in=statuses.keys()).values_list('from_ticket_id', 'to_ticket_id'))
+    # Blockers may live on other boards; their status still decides "blocked".
+    # restamp_dependents re-versions this board when one of them opens or closes.
+    foreign = {blocker for _, blocker in edges if blocker not in statuses}
+    if foreign:
+        statuses.update(Ticket.objects.filter(id__in=foreign).values_list('id', 'status'))
+    return BoardGraph(board_id, version, statuses, edges)
+
+
+def restamp_dependents(ticket_ids):
+    """Re-version everything that waits on ``ticket_ids``, on whatever board it lives.
+
+    Called when tickets open or close, since that can flip the ``blocked``
+    flag of every direct and transitive dependent. Each dependent's board
+    is bumped, which retires its cached graph, and the dependents are stamped
+    with the new version so delta sync delivers their new flag. Dependents
+    are found one edge level per query.
+    """
+    through = Ticket.related_tickets.through
+    dependents = set()
+    frontier = set(ticket_ids)
+    while frontier:
+        frontier = set(
+            through.objects.filter(to_ticket_id__in=frontier).values_list('from_ticket_id', flat=True)
+        ) - dependents
+        dependents |= frontier
+    by_board = defaultdict(list)
+    for pk, board_id in Ticket.objects.filter(id__in=dependents).values_list('id', 'board_id'):
+        by_board[board_id].append(pk)
+    for board_id, ids in by_board.items():
+        seq = Board.bump_version(board_id)
+        if seq is None:
+            continue
+        Ticket.objects.filter(id__in=ids).update(change_seq=seq)
+        publish_on_commit(board_id, lambda: {'type': 'resync'})
+
+
+def get_board_graph(board):
+    """The analysed graph of ``board`` (a ``Board`` or its id), cached per board version.
+
+    Passing the already-loaded ``Board`` skips reading its version. The key
+    also carries the board's creation time so a recycled id (e.g. after a
+    rolled-back transaction) never picks up another board's graph. Returns
+    ``None`` if the board doesn't exist.
+    """
+    if not isinstance(board, Board):
+        board = Board.objects.filter(pk=board).only('id', 'version', 'created_at').first()
+        if board is None:
+            return None
+    key = f'tickets:graph:{board.pk}:{board.version}:{board.created_at.timestamp()}'
+    graph = cache.get(key)
+    if graph is None:
+        graph = _load_graph(board.pk, board.version)
+        cache.set(key, graph, GRAPH_CACHE_TIMEOUT)
+    return graph
@@ -0,0 +1,369 @@
+"""Streaming bulk import of tickets from CSV or JSON lines.
+
+Rows are read one at a time and handled in chunks. Each chunk is validated
+in full (assignees are looked up with one query) and then written with one
+``bulk_create`` of tickets and one of ``created`` activities. ``parent`` and
+``related`` columns name other rows by their ``key`` column. They are
+resolved once the whole file is in, in a second pass:
+
+* the epic/ticket/bug rules of ``Ticket.clean()`` are checked for every
+  reference at once, from the ``key -> type`` map built while reading;
+* parents are written with one UPDATE per parent, carrying the
+  materialized path; the ancestors' rollups move by relative deltas;
+* dependency links go in with one ``bulk_create`` on the through table.
+
+The import runs in one transaction. Any invalid row aborts it and nothing
+is written; the file is still read to the end so every error can be
+reported together. Bulk writes skip model signals, so this module does the
+signal work itself: it takes one board version for every row and publishes
+one ``resync`` event.
+"""
+import csv
+import json
+import re
+import time
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from .live import publish_on_commit
+from .models import (
+    Board, Ticket, TicketActivity, ancestor_ids_from_path, apply_rollup_deltas, path_segment, rollup_contribution,
+)
+from .ranking import RANK_GAP, next_rank
+
+DEFAULT_CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 50
+IMPORT_FORMATS = ('csv', 'jsonl')
+# ``ndjson`` is the same format under another name.
+FORMAT_ALIASES = {'ndjson': 'jsonl', 'json': 'jsonl'}
+
+# Which parent type each ticket type accepts, and whether one is required.
+PARENT_RULES = {
+    'epic': (None, False),
+    'ticket': ('epic', False),
+    'bug': ('ticket', True),
+}
+PARENT_ERRORS = {
+    'epic': 'Epics cannot have a parent.',
+    'ticket': 'If set, parent must be an epic for a standard ticket.',
+    'bug': 'A bug must have a ticket as parent.',
+}
+
+
+class TicketImportError(ValueError):
+    """Raised when a file has invalid rows; nothing is written.
+
+    ``errors`` lists ``(row_number, message)`` for the first
+    ``MAX_REPORTED_ERRORS`` problems; ``error_count`` counts all of them.
+    """
+
+    def __init__(self, errors, error_count=None):
+        self.errors = errors
+        self.error_count = error_count if error_count is not None else len(errors)
+        super().__init__(f'{self.error_count} invalid row(s)')
+
+
+class ImportResult:
+    """Counters of one import, updated after every chunk."""
+
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        self.rows = 0
+        self.created = 0
+        self.parented = 0
+        self.related = 0
+        self.started = time.monotonic()
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'created': self.created,
+            'parented': self.parented,
+            'related': self.related,
+            'elapsed': round(self.elapsed, 3),
+            'rows_per_second': round(self.rows_per_second, 1),
+            'dry_run': self.dry_run,
+        }
+
+
+def normalize_format(fmt, filename=None):
+    """``csv`` or ``jsonl`` from an explicit format or the file extension."""
+    if not fmt and filename:
+        fmt = filename.rsplit('.', 1)[-1] if '.' in filename else ''
+    fmt = FORMAT_ALIASES.get((fmt or '').lower(), (fmt or '').lower())
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f'Unknown format. Must be one of: {", ".join(IMPORT_FORMATS)}')
+    return fmt
+
+
+def read_rows(stream, fmt):
+    """Yield ``(row_number, row)`` from a text stream; a row that can't be parsed is a ``str`` error."""
+    if fmt == 'csv':
+        for number, row in enumerate(csv.DictReader(stream), start=1):
+            yield number, row
+        return
+    number = 0
+    for line in stream:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield number, 'Invalid JSON'
+            continue
+        yield number, row if isinstance(row, dict) else 'Each line must be a JSON object'
+
+
+def _text(row, name):
+    value = row.get(name)
+    return '' if value is None else str(value).strip()
+
+
+def _references(value):
+    if value is None or value == '':
+        return []
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [v for v in re.split(r'[\s,;]+', str(value)) if v]
+
+
+def _choice(row, name, choices, default):
+    value = _text(row, name) or default
+    if value not in choices:
+        raise ValueError(f'{name} must be one of: {", ".join(choices)}')
+    return value
+
+
+def _scale(row, name):
+    value = _text(row, name)
+    if not value:
+        return 1
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if not 1 <= number <= 10:
+        raise ValueError(f'{name.capitalize()} must be between 1 and 10.')
+    return number
+
+
+def parse_row(row):
+    """Validated field values of one row (``assignee`` still a username); raises ``ValueError``."""
+    title = _text(row, 'title')
+    if not title:
+        raise ValueError('title is required')
+    if len(title) > Ticket._meta.get_field('title').max_length:
+        raise ValueError('title is too long')
+    return {
+        'key': _text(row, 'key'),
+        'title': title,
+        'description': _text(row, 'description'),
+        'status': _choice(row, 'status', dict(Ticket.STATUS_CHOICES), 'todo'),
+        'priority': _choice(row, 'priority', dict(Ticket.PRIORITY_CHOICES), 'medium'),
+        'ticket_type': _choice(row, 'ticket_type' if 'ticket_type' in row else 'type', dict(Ticket.TICKET_TYPE_CHOICES), 'ticket'),
+        'importance': _scale(row, 'importance'),
+        'urgency': _scale(row, 'urgency'),
+        'assignee': _text(row, 'assignee'),
+        'parent': _text(row, 'parent'),
+        'related': _references(row.get('related', row.get('related_tickets'))),
+    }
+
+
+class _Importer:
+    def __init__(self, board, user, chunk_size, result, progress):
+        self.board = board
+        self.user = user
+        self.chunk_size = chunk_size
+        self.result = result
+        self.progress = progress
+        self.errors = []
+        self.error_count = 0
+        self.types = {}  # key -> ticket_type, for every valid row read so far
+        self.pks = {}  # key -> pk, for every row written
+        # [row_number, ticket_type, parent_key, related_keys, pk, contribution] of rows that reference others
+        self.references = []
+        self.ranks = {}
+        self.seq = None
+
+    def error(self, number, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((number, message))
+
+    def _rank(self, status):
+        if status not in self.ranks:
+            self.ranks[status] = next_rank(self.board.pk, status) - RANK_GAP
+        self.ranks[status] += RANK_GAP
+        return self.ranks[status]
+
+    def load_chunk(self, chunk):
+        parsed = []
+        for number, row in chunk:
+            if isinstance(row, str):
+                self.error(number, row)
+                continue
+            try:
+                values = parse_row(row)
+            except ValueError as exc:
+                self.error(number, str(exc))
+                continue
+            if values['key'] in self.types:
+                self.error(number, f"Duplicate key {values['key']!r}")
+                continue
+            if values['key']:
+                self.types[values['key']] = values['ticket_type']
+            parsed.append((number, values))
+        usernames = {values['assignee'] for _, values in parsed if values['assignee']}
+        users = dict(get_user_model().objects.filter(username__in=usernames).values_list('username', 'id')) if usernames else {}
+        entries = []
+        for number, values in parsed:
+            if values['assignee'] and values['assignee'] not in users:
+                self.error(number, f"Unknown assignee {values['assignee']!r}")
+            entry = None
+            if values['parent'] or values['related'] or PARENT_RULES[values['ticket_type']][1]:
+                entry = [number, values['ticket_type'], values['parent'], values['related'], None, None]
+                self.references.append(entry)
+            entries.append(entry)
+        self.result.rows += len(chunk)
+        if self.error_count:
+            # Keep reading to report every error, but stop writing.
+            return
+        tickets = [
+            Ticket(
+                board=self.board,
+                title=values['title'],
+                description=values['description'],
+                status=values['status'],
+                priority=values['priority'],
+                ticket_type=values['ticket_type'],
+                importance=values['importance'],
+                urgency=values['urgency'],
+                assignee_id=users.get(values['assignee']),
+                updated_by=self.user,
+                sort_order=self._rank(values['status']),
+                change_seq=self.seq,
+            )
+            for _, values in parsed
+        ]
+        Ticket.objects.bulk_create(tickets)
+        TicketActivity.objects.bulk_create([
+            TicketActivity(
+                ticket=ticket, board_id=ticket.board_id, user=self.user, activity_type='created',
+                description=f'Imported {ticket.ticket_type} {ticket.title}', change_seq=self.seq,
+            )
+            for ticket in tickets
+        ])
+        for (_, values), entry, ticket in zip(parsed, entries, tickets):
+            if values['key']:
+                self.pks[values['key']] = ticket.pk
+            if entry is not None:
+                entry[4] = ticket.pk
+                entry[5] = rollup_contribution(ticket.status, ticket.ticket_type, ticket.priority_score)
+        self.result.created += len(tickets)
+
+    def check_references(self):
+        """Apply the hierarchy rules to every reference at once."""
+        for number, ticket_type, parent_key, related, _, _ in self.references:
+            allowed, required = PARENT_RULES[ticket_type]
+            if parent_key:
+                if parent_key not in self.types:
+                    self.error(number, f'Unknown parent key {parent_key!r}')
+                elif self.types[parent_key] != allowed:
+                    self.error(number, PARENT_ERRORS[ticket_type])
+            elif required:
+                self.error(number, PARENT_ERRORS[ticket_type])
+            for key in related:
+                if key not in self.types:
+                    self.error(number, f'Unknown related key {key!r}')
+
+    def link(self):
+        """Second pass: write parents (with paths and rollups) and dependency links."""
+        parent_of = {}
+        links = []
+        for _, _, parent_key, related, pk, _ in self.references:
+            if parent_key:
+                parent_of[pk] = self.pks[parent_key]
+            links.extend((pk, self.pks[key]) for key in dict.fromkeys(related) if self.pks[key] != pk)
+        # Epics are roots and tickets only hang off epics, so chains are at
+        # most two deep and every parent's path is known from this map alone.
+        paths = {}
+
+        def path_of(pk):
+            if pk not in paths:
+                parent = parent_of.get(pk)
+                paths[pk] = '' if parent is None else path_of(parent) + path_segment(parent)
+            return paths[pk]
+
+        children = defaultdict(list)
+        deltas = {}
+        for _, _, _, _, pk, contribution in self.references:
+            if pk not in parent_of:
+                continue
+            children[parent_of[pk]].append(pk)
+            for ancestor in ancestor_ids_from_path(path_of(pk)):
+                total = deltas.setdefault(ancestor, [0] * len(contribution))
+                for i, value in enumerate(contribution):
+                    total[i] += value
+        for parent, pks in children.items():
+            path = path_of(pks[0])
+            Ticket.objects.filter(id__in=pks).update(parent_id=parent, path=path, depth=path.count('/'))
+        apply_rollup_deltas(deltas, change_seq=self.seq)
+        through = Ticket.related_tickets.through
+        through.objects.bulk_create(
+            [through(from_ticket_id=a, to_ticket_id=b) for a, b in links], batch_size=self.chunk_size,
+        )
+        self.result.parented = len(parent_of)
+        self.result.related = len(links)
+
+    def run(self, rows):
+        chunk = []
+        for item in rows:
+            chunk.append(item)
+            if len(chunk) == self.chunk_size:
+                self._chunk_done(chunk)
+                chunk = []
+        if chunk:
+            self._chunk_done(chunk)
+        self.check_references()
+        if self.error_count:
+            raise TicketImportError(sorted(self.errors), self.error_count)
+        self.link()
+        self.result.elapsed = time.monotonic() - self.result.started
+
+    def _chunk_done(self, chunk):
+        self.load_chunk(chunk)
+        self.result.elapsed = time.monotonic() - self.result.started
+        if self.progress is not None:
+            self.progress(self.result)
+
+
+def import_tickets(board, stream, fmt, user=None, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False, progress=None):
+    """Import every row of the text ``stream`` (``csv`` or ``jsonl``) into ``board``.
+
+    Recognized columns: ``key``, ``title`` (required), ``description``,
+    ``status``, ``priority``, ``ticket_type`` (or ``type``), ``importance``,
+    ``urgency``, ``assignee`` (a username), ``parent`` (a key) and
+    ``related`` (keys, separated by commas, semicolons or spaces, or a JSON
+    list). ``progress(result)`` is called after each chunk. ``dry_run``
+    does everything and then rolls back. Returns an ``ImportResult``; raises
+    ``TicketImportError`` if any row is invalid.
+    """
+    fmt = normalize_format(fmt)
+    result = ImportResult(dry_run=dry_run)
+    importer = _Importer(board, user, chunk_size, result, progress)
+    with transaction.atomic():
+        importer.seq = Board.bump_version(board.pk) or 0
+        importer.run(read_rows(stream, fmt))
+        if dry_run:
+            transaction.set_rollback(True)
+        else:
+            publish_on_commit(board.pk, lambda: {'type': 'resync'})
+    return result
@@ -0,0 +1,166 @@
+"""Live board updates: fan-out of board events to server-sent-event streams.
+
+Mutations publish small JSON-able events (``ticket``, ``ticket_deleted``,
+``comment``) once their transaction commits; each open board page holds an
+async subscription and receives them as they happen.
+
+Two brokers ship with the app, selected by ``settings.TICKETS_LIVE_BROKER``:
+
+``InProcessBroker``
+    Fan-out inside one worker process. Zero latency and no extra queries,
+    but viewers connected to another worker never see the event.
+``DatabasePollingBroker``
+    Stand-in for a real message bus in multi-worker setups. Each worker runs
+    one poller per watched board against the delta-sync feed and fans the
+    results out in-process, so every worker sees every change.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+DEFAULT_BROKER = 'tickets.live.InProcessBroker'
+
+
+class _Subscription:
+    def __init__(self, loop, maxsize):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def push(self, event):
+        # Called from any thread (sync views run in worker threads).
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        if self.queue.full():
+            # A slow consumer loses the backlog and is told to resync instead.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = {'type': 'resync'}
+        self.queue.put_nowait(event)
+
+
+class InProcessBroker:
+    queue_size = 100
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def publish(self, board_id, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(board_id, ()))
+        for subscription in subscriptions:
+            subscription.push(event)
+
+    def wants(self, board_id):
+        """Whether events for ``board_id`` have anyone to go to in this worker."""
+        return self.subscriber_count(board_id) > 0
+
+    def subscriber_count(self, board_id):
+        with self._lock:
+            return len(self._subscriptions.get(board_id, ()))
+
+    def _add(self, board_id, subscription):
+        with self._lock:
+            self._subscriptions[board_id].add(subscription)
+
+    def _remove(self, board_id, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(board_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[board_id]
+
+    async def subscribe(self, board_id, timeout=15):
+        """Async generator of events for ``board_id``.
+
+        Yields ``None`` whenever ``timeout`` seconds pass without an event so
+        the caller can emit a keep-alive.
+        """
+        subscription = _Subscription(asyncio.get_running_loop(), self.queue_size)
+        self._add(board_id, subscription)
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscription.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            self._remove(board_id, subscription)
+
+
+class DatabasePollingBroker(InProcessBroker):
+    poll_interval = 2
+
+    def __init__(self):
+        super().__init__()
+        self._pollers = {}
+
+    def wants(self, board_id):
+        # The database is the bus: every worker (this one included) picks the
+        # change up from the delta feed on its next poll, in sequence order.
+        return False
+
+    async def subscribe(self, board_id, timeout=15):
+        if board_id not in self._pollers or self._pollers[board_id].done():
+            self._pollers[board_id] = asyncio.get_running_loop().create_task(self._poll(board_id))
+        async for event in super().subscribe(board_id, timeout=timeout):
+            yield event
+
+    async def _poll(self, board_id):
+        from .models import Board
+        from .sync import board_changes
+
+        cursor = await Board.objects.filter(pk=board_id).values_list('version', flat=True).afirst()
+        while cursor is not None and self.subscriber_count(board_id):
+            await asyncio.sleep(self.poll_interval)
+            has_more = True
+            while has_more:
+                changes = await sync_to_async(board_changes)(board_id, cursor)
+                if changes is None:
+                    return
+                for event in events_from_changes(changes):
+                    super().publish(board_id, event)
+                cursor, has_more = changes['cursor'], changes['has_more']
+
+
+def events_from_changes(changes):
+    """Translate a delta-sync payload into the events live clients expect."""
+    for ticket in changes['tickets']:
+        yield {'type': 'ticket', 'ticket': ticket}
+    for ticket_id in changes['deleted']:
+        yield {'type': 'ticket_deleted', 'ticket_id': ticket_id}
+    for activity in changes['activities']:
+        if activity['activity_type'] == 'commented':
+            yield {'type': 'comment', 'ticket_id': activity['ticket_id'], 'user': activity['user']}
+
+
+_broker = None
+_broker_path = None
+
+
+def get_broker():
+    global _broker, _broker_path
+    path = getattr(settings, 'TICKETS_LIVE_BROKER', DEFAULT_BROKER)
+    if _broker is None or path != _broker_path:
+        _broker, _broker_path = import_string(path)(), path
+    return _broker
+
+
+def publish_on_commit(board_id, build_event):
+    """Push a live event to board viewers once the current transaction commits.
+
+    ``build_event`` is only called when this worker's broker has someone to
+    deliver to, so changes on unwatched boards cost nothing extra.
+    """
+    def send():
+        broker = get_broker()
+        if broker.wants(board_id):
+            broker.publish(board_id, build_event())
+    transaction.on_commit(send)
@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from tickets.retention import DEFAULT_CHUNK_SIZE, archive_activities, archive_dir, retention_days
+
+
+class Command(BaseCommand):
+    help = 'Move ticket activities older than the retention period into a compressed archive file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Archive activities older than this many days (default: TICKETS_ACTIVITY_RETENTION_DAYS).')
+        parser.add_argument('--dir', help='Directory for archive files (default: TICKETS_ACTIVITY_ARCHIVE_DIR).')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows read and deleted per batch.')
+
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else retention_days()
+        if days < 0 or options['chunk_size'] < 1:
+            raise CommandError('--days must be >= 0 and --chunk-size >= 1')
+        cutoff = timezone.now() - timedelta(days=days)
+        path, count = archive_activities(cutoff, directory=options['dir'] or archive_dir(), chunk_size=options['chunk_size'])
+        if path is None:
+            self.stdout.write(f'No activities older than {days} day(s)')
+            return
+        self.stdout.write(self.style.SUCCESS(f'Archived {count} activity row(s) to {path}'))
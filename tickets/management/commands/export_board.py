@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tickets.exporter import EXPORT_KINDS, BoardExport, ExportError, parse_since
+from tickets.models import Board
+
+
+def _values(option):
+    return [v for raw in option or () for v in raw.split(',') if v]
+
+
+class Command(BaseCommand):
+    help = "Stream a board's tickets, comments or activities as CSV or JSON lines."
+
+    def add_arguments(self, parser):
+        parser.add_argument('board', type=int, help='Id of the board to export.')
+        parser.add_argument('--format', default='csv', help='csv or jsonl (ndjson).')
+        parser.add_argument('--include', action='append', help=f'Record kinds, any of: {", ".join(EXPORT_KINDS)} (default: tickets).')
+        parser.add_argument('--columns', action='append', help='Columns to write (one record kind only).')
+        parser.add_argument('--status', action='append', help='Only tickets in these statuses.')
+        parser.add_argument('--type', action='append', help='Only tickets of these types.')
+        parser.add_argument('--updated-since', help='Only records written since this ISO date or datetime.')
+        parser.add_argument('--output', '-o', help='File to write (default: standard output).')
+
+    def handle(self, *args, **options):
+        if not Board.objects.filter(pk=options['board']).exists():
+            raise CommandError(f"Board {options['board']} does not exist")
+        try:
+            export = BoardExport(
+                options['board'],
+                fmt=options['format'],
+                kinds=_values(options['include']),
+                columns=_values(options['columns']),
+                statuses=_values(options['status']),
+                types=_values(options['type']),
+                since=parse_since(options['updated_since']) if options['updated_since'] else None,
+            )
+        except ExportError as exc:
+            raise CommandError(str(exc))
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as out:
+                count = self._write(export, out)
+            self.stderr.write(f"Exported {count} record(s) to {options['output']}")
+        else:
+            self._write(export, self.stdout)
+
+    def _write(self, export, out):
+        count = -1 if export.fmt == 'csv' else 0  # the CSV header is not a record
+        for line in export.lines():
+            out.write(line)
+            count += 1
+        return count
@@ -0,0 +1,60 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tickets.importer import DEFAULT_CHUNK_SIZE, TicketImportError, import_tickets, normalize_format
+from tickets.models import Board
+
+
+class Command(BaseCommand):
+    help = 'Stream tickets from a CSV or JSON-lines file into a board, resolving parents and links by key.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('board', type=int, help='Id of the board to import into.')
+        parser.add_argument('path', help="File to read, or '-' for standard input.")
+        parser.add_argument('--format', help='csv or jsonl (default: from the file extension).')
+        parser.add_argument('--user', help='Username recorded as the creator of the imported tickets.')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows validated and inserted per batch.')
+        parser.add_argument('--dry-run', action='store_true', help='Validate and import, then roll everything back.')
+
+    def handle(self, *args, **options):
+        board = Board.objects.filter(pk=options['board']).first()
+        if board is None:
+            raise CommandError(f"Board {options['board']} does not exist")
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be >= 1')
+        user = None
+        if options['user']:
+            user = get_user_model().objects.filter(username=options['user']).first()
+            if user is None:
+                raise CommandError(f"User {options['user']} does not exist")
+        path = options['path']
+        try:
+            fmt = normalize_format(options['format'], None if path == '-' else path)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        def progress(result):
+            self.stdout.write(f'{result.rows} row(s) read, {result.created} created ({result.rows_per_second:.0f} rows/s)')
+
+        stream = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+        try:
+            result = import_tickets(
+                board, stream, fmt, user=user, chunk_size=options['chunk_size'],
+                dry_run=options['dry_run'], progress=progress,
+            )
+        except TicketImportError as exc:
+            for number, message in exc.errors:
+                self.stderr.write(f'row {number}: {message}')
+            raise CommandError(f'{exc}; nothing was imported')
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        summary = (
+            f'Imported {result.created} ticket(s), {result.parented} parent link(s) and '
+            f'{result.related} related link(s) in {result.elapsed:.1f}s ({result.rows_per_second:.0f} rows/s)'
+        )
+        if result.dry_run:
+            summary = f'Dry run: {summary}; rolled back'
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tickets.models import Board, Ticket
+from tickets.ranking import RANK_GAP, rebalance_column
+
+
+class Command(BaseCommand):
+    help = 'Re-space ticket ranks in board columns whose gaps have run out.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, help='Only rebalance this board id.')
+        parser.add_argument('--status', choices=[key for key, _ in Ticket.STATUS_CHOICES], help='Only rebalance this status column.')
+        parser.add_argument(
+            '--min-gap', type=int, default=2,
+            help='Rebalance columns whose smallest gap between neighbours is below this (default: 2). '
+                 f'Use {RANK_GAP + 1} to force every column.',
+        )
+
+    def handle(self, *args, **options):
+        boards = Board.objects.all()
+        if options['board'] is not None:
+            boards = boards.filter(pk=options['board'])
+            if not boards.exists():
+                raise CommandError(f"Board {options['board']} does not exist")
+        statuses = [options['status']] if options['status'] else [key for key, _ in Ticket.STATUS_CHOICES]
+        rebalanced = 0
+        for board_id in boards.values_list('id', flat=True).iterator():
+            for status in statuses:
+                if self._smallest_gap(board_id, status) < options['min_gap']:
+                    count = rebalance_column(board_id, status)
+                    rebalanced += 1
+                    self.stdout.write(f'Board {board_id} / {status}: re-ranked {count} tickets')
+        self.stdout.write(self.style.SUCCESS(f'Rebalanced {rebalanced} column(s)'))
+
+    def _smallest_gap(self, board_id, status):
+        ranks = (
+            Ticket.objects.filter(board_id=board_id, status=status)
+            .order_by('sort_order', 'id')
+            .values_list('sort_order', flat=True)
+            .iterator(chunk_size=2000)
+        )
+        smallest = RANK_GAP
+        previous = None
+        for rank in ranks:
+            if previous is not None:
+                smallest = min(smallest, rank - previous)
+            previous = rank
+        return smallest
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tickets.models import Board
+from tickets.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index over ticket titles, descriptions and comments.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, help='Only re-index tickets on this board id.')
+
+    def handle(self, *args, **options):
+        if options['board'] is not None and not Board.objects.filter(pk=options['board']).exists():
+            raise CommandError(f"Board {options['board']} does not exist")
+        backend = get_search_backend()
+        indexed = backend.rebuild(board_id=options['board'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} ticket(s) with {type(backend).__name__}'))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tickets.models import Board, Ticket
+
+
+class Command(BaseCommand):
+    help = 'Recompute hierarchy paths and epic/ticket rollups from scratch, or verify they have not drifted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, help='Only check tickets on this board id.')
+        parser.add_argument('--check', action='store_true', help='Report drift without fixing it; exits non-zero if any is found.')
+
+    def handle(self, *args, **options):
+        tickets = Ticket.objects.all()
+        if options['board'] is not None:
+            if not Board.objects.filter(pk=options['board']).exists():
+                raise CommandError(f"Board {options['board']} does not exist")
+            tickets = tickets.filter(board_id=options['board'])
+        if not options['check']:
+            fixed = tickets.rebuild_paths()
+            if fixed:
+                self.stdout.write(f'Rebuilt {fixed} hierarchy path(s)')
+        drifted = tickets.recompute_rollups(commit=not options['check'])
+        if options['check']:
+            if drifted:
+                shown = ', '.join(str(pk) for pk in drifted[:20])
+                raise CommandError(f'{len(drifted)} ticket(s) have drifted rollups: {shown}')
+            self.stdout.write(self.style.SUCCESS('Rollups are consistent'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Recomputed rollups; fixed {len(drifted)} ticket(s)'))
@@ -0,0 +1,21 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tickets.retention import DEFAULT_CHUNK_SIZE, restore_activities
+
+
+class Command(BaseCommand):
+    help = 'Load ticket activities back from archive files written by archive_activity.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='Archive files (.jsonl.gz) to restore.')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows inserted per batch.')
+
+    def handle(self, *args, **options):
+        for path in options['paths']:
+            if not os.path.exists(path):
+                raise CommandError(f'{path} does not exist')
+        for path in options['paths']:
+            restored = restore_activities(path, chunk_size=options['chunk_size'])
+            self.stdout.write(self.style.SUCCESS(f'Restored {restored} activity row(s) from {path}'))
@@ -0,0 +1,82 @@
+"""Importance × urgency matrix aggregation.
+
+The matrix view shows a 10×10 grid of ticket counts. Counts come from one
+``GROUP BY importance, urgency`` over the board (served by the
+``ticket_board_matrix_idx`` index), and the optional top-K preview per cell
+from one window-ranked query, so the payload size is bounded by the grid,
+not by the board.
+"""
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+
+from .board_loader import serialize_ticket
+from .models import Ticket
+
+MATRIX_LEVELS = range(1, 11)
+MAX_MATRIX_TOP = 20
+
+
+def _matrix_queryset(board_id, statuses=None, types=None):
+    qs = Ticket.objects.filter(
+        board_id=board_id,
+        importance__range=(MATRIX_LEVELS[0], MATRIX_LEVELS[-1]),
+        urgency__range=(MATRIX_LEVELS[0], MATRIX_LEVELS[-1]),
+    )
+    if statuses:
+        qs = qs.filter(status__in=statuses)
+    if types:
+        qs = qs.filter(ticket_type__in=types)
+    return qs
+
+
+def matrix_counts(board_id, statuses=None, types=None):
+    """``{(importance, urgency): count}`` for every non-empty cell."""
+    rows = (
+        _matrix_queryset(board_id, statuses, types)
+        .order_by()
+        .values('importance', 'urgency')
+        .annotate(count=Count('id'))
+    )
+    return {(row['importance'], row['urgency']): row['count'] for row in rows}
+
+
+def matrix_top(board_id, top, statuses=None, types=None):
+    """First ``top`` tickets of every cell in board rank order, keyed like ``matrix_counts``."""
+    top = min(top, MAX_MATRIX_TOP)
+    qs = (
+        _matrix_queryset(board_id, statuses, types)
+        .select_related('parent')
+        .annotate(cell_rank=Window(
+            expression=RowNumber(),
+            partition_by=[F('importance'), F('urgency')],
+            order_by=[F('sort_order').asc(), F('id').asc()],
+        ))
+        .filter(cell_rank__lte=top)
+        .order_by('importance', 'urgency', 'cell_rank')
+    )
+    cells = {}
+    for ticket in qs:
+        cells.setdefault((ticket.importance, ticket.urgency), []).append(ticket)
+    return cells
+
+
+def build_matrix(board_id, statuses=None, types=None, top=0):
+    """Grid payload: all 100 cells, highest importance row first.
+
+    Each cell carries ``importance``, ``urgency``, ``count`` and, when ``top``
+    is given, the serialized ``tickets`` previewed in that cell.
+    """
+    counts = matrix_counts(board_id, statuses, types)
+    previews = matrix_top(board_id, top, statuses, types) if top else {}
+    cells = []
+    for importance in reversed(MATRIX_LEVELS):
+        for urgency in MATRIX_LEVELS:
+            cell = {
+                'importance': importance,
+                'urgency': urgency,
+                'count': counts.get((importance, urgency), 0),
+            }
+            if top:
+                cell['tickets'] = [serialize_ticket(t) for t in previews.get((importance, urgency), [])]
+            cells.append(cell)
+    return {'cells': cells, 'total': sum(counts.values())}
@@ -0,0 +1,44 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0017_board_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticket_id', models.BigIntegerField()),
+                ('change_seq', models.PositiveBigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='change_seq',
+            field=models.PositiveBigIntegerField(default=0, help_text='Board version at which this ticket last changed.'),
+        ),
+        migrations.AddField(
+            model_name='ticketactivity',
+            name='change_seq',
+            field=models.PositiveBigIntegerField(db_index=True, default=0, help_text='Board version at which this activity was recorded.'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['board', 'change_seq'], name='ticket_board_change_idx'),
+        ),
+        migrations.AddField(
+            model_name='tickettombstone',
+            name='board',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='tombstones', to='tickets.board'),
+        ),
+        migrations.AddIndex(
+            model_name='tickettombstone',
+            index=models.Index(fields=['board', 'change_seq'], name='tombstone_board_change_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+RANK_GAP = 1 << 16
+
+
+def spread_ranks(apps, schema_editor):
+    """Give every existing column gap-spaced ranks, preserving current order."""
+    Ticket = apps.get_model('tickets', 'Ticket')
+    columns = Ticket.objects.values_list('board_id', 'status').distinct()
+    for board_id, status in columns:
+        ids = Ticket.objects.filter(board_id=board_id, status=status).order_by('sort_order', 'id').values_list('id', flat=True)
+        tickets = [Ticket(id=pk, sort_order=(i + 1) * RANK_GAP) for i, pk in enumerate(ids)]
+        Ticket.objects.bulk_update(tickets, ['sort_order'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0018_ticket_change_seq_tombstones'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ticket',
+            name='sort_order',
+            field=models.BigIntegerField(db_index=True, default=0, help_text='Gap-based rank within a board column; see tickets.ranking.'),
+        ),
+        migrations.RunPython(spread_ranks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_priority_score(apps, schema_editor):
+    Ticket = apps.get_model('tickets', 'Ticket')
+    Ticket.objects.update(priority_score=F('importance') * F('urgency'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0019_ticket_sort_order_gap_ranks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='priority_score',
+            field=models.PositiveSmallIntegerField(db_index=True, default=1, editable=False, help_text='Stored importance × urgency (1 … 100), kept current on save and queryset writes.'),
+        ),
+        migrations.RunPython(backfill_priority_score, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['board', 'status', '-priority_score', 'sort_order', 'id'], name='ticket_board_priority_idx'),
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0020_ticket_priority_score'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['board', 'importance', 'urgency', 'status', 'ticket_type'], name='ticket_board_matrix_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations, models
+
+
+def build_paths(apps, schema_editor):
+    """Derive every ticket's ancestor path from its parent chain."""
+    Ticket = apps.get_model('tickets', 'Ticket')
+    parents = dict(Ticket.objects.values_list('id', 'parent_id'))
+    paths = {}
+
+    def path_of(pk, seen=()):
+        if pk not in paths:
+            parent = parents.get(pk)
+            if parent is None or parent in seen:
+                paths[pk] = ''
+            else:
+                paths[pk] = path_of(parent, seen + (pk,)) + f'{parent:010d}/'
+        return paths[pk]
+
+    tickets = [Ticket(id=pk, path=path_of(pk), depth=path_of(pk).count('/')) for pk in parents]
+    Ticket.objects.bulk_update(tickets, ['path', 'depth'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0021_ticket_board_matrix_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Number of ancestors; 0 for a root ticket.'),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='Materialized path of ancestor ids (root first); maintained on save.', max_length=255),
+        ),
+        migrations.RunPython(build_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+from django.db import migrations, models
+
+ROLLUP_FIELDS = ('descendant_count', 'descendant_done_count', 'open_bug_count', 'descendant_score_sum')
+
+
+def compute_rollups(apps, schema_editor):
+    Ticket = apps.get_model('tickets', 'Ticket')
+    totals = {}
+    for path, status, ticket_type, score in Ticket.objects.exclude(path='').values_list('path', 'status', 'ticket_type', 'priority_score'):
+        contribution = (1, int(status == 'done'), int(ticket_type == 'bug' and status != 'done'), score)
+        for segment in path.split('/'):
+            if segment:
+                total = totals.setdefault(int(segment), [0, 0, 0, 0])
+                for i, value in enumerate(contribution):
+                    total[i] += value
+    tickets = [Ticket(id=pk, **dict(zip(ROLLUP_FIELDS, total))) for pk, total in totals.items()]
+    Ticket.objects.bulk_update(tickets, ROLLUP_FIELDS, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0022_ticket_hierarchy_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='descendant_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='descendant_done_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='descendant_score_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Sum of descendant priority scores.'),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='open_bug_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Descendant bugs not yet done.'),
+        ),
+        migrations.RunPython(compute_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+from django.db import migrations
+
+# The search table lives outside the ORM (see tickets/search.py): an FTS5
+# virtual table on SQLite, a tsvector + GIN index on PostgreSQL. Other
+# databases get no table and search falls back to icontains.
+
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE tickets_search USING fts5("
+    "title, description, comments, board_id UNINDEXED, tokenize = 'porter unicode61')",
+    "INSERT INTO tickets_search (rowid, board_id, title, description, comments) "
+    "SELECT t.id, t.board_id, t.title, t.description, "
+    "COALESCE((SELECT group_concat(c.body, char(10)) FROM tickets_ticketcomment c WHERE c.ticket_id = t.id), '') "
+    "FROM tickets_ticket t",
+]
+
+POSTGRES_CREATE = [
+    "CREATE TABLE tickets_search ("
+    "ticket_id bigint PRIMARY KEY REFERENCES tickets_ticket (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+    "board_id bigint NOT NULL, "
+    "document tsvector NOT NULL)",
+    "CREATE INDEX tickets_search_document_idx ON tickets_search USING GIN (document)",
+    "CREATE INDEX tickets_search_board_idx ON tickets_search (board_id)",
+    "INSERT INTO tickets_search (ticket_id, board_id, document) "
+    "SELECT t.id, t.board_id, "
+    "setweight(to_tsvector('english', t.title), 'A') || "
+    "setweight(to_tsvector('english', t.description), 'B') || "
+    "setweight(to_tsvector('english', COALESCE((SELECT string_agg(c.body, E'\\n') FROM tickets_ticketcomment c WHERE c.ticket_id = t.id), '')), 'C') "
+    "FROM tickets_ticket t",
+]
+
+
+def create_search_table(apps, schema_editor):
+    statements = {'sqlite': SQLITE_CREATE, 'postgresql': POSTGRES_CREATE}.get(schema_editor.connection.vendor, [])
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute('DROP TABLE IF EXISTS tickets_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0024_ticket_parent_autocomplete_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -0,0 +1,36 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def backfill_activity_board(apps, schema_editor):
+    TicketActivity = apps.get_model('tickets', 'TicketActivity')
+    Ticket = apps.get_model('tickets', 'Ticket')
+    TicketActivity.objects.filter(ticket__isnull=False).update(
+        board_id=Subquery(Ticket.objects.filter(pk=OuterRef('ticket_id')).values('board_id')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0025_ticket_search_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ticketactivity',
+            name='ticket',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activities', to='tickets.ticket'),
+        ),
+        migrations.AddField(
+            model_name='ticketactivity',
+            name='board',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activities', to='tickets.board'),
+        ),
+        migrations.RunPython(backfill_activity_board, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='ticketactivity',
+            index=models.Index(fields=['board', 'change_seq'], name='activity_board_seq_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0026_ticketactivity_keep_after_ticket_delete'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ticketactivity',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
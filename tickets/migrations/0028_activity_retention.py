@@ -0,0 +1,45 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0027_ticketactivity_timestamp_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketActivitySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('activity_type', models.CharField(max_length=100)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('first_at', models.DateTimeField()),
+                ('last_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='ticketactivity',
+            index=models.Index(fields=['timestamp'], name='activity_timestamp_idx'),
+        ),
+        migrations.AddField(
+            model_name='ticketactivitysummary',
+            name='board',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='activity_summaries', to='tickets.board'),
+        ),
+        migrations.AddField(
+            model_name='ticketactivitysummary',
+            name='ticket',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activity_summaries', to='tickets.ticket'),
+        ),
+        migrations.AddIndex(
+            model_name='ticketactivitysummary',
+            index=models.Index(fields=['ticket', 'day'], name='activity_summary_ticket_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticketactivitysummary',
+            index=models.Index(fields=['board', 'day'], name='activity_summary_board_idx'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+import hashlib
+import re
+
+from django.db import migrations, models
+
+# A frozen copy of tickets.themes.compile_theme_css as of this migration, so
+# later changes to the live compiler can't change (or break) what it writes.
+# Themes saved afterwards are recompiled by the live code.
+THEME_COLOR_KEYS = ('primary', 'secondary', 'background', 'surface', 'text', 'accent', 'border', 'danger', 'success', 'info')
+DEFAULT_THEME_COLORS = {
+    'primary': '#bb86fc',
+    'secondary': '#6649a8',
+    'background': '#1a1625',
+    'surface': '#251f35',
+    'text': '#e1e1e6',
+    'accent': '#985eff',
+    'border': '#332b45',
+    'danger': '#cf6679',
+    'success': '#03dac6',
+    'info': '#8bb4fe',
+}
+SAFE_COLOR_RE = re.compile(r'^[#\w\s(),.%-]{1,64}$')
+
+
+def compile_theme_css(raw):
+    normalized = {}
+    for key, value in (raw or {}).items():
+        normalized[key[:-6] if key.endswith('_color') else key] = value
+    lines = [':root {']
+    for k in THEME_COLOR_KEYS:
+        value = normalized.get(k)
+        if not value or not isinstance(value, str) or not SAFE_COLOR_RE.match(value):
+            value = DEFAULT_THEME_COLORS[k]
+        lines.append(f'    --{k}-color: {value};')
+    lines.append('}')
+    css = '\n'.join(lines) + '\n'
+    return hashlib.sha256(css.encode()).hexdigest()[:32], css
+
+
+def compile_existing_themes(apps, schema_editor):
+    UserTheme = apps.get_model('tickets', 'UserTheme')
+    themes = list(UserTheme.objects.only('id', 'colors'))
+    for theme in themes:
+        theme.css_hash, theme.compiled_css = compile_theme_css(theme.colors if isinstance(theme.colors, dict) else {})
+    UserTheme.objects.bulk_update(themes, ['css_hash', 'compiled_css'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0028_activity_retention'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usertheme',
+            name='compiled_css',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='usertheme',
+            name='css_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=32),
+        ),
+        migrations.RunPython(compile_existing_themes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_preferences(apps, schema_editor):
+    UserTheme = apps.get_model('tickets', 'UserTheme')
+    ThemePreference = apps.get_model('tickets', 'ThemePreference')
+    counts = ThemePreference.objects.filter(theme__isnull=False).values('theme_id').annotate(n=Count('id'))
+    for row in counts:
+        UserTheme.objects.filter(pk=row['theme_id']).update(preference_count=row['n'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0029_usertheme_compiled_css'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usertheme',
+            name='preference_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_preferences, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='usertheme',
+            index=models.Index(fields=['is_public', '-preference_count', 'id'], name='theme_gallery_popular_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usertheme',
+            index=models.Index(fields=['is_public', 'name', 'id'], name='theme_gallery_name_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.db import migrations
+
+# Expression indexes on lower(name) for the assignee typeahead's
+# case-insensitive prefix lookups (see tickets/autocomplete.py). The user
+# table belongs to another app, so they are created with raw SQL; PostgreSQL
+# needs text_pattern_ops for LIKE 'prefix%' to use them.
+
+NAME_FIELDS = ('username', 'first_name', 'last_name')
+
+
+def _index_name(field):
+    return f'tickets_user_{field}_lower_idx'
+
+
+def create_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor not in ('sqlite', 'postgresql'):
+        return
+    opclass = ' text_pattern_ops' if vendor == 'postgresql' else ''
+    table = schema_editor.quote_name(apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table)
+    for field in NAME_FIELDS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {_index_name(field)} ON {table} (lower({schema_editor.quote_name(field)}){opclass})'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        for field in NAME_FIELDS:
+            schema_editor.execute(f'DROP INDEX IF EXISTS {_index_name(field)}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tickets', '0030_usertheme_gallery'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -1,12 +1,41 @@
 
-from django.db import models
+from collections import defaultdict
+from functools import reduce
+import operator
+
+from django.db import models, transaction
+from django.db.models.functions import Concat, Substr
+from django.utils import timezone
+
+from .search import SEARCH_FIELDS, index_tickets, remove_tickets
 
 class TicketActivity(models.Model):
-	ticket = models.ForeignKey('Ticket', on_delete=models.CASCADE, related_name='activities')
+	# Values written by the app; listed here so filters need not scan for them.
+	ACTIVITY_TYPES = ('created', 'updated', 'commented', 'deleted')
+
+	# Nulled rather than cascaded so the audit trail outlives deleted tickets.
+	ticket = models.ForeignKey('Ticket', null=True, blank=True, on_delete=models.SET_NULL, related_name='activities')
+	# The board the row was recorded on, whose version ``change_seq`` belongs to; kept after the ticket is gone.
+	board = models.ForeignKey('Board', null=True, blank=True, on_delete=models.SET_NULL, related_name='activities')
 	user = models.ForeignKey('auth.User', null=True, on_delete=models.SET_NULL)
 	activity_type = models.CharField(max_length=100)
 	description = models.TextField(blank=True)
-	timestamp = models.DateTimeField(auto_now_add=True)
+	# Set by the caller when buffered rows are written after the fact (see activity.py).
+	timestamp = models.DateTimeField(default=timezone.now, editable=False)
+	change_seq = models.PositiveBigIntegerField(default=0, db_index=True, help_text='Board version at which this activity was recorded.')
+
+	class Meta:
+		indexes = [
+			# Newest-first feeds and the retention cutoff scan (see retention.py).
+			models.Index(fields=['timestamp'], name='activity_timestamp_idx'),
+			# Board feeds and delta sync, deleted tickets' rows included.
+			models.Index(fields=['board', 'change_seq'], name='activity_board_seq_idx'),
+		]
+
+	def save(self, *args, **kwargs):
+		# The pre_save receiver takes a board version; the row must commit with it.
+		with transaction.atomic():
+			super().save(*args, **kwargs)
 
 	def __str__(self):
 		return f"{self.user} {self.activity_type} {self.ticket} at {self.timestamp}"
@@ -15,12 +44,374 @@ class Board(models.Model):
 	name = models.CharField(max_length=100)
 	description = models.TextField(blank=True)
 	created_at = models.DateTimeField(auto_now_add=True)
+	version = models.PositiveBigIntegerField(default=0, help_text='Incremented on every ticket, comment or activity change on this board.')
 
 	def __str__(self):
 		return self.name
 
+	@classmethod
+	def bump_version(cls, board_id):
+		"""Atomically advance the board's version counter and return the new value.
+
+		The UPDATE takes a row lock that is held until the surrounding
+		transaction commits. Rows stamped with the returned value must be
+		written in that same transaction (``Ticket``, ``TicketActivity`` and
+		``TicketComment`` saves wrap their signal receivers in one); then
+		change sequences become visible in order. Called outside a
+		transaction, the bump commits on its own and a later version can
+		commit before the stamped row. Returns ``None`` if the board no
+		longer exists.
+		"""
+		with transaction.atomic():
+			cls.objects.filter(pk=board_id).update(version=models.F('version') + 1)
+			return cls.objects.filter(pk=board_id).values_list('version', flat=True).first()
+
+
+def _as_expression(value):
+	return value if hasattr(value, 'resolve_expression') else models.Value(value)
+
+
+def path_segment(ticket_id):
+	"""Fixed-width materialized-path segment, so string order matches tree order."""
+	return f'{ticket_id:010d}/'
+
+
+def ancestor_ids_from_path(path):
+	return [int(segment) for segment in path.split('/') if segment]
+
+
+ROLLUP_FIELDS = ('descendant_count', 'descendant_done_count', 'open_bug_count', 'descendant_score_sum')
+# Fields that change what a ticket contributes to its ancestors' rollups.
+ROLLUP_SOURCE_FIELDS = {'status', 'ticket_type', 'importance', 'urgency', 'priority_score'}
+
+
+def rollup_contribution(status, ticket_type, priority_score):
+	"""What one ticket adds to each of its ancestors' ``ROLLUP_FIELDS``."""
+	return (1, int(status == 'done'), int(ticket_type == 'bug' and status != 'done'), priority_score)
+
+
+def _add_rollup_delta(deltas, path, delta, sign=1):
+	if not any(delta):
+		return
+	for ancestor in ancestor_ids_from_path(path):
+		total = deltas.setdefault(ancestor, [0] * len(ROLLUP_FIELDS))
+		for i, value in enumerate(delta):
+			total[i] += sign * value
+
+
+def apply_rollup_deltas(deltas, change_seq=None):
+	"""Add ``{ancestor_id: delta}`` to the stored rollups.
+
+	Rows sharing a delta (the usual case: every ancestor of one changed
+	ticket) are adjusted by a single relative UPDATE, so concurrent changes
+	under the same epic never overwrite each other. ``change_seq`` stamps the
+	ancestors so delta sync picks their new progress up.
+	"""
+	groups = defaultdict(list)
+	for pk, delta in deltas.items():
+		if any(delta):
+			groups[tuple(delta)].append(pk)
+	for delta, ids in groups.items():
+		changes = {field: models.F(field) + value for field, value in zip(ROLLUP_FIELDS, delta) if value}
+		if change_seq is not None:
+			changes['change_seq'] = change_seq
+		Ticket.objects.filter(id__in=ids).update(**changes)
+
+
+class TicketQuerySet(models.QuerySet):
+	"""Keeps the stored ``priority_score``, hierarchy path and rollups in step.
+
+	``update()``, ``bulk_update()`` and ``bulk_create()`` never call
+	``Ticket.save()``, so each one derives the score (and, for new or
+	reparented rows, the path) itself and pushes rollup deltas to ancestors.
+	Writes touching searchable fields re-index the affected rows.
+	"""
+
+	def descendants_of(self, ticket):
+		"""Every ticket below ``ticket`` in the hierarchy: one indexed prefix scan."""
+		return self.filter(path__startswith=ticket.lineage)
+
+	def ancestors_of(self, ticket):
+		"""``ticket``'s ancestors, root first."""
+		return self.filter(id__in=ticket.ancestor_ids).order_by('depth')
+
+	def rebuild_paths(self):
+		"""Recompute ``path``/``depth`` of the rows in this queryset from ``parent``.
+
+		Ancestors outside the queryset are read one hierarchy level per query;
+		only rows whose stored path is wrong are written. Returns the number of
+		rows fixed.
+		"""
+		parents = dict(self.values_list('id', 'parent_id'))
+		missing = {p for p in parents.values() if p is not None and p not in parents}
+		while missing:
+			found = dict(self.model.objects.filter(id__in=missing).values_list('id', 'parent_id'))
+			for pk in missing:
+				parents[pk] = found.get(pk)
+			missing = {p for p in found.values() if p is not None and p not in parents}
+		paths = {}
+
+		def path_of(pk):
+			chain = []
+			cur = parents.get(pk)
+			while cur is not None and cur not in paths and cur not in chain:
+				chain.append(cur)
+				cur = parents.get(cur)
+			prefix = paths.get(cur, '') + (path_segment(cur) if cur in paths else '')
+			for ancestor in reversed(chain):
+				paths[ancestor] = prefix
+				prefix += path_segment(ancestor)
+			return prefix
+
+		stale = []
+		for pk, path, depth in self.values_list('id', 'path', 'depth').iterator():
+			expected = path_of(pk)
+			expected_depth = expected.count('/')
+			if (path, depth) != (expected, expected_depth):
+				stale.append(self.model(id=pk, path=expected, depth=expected_depth))
+		self.bulk_update(stale, ['path', 'depth'], batch_size=500)
+		return len(stale)
+
+	def recompute_rollups(self, commit=True):
+		"""Recompute ``ROLLUP_FIELDS`` of the rows in this queryset from scratch.
+
+		Descendants are found by path prefix (a full scan of non-root rows when
+		many targets are given). Only drifted rows are written, and nothing at
+		all with ``commit=False``. Returns the ids whose stored rollups were wrong.
+		"""
+		targets = {
+			pk: (path + path_segment(pk), tuple(stored))
+			for pk, path, *stored in self.values_list('id', 'path', *ROLLUP_FIELDS).iterator()
+		}
+		if not targets:
+			return []
+		sources = self.model.objects.exclude(path='')
+		if len(targets) <= 50:
+			sources = sources.filter(reduce(operator.or_, (models.Q(path__startswith=lineage) for lineage, _ in targets.values())))
+		totals = {pk: [0] * len(ROLLUP_FIELDS) for pk in targets}
+		for path, status, ticket_type, score in sources.values_list('path', 'status', 'ticket_type', 'priority_score').iterator():
+			contribution = rollup_contribution(status, ticket_type, score)
+			for ancestor in ancestor_ids_from_path(path):
+				total = totals.get(ancestor)
+				if total is not None:
+					for i, value in enumerate(contribution):
+						total[i] += value
+		drifted = [pk for pk, (_, stored) in targets.items() if tuple(totals[pk]) != stored]
+		if commit:
+			self.bulk_update(
+				[self.model(id=pk, **dict(zip(ROLLUP_FIELDS, totals[pk]))) for pk in drifted],
+				ROLLUP_FIELDS, batch_size=500,
+			)
+		return drifted
+
+	def _rollup_inputs(self, ids):
+		return {
+			pk: {'path': path, 'status': status, 'ticket_type': ticket_type, 'priority_score': score}
+			for pk, path, status, ticket_type, score in self.model.objects.filter(id__in=ids)
+			.values_list('id', 'path', 'status', 'ticket_type', 'priority_score')
+		}
+
+	@staticmethod
+	def _rollup_deltas(before, after):
+		deltas = {}
+		for pk, old in before.items():
+			new = after.get(pk, old)
+			old_contribution = rollup_contribution(old['status'], old['ticket_type'], old['priority_score'])
+			new_contribution = rollup_contribution(new['status'], new['ticket_type'], new['priority_score'])
+			_add_rollup_delta(deltas, old['path'], [n - o for n, o in zip(new_contribution, old_contribution)])
+		return deltas
+
+	def _reparent(self, ids, write):
+		"""Run ``write()``, which changes the parent of ``ids``, and repair the hierarchy.
+
+		Only the moved subtrees get their paths re-derived, and only the old
+		and new ancestors of the moved rows get their rollups recomputed.
+		"""
+		moved = dict(self.model.objects.filter(id__in=ids).values_list('id', 'path'))
+		if not moved:
+			return write()
+		subtrees = reduce(
+			operator.or_,
+			(models.Q(path__startswith=path + path_segment(pk)) for pk, path in moved.items()),
+			models.Q(id__in=moved),
+		)
+		affected = list(self.model.objects.filter(subtrees).values_list('id', flat=True))
+		ancestors = {a for path in moved.values() for a in ancestor_ids_from_path(path)}
+		result = write()
+		self.model.objects.filter(id__in=affected).rebuild_paths()
+		for path in self.model.objects.filter(id__in=moved).values_list('path', flat=True):
+			ancestors.update(ancestor_ids_from_path(path))
+		if ancestors:
+			self.model.objects.filter(id__in=ancestors).recompute_rollups()
+		return result
+
+	def update(self, **kwargs):
+		if {'parent', 'parent_id'} & kwargs.keys() and 'path' not in kwargs:
+			# Reparenting moves whole subtrees; callers that set ``path`` themselves
+			# (Ticket.save, the importer) keep the hierarchy in step on their own.
+			with transaction.atomic():
+				ids = list(self.values_list('id', flat=True))
+				return self._reparent(ids, lambda: self.model.objects.filter(id__in=ids)._update_fields(kwargs))
+		return self._update_fields(kwargs)
+
+	def _update_fields(self, kwargs):
+		if ('importance' in kwargs or 'urgency' in kwargs) and 'priority_score' not in kwargs:
+			# SET clauses see the old row, so multiply the new values, not the columns.
+			importance = _as_expression(kwargs.get('importance', models.F('importance')))
+			urgency = _as_expression(kwargs.get('urgency', models.F('urgency')))
+			kwargs['priority_score'] = importance * urgency
+		rollups = bool(ROLLUP_SOURCE_FIELDS & kwargs.keys())
+		reindex = bool(SEARCH_FIELDS & kwargs.keys())
+		if not rollups and not reindex:
+			return super().update(**kwargs)
+		with transaction.atomic():
+			ids = list(self.values_list('id', flat=True))
+			before = self._rollup_inputs(ids) if rollups else None
+			updated = super().update(**kwargs)
+			if rollups:
+				after = self._rollup_inputs(ids)
+				apply_rollup_deltas(self._rollup_deltas(before, after))
+				flipped = [
+					pk for pk, old in before.items()
+					if pk in after and (old['status'] == 'done') != (after[pk]['status'] == 'done')
+				]
+				if flipped:
+					from .graph import restamp_dependents
+					restamp_dependents(flipped)
+			if reindex:
+				index_tickets(ids)
+		return updated
+
+	def bulk_update(self, objs, fields, batch_size=None):
+		objs = list(objs)
+		fields = list(fields)
+		if ('importance' in fields or 'urgency' in fields) and 'priority_score' not in fields:
+			for obj in objs:
+				obj.priority_score = obj.importance * obj.urgency
+			fields.append('priority_score')
+		with transaction.atomic():
+			# Rollup deltas for status/type/score, and the subtree repair after
+			# a reparent, are done by update(), which bulk_update() runs per batch.
+			return super().bulk_update(objs, fields, batch_size=batch_size)
+
+	def bulk_create(self, objs, *args, **kwargs):
+		objs = list(objs)
+		parent_ids = {obj.parent_id for obj in objs if obj.parent_id is not None}
+		parent_paths = {
+			pk: (path + path_segment(pk), depth + 1)
+			for pk, path, depth in self.model.objects.filter(id__in=parent_ids).values_list('id', 'path', 'depth')
+		}
+		deltas = {}
+		for obj in objs:
+			obj.priority_score = obj.importance * obj.urgency
+			obj.path, obj.depth = parent_paths.get(obj.parent_id, ('', 0))
+			_add_rollup_delta(deltas, obj.path, rollup_contribution(obj.status, obj.ticket_type, obj.priority_score))
+		with transaction.atomic():
+			created = super().bulk_create(objs, *args, **kwargs)
+			apply_rollup_deltas(deltas)
+			index_tickets([obj.pk for obj in created if obj.pk is not None])
+		return created
+
+	def delete(self):
+		"""Delete with the per-ticket bookkeeping done once for the whole set.
+
+		Tombstones, board version bumps, search rows and ancestor rollups are
+		written in bulk here; the ``post_delete`` receiver skips the ids listed
+		in ``_bulk_deleted`` and only handles rows removed by cascade.
+		"""
+		from .live import publish_on_commit
+
+		with transaction.atomic():
+			rows = list(self.values_list('id', 'board_id', 'path'))
+			self._bulk_deleted = {pk for pk, _, _ in rows}
+			deleted = super().delete()
+			survivors = {a for _, _, path in rows for a in ancestor_ids_from_path(path)} - self._bulk_deleted
+			if survivors:
+				self.model.objects.filter(id__in=survivors).recompute_rollups()
+			remove_tickets(self._bulk_deleted)
+			by_board = defaultdict(list)
+			for pk, board_id, _ in rows:
+				by_board[board_id].append(pk)
+			for board_id, ids in by_board.items():
+				seq = Board.bump_version(board_id)
+				if seq is None:
+					continue
+				TicketTombstone.objects.bulk_create(
+					[TicketTombstone(board_id=board_id, ticket_id=pk, change_seq=seq) for pk in ids], batch_size=500,
+				)
+				for pk in ids:
+					publish_on_commit(board_id, lambda pk=pk: {'type': 'ticket_deleted', 'ticket_id': pk})
+		return deleted
 
-class Ticket(models.Model):
+
+class ChangeTrackingMixin:
+	"""Snapshots field values as loaded so saves can diff without a SELECT.
+
+	``changes()`` maps each concrete field whose value differs from the
+	snapshot to ``(old, new)``; ``changed_fields()`` gives the field names a
+	save of an existing row has to write. The snapshot is refreshed for the
+	fields each save writes.
+	"""
+
+	@classmethod
+	def from_db(cls, db, field_names, values):
+		instance = super().from_db(db, field_names, values)
+		instance._snapshot = {}
+		instance._take_snapshot()
+		return instance
+
+	def refresh_from_db(self, using=None, fields=None):
+		super().refresh_from_db(using=using, fields=fields)
+		self._take_snapshot(fields)
+
+	def _take_snapshot(self, fields=None):
+		"""Record current values of ``fields`` (names or attnames; default all)."""
+		snapshot = getattr(self, '_snapshot', None)
+		if snapshot is None:
+			self._snapshot = snapshot = {}
+		for field in self._meta.concrete_fields:
+			if fields is None or field.name in fields or field.attname in fields:
+				snapshot[field.attname] = self.__dict__.get(field.attname, models.DEFERRED)
+
+	def loaded_value(self, attname):
+		"""Value of ``attname`` as last loaded or saved (``DEFERRED`` if unknown)."""
+		return getattr(self, '_snapshot', {}).get(attname, models.DEFERRED)
+
+	@property
+	def tracks_changes(self):
+		return not self._state.adding and getattr(self, '_snapshot', None) is not None
+
+	def changes(self, fields=None):
+		"""``{attname: (old, new)}`` for fields (attnames) changed since load.
+
+		Fields deferred at load time have no known old value and are left out.
+		"""
+		if not self.tracks_changes:
+			return {}
+		result = {}
+		for attname, old in self._snapshot.items():
+			if fields is not None and attname not in fields:
+				continue
+			if old is models.DEFERRED or attname not in self.__dict__:
+				continue
+			new = self.__dict__[attname]
+			if new != old:
+				result[attname] = (old, new)
+		return result
+
+	def changed_fields(self):
+		"""Names of the fields a save must write: changed ones plus any loaded after a deferral."""
+		names = set()
+		for field in self._meta.concrete_fields:
+			if field.primary_key or field.attname not in self.__dict__:
+				continue
+			old = self._snapshot.get(field.attname, models.DEFERRED)
+			if old is models.DEFERRED or self.__dict__[field.attname] != old:
+				names.add(field.name)
+		return names
+
+
+class Ticket(ChangeTrackingMixin, models.Model):
 
 	STATUS_CHOICES = [
 		('todo', 'To Do'),
@@ -45,11 +436,19 @@ class Ticket(models.Model):
 	status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='todo')
 	priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='medium')
 	ticket_type = models.CharField(max_length=10, choices=TICKET_TYPE_CHOICES, default='ticket', db_index=True, help_text='Categorizes this ticket in the hierarchy.')
-	sort_order = models.IntegerField(default=0, db_index=True)
+	sort_order = models.BigIntegerField(default=0, db_index=True, help_text='Gap-based rank within a board column; see tickets.ranking.')
 	importance = models.IntegerField(default=1, help_text='1 (lowest) … 10 (highest). Multiplies with urgency for derived priority score.')
 	urgency = models.IntegerField(default=1, help_text='1 (lowest) … 10 (highest). Multiplies with importance for derived priority score.')
+	priority_score = models.PositiveSmallIntegerField(default=1, editable=False, db_index=True, help_text='Stored importance × urgency (1 … 100), kept current on save and queryset writes.')
 	parent = models.ForeignKey('self', null=True, blank=True, related_name='children', on_delete=models.CASCADE, help_text='Parent ticket in hierarchy (Epic for tickets, Ticket for bugs).')
 	related_tickets = models.ManyToManyField('self', blank=True, symmetrical=False, related_name='related_from', help_text='Non-hierarchical linked tickets.')
+	path = models.CharField(max_length=255, blank=True, default='', editable=False, db_index=True, help_text='Materialized path of ancestor ids (root first); maintained on save.')
+	depth = models.PositiveSmallIntegerField(default=0, editable=False, help_text='Number of ancestors; 0 for a root ticket.')
+	# Rollups over all descendants, adjusted incrementally; see apply_rollup_deltas.
+	descendant_count = models.PositiveIntegerField(default=0, editable=False)
+	descendant_done_count = models.PositiveIntegerField(default=0, editable=False)
+	open_bug_count = models.PositiveIntegerField(default=0, editable=False, help_text='Descendant bugs not yet done.')
+	descendant_score_sum = models.PositiveIntegerField(default=0, editable=False, help_text='Sum of descendant priority scores.')
 	def clean(self):
 		from django.core.exceptions import ValidationError
 		if not (1 <= self.importance <= 10):
@@ -67,21 +466,148 @@ class Ticket(models.Model):
 		elif self.ticket_type == 'bug':
 			if not self.parent or self.parent.ticket_type != 'ticket':
 				raise ValidationError({'parent': 'A bug must have a ticket as parent.'})
-		# Prevent cycles in hierarchy
-		seen = set()
-		cur = self.parent
-		while cur is not None:
-			if cur.id == self.id:
-				raise ValidationError({'parent': 'Cyclic parent relationship detected.'})
-			if cur.id in seen:
-				break
-			seen.add(cur.id)
-			cur = cur.parent
+		# Prevent cycles in hierarchy: the parent may not sit inside this ticket's subtree
+		if self.pk and self.parent_id and self.parent.lineage.startswith(self.lineage):
+			raise ValidationError({'parent': 'Cyclic parent relationship detected.'})
 	board = models.ForeignKey(Board, related_name='tickets', on_delete=models.CASCADE)
 	created_at = models.DateTimeField(auto_now_add=True)
 	updated_at = models.DateTimeField(auto_now=True)
 	assignee = models.ForeignKey('auth.User', null=True, blank=True, on_delete=models.SET_NULL)
 	updated_by = models.ForeignKey('auth.User', null=True, blank=True, on_delete=models.SET_NULL, related_name='updated_tickets')
+	change_seq = models.PositiveBigIntegerField(default=0, help_text='Board version at which this ticket last changed.')
+
+	objects = TicketQuerySet.as_manager()
+
+	class Meta:
+		indexes = [
+			# Serves keyset pagination of a single board column.
+			models.Index(fields=['board', 'status', 'sort_order', 'id'], name='ticket_board_column_idx'),
+			# Serves delta sync ("what changed on this board since seq N").
+			models.Index(fields=['board', 'change_seq'], name='ticket_board_change_idx'),
+			# Serves a board column ordered by priority score (highest first).
+			models.Index(fields=['board', 'status', '-priority_score', 'sort_order', 'id'], name='ticket_board_priority_idx'),
+			# Covers the importance × urgency matrix GROUP BY.
+			models.Index(fields=['board', 'importance', 'urgency', 'status', 'ticket_type'], name='ticket_board_matrix_idx'),
+			# Serves the parent picker's title-ordered pages.
+			models.Index(fields=['board', 'ticket_type', 'title', 'id'], name='ticket_board_type_title_idx'),
+		]
+
+	# Stored values save() compares against to maintain paths and rollups.
+	TRACKED_FIELDS = ('parent_id', 'path', 'depth', 'status', 'ticket_type', 'priority_score')
+	# Fields the full-text search document is built from (comments aside).
+	SEARCH_DOCUMENT_FIELDS = ('board_id', 'title', 'description')
+	# Fields whose edits are recorded in the activity log.
+	AUDITED_FIELDS = (
+		'title', 'description', 'status', 'priority', 'importance', 'urgency',
+		'ticket_type', 'assignee_id', 'parent_id', 'board_id',
+	)
+
+	def audited_changes(self):
+		"""``changes()`` restricted to ``AUDITED_FIELDS``, in that order."""
+		changes = self.changes(self.AUDITED_FIELDS)
+		return {f: changes[f] for f in self.AUDITED_FIELDS if f in changes}
+
+	@property
+	def search_document_stale(self):
+		"""True unless title, description and board are known to match the indexed row."""
+		loaded = tuple(self.loaded_value(f) for f in self.SEARCH_DOCUMENT_FIELDS)
+		if models.DEFERRED in loaded:
+			return True
+		return loaded != tuple(getattr(self, f) for f in self.SEARCH_DOCUMENT_FIELDS)
+
+	@property
+	def lineage(self):
+		"""Path prefix shared by this ticket's descendants."""
+		return self.path + path_segment(self.pk)
+
+	@property
+	def ancestor_ids(self):
+		return ancestor_ids_from_path(self.path)
+
+	@property
+	def progress_percent(self):
+		if not self.descendant_count:
+			return None
+		return round(100 * self.descendant_done_count / self.descendant_count)
+
+	def _stored_state(self):
+		"""``TRACKED_FIELDS`` as stored in the database, or ``None`` for a new row."""
+		if self._state.adding:
+			return None
+		state = {f: self.loaded_value(f) for f in self.TRACKED_FIELDS}
+		if models.DEFERRED in state.values():
+			state = Ticket.objects.filter(pk=self.pk).values(*self.TRACKED_FIELDS).first()
+		return state
+
+	def _place_in_hierarchy(self, stored):
+		"""Derive ``path``/``depth`` from ``parent_id``; returns whether the row moved."""
+		if self.parent_id is None:
+			path, depth = '', 0
+		else:
+			parent_path, parent_depth = Ticket.objects.filter(pk=self.parent_id).values_list('path', 'depth').get()
+			path, depth = parent_path + path_segment(self.parent_id), parent_depth + 1
+		if stored is not None and path.startswith(stored['path'] + path_segment(self.pk)):
+			raise ValueError('Cyclic parent relationship detected.')
+		self.path, self.depth = path, depth
+
+	def save(self, *args, **kwargs):
+		self.priority_score = self.importance * self.urgency
+		stored = self._stored_state()
+		update_fields = kwargs.get('update_fields')
+		if update_fields is not None:
+			# Partial saves must still advance the sync cursor and timestamp.
+			update_fields = {*update_fields, 'change_seq', 'updated_at'}
+			if update_fields & {'importance', 'urgency'}:
+				update_fields.add('priority_score')
+			if update_fields & {'parent', 'parent_id'}:
+				update_fields |= {'path', 'depth'}
+		elif stored is not None:
+			if self.tracks_changes:
+				# Only the columns that differ from the loaded snapshot.
+				update_fields = self.changed_fields() | {'change_seq', 'updated_at'}
+				if update_fields & {'parent', 'parent_id'}:
+					update_fields |= {'path', 'depth'}
+			else:
+				update_fields = {f.name for f in self._meta.concrete_fields if not f.primary_key}
+			# Rollups only ever move by relative UPDATEs; never write back an in-memory copy.
+			update_fields -= set(ROLLUP_FIELDS)
+		if update_fields is not None:
+			kwargs['update_fields'] = update_fields
+
+		def saved(field):
+			return stored is None or update_fields is None or field in update_fields
+
+		moved = stored is not None and saved('path') and self.parent_id != stored['parent_id']
+		if stored is None or moved:
+			self._place_in_hierarchy(stored)
+		elif stored is not None:
+			self.path, self.depth = stored['path'], stored['depth']
+		new = {f: getattr(self, f) if saved(f) else stored[f] for f in ('status', 'ticket_type', 'priority_score')}
+		new_contribution = rollup_contribution(new['status'], new['ticket_type'], new['priority_score'])
+
+		with transaction.atomic():
+			super().save(*args, **kwargs)
+			deltas = {}
+			if stored is None:
+				_add_rollup_delta(deltas, self.path, new_contribution)
+			else:
+				old_contribution = rollup_contribution(stored['status'], stored['ticket_type'], stored['priority_score'])
+				if moved:
+					old_lineage = stored['path'] + path_segment(self.pk)
+					# One UPDATE re-roots the whole subtree under the new lineage.
+					Ticket.objects.filter(path__startswith=old_lineage).update(
+						path=Concat(models.Value(self.lineage), Substr('path', len(old_lineage) + 1)),
+						depth=models.F('depth') + (self.depth - stored['depth']),
+					)
+					# The subtree's totals leave the old ancestors and join the new ones.
+					subtree = Ticket.objects.filter(pk=self.pk).values_list(*ROLLUP_FIELDS).get()
+					_add_rollup_delta(deltas, stored['path'], [a + b for a, b in zip(old_contribution, subtree)], sign=-1)
+					_add_rollup_delta(deltas, self.path, [a + b for a, b in zip(new_contribution, subtree)])
+				else:
+					_add_rollup_delta(deltas, self.path, [n - o for n, o in zip(new_contribution, old_contribution)])
+			apply_rollup_deltas(deltas, change_seq=self.change_seq or None)
+		# The row now matches memory for everything written (all of it on insert).
+		self._take_snapshot(update_fields)
 
 	def __str__(self):
 		return self.title
@@ -95,5 +621,55 @@ class TicketComment(models.Model):
 	class Meta:
 		ordering = ['-created_at']
 
+	def save(self, *args, **kwargs):
+		# The post_save receiver bumps the board version; commit both together.
+		with transaction.atomic():
+			super().save(*args, **kwargs)
+
 	def __str__(self):
 		return f"Comment by {self.user} on {self.ticket} at {self.created_at}"
+
+
+class TicketTombstone(models.Model):
+	"""Marker left behind when a ticket leaves a board, for delta-sync clients.
+
+	``board`` carries no database constraint so tombstones written while a
+	whole board is being deleted don't block that delete; they are cleaned up
+	by the board's post_delete receiver instead.
+	"""
+	board = models.ForeignKey(Board, on_delete=models.DO_NOTHING, db_constraint=False, related_name='tombstones')
+	ticket_id = models.BigIntegerField()
+	change_seq = models.PositiveBigIntegerField()
+	deleted_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		indexes = [
+			models.Index(fields=['board', 'change_seq'], name='tombstone_board_change_idx'),
+		]
+
+	def __str__(self):
+		return f"Ticket {self.ticket_id} removed from board {self.board_id} at seq {self.change_seq}"
+
+
+class TicketActivitySummary(models.Model):
+	"""Per-ticket, per-day activity counts standing in for archived ``TicketActivity`` rows.
+
+	Written by ``archive_activity`` as rows leave the hot table and reduced
+	again by ``restore_activity``.
+	"""
+	board = models.ForeignKey(Board, null=True, blank=True, on_delete=models.CASCADE, related_name='activity_summaries')
+	ticket = models.ForeignKey(Ticket, null=True, blank=True, on_delete=models.SET_NULL, related_name='activity_summaries')
+	day = models.DateField()
+	activity_type = models.CharField(max_length=100)
+	count = models.PositiveIntegerField(default=0)
+	first_at = models.DateTimeField()
+	last_at = models.DateTimeField()
+
+	class Meta:
+		indexes = [
+			models.Index(fields=['ticket', 'day'], name='activity_summary_ticket_idx'),
+			models.Index(fields=['board', 'day'], name='activity_summary_board_idx'),
+		]
+
+	def __str__(self):
+		return f"{self.count} {self.activity_type} on ticket {self.ticket_id} ({self.day})"
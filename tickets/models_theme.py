@@ -6,12 +6,27 @@ class UserTheme(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='themes')
     colors = models.JSONField()  # Stores the theme color values
     is_public = models.BooleanField(default=False)
+    # Stylesheet compiled from ``colors`` on save, served at /themes/css/<css_hash>.css
+    css_hash = models.CharField(max_length=32, blank=True, db_index=True, editable=False)
+    compiled_css = models.TextField(blank=True, editable=False)
+    # Number of ThemePreference rows pointing here, kept by signals; orders the public gallery
+    preference_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-updated_at']
         unique_together = ['user', 'name']
+        indexes = [
+            models.Index(fields=['is_public', '-preference_count', 'id'], name='theme_gallery_popular_idx'),
+            models.Index(fields=['is_public', 'name', 'id'], name='theme_gallery_name_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # preference_count only moves by relative UPDATEs (signals.py); never write back a stale copy.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [f.name for f in self._meta.concrete_fields if not f.primary_key and f.name != 'preference_count']
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.user.username}'s theme: {self.name}"
@@ -0,0 +1,118 @@
+"""Batched drag-and-drop moves.
+
+A multi-select drag (or a burst of queued drops) is applied as one unit: the
+moving tickets and their neighbours are read in a single query, every rank is
+planned in memory, and the result is written with one bulk UPDATE plus one
+bulk INSERT of activity rows, all inside one transaction. Bulk writes skip
+model signals, so the board version bump, ``change_seq`` stamping and live
+events that ``signals.py`` normally handles are done here explicitly.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .board_loader import serialize_ticket
+from .live import publish_on_commit
+from .models import Board, Ticket, TicketActivity
+from .ranking import BatchRanker, NeedsRebalance, RankingError, rebalance_column
+
+MAX_BATCH_MOVES = 200
+
+
+class MoveError(ValueError):
+    """Raised for a batch that can't be applied; nothing is written."""
+
+
+def _parse(moves):
+    if not isinstance(moves, list) or not moves:
+        raise MoveError('moves must be a non-empty list')
+    if len(moves) > MAX_BATCH_MOVES:
+        raise MoveError(f'At most {MAX_BATCH_MOVES} moves per batch')
+    valid_statuses = dict(Ticket.STATUS_CHOICES)
+    parsed = []
+    for move in moves:
+        try:
+            ticket_id = int(move['ticket_id'])
+            status = move['status']
+            before_id = move.get('before_id')
+            after_id = move.get('after_id')
+            before_id = int(before_id) if before_id is not None else None
+            after_id = int(after_id) if after_id is not None else None
+        except (KeyError, TypeError, ValueError, AttributeError):
+            raise MoveError('Each move needs an integer ticket_id and a status')
+        if status not in valid_statuses:
+            raise MoveError(f'Invalid status. Must be one of: {", ".join(valid_statuses)}')
+        parsed.append((ticket_id, status, before_id, after_id))
+    return parsed
+
+
+def apply_moves(moves, user):
+    """Apply a list of ``{ticket_id, status, before_id?, after_id?}`` moves.
+
+    Moves are applied in order, so a later move may be dropped next to a card
+    moved earlier in the same batch. All tickets must be on one board.
+    Returns the moved tickets in their new state.
+    """
+    parsed = _parse(moves)
+    moving_ids = list(dict.fromkeys(m[0] for m in parsed))
+    referenced = {pk for m in parsed for pk in m[2:] if pk is not None}
+    with transaction.atomic():
+        for attempt in range(2):
+            rows = {
+                t.id: t for t in Ticket.objects.select_for_update()
+                .select_related('parent')
+                .filter(id__in=set(moving_ids) | referenced)
+            }
+            missing = [pk for pk in moving_ids if pk not in rows]
+            if missing:
+                raise MoveError(f'Ticket {missing[0]} not found')
+            board_ids = {t.board_id for t in rows.values()}
+            if len(board_ids) != 1:
+                raise MoveError('All tickets in a batch must be on the same board')
+            board_id = board_ids.pop()
+            ranker = BatchRanker(board_id, {pk: (t.status, t.sort_order) for pk, t in rows.items()})
+            try:
+                planned = [
+                    (ticket_id, status, ranker.place(ticket_id, status, before_id, after_id))
+                    for ticket_id, status, before_id, after_id in parsed
+                ]
+                break
+            except NeedsRebalance as exc:
+                if attempt:
+                    raise MoveError('Could not find room between the neighbour tickets')
+                rebalance_column(board_id, exc.status)
+            except RankingError as exc:
+                raise MoveError(str(exc))
+
+        seq = Board.bump_version(board_id)
+        stamp = timezone.now()
+        moved = [rows[pk] for pk in moving_ids]
+        original_status = {t.id: t.status for t in moved}
+        for ticket_id, status, rank in planned:
+            ticket = rows[ticket_id]
+            ticket.status = status
+            ticket.sort_order = rank
+        for ticket in moved:
+            ticket.updated_by = user
+            ticket.updated_at = stamp
+            ticket.change_seq = seq
+        Ticket.objects.bulk_update(moved, ['status', 'sort_order', 'updated_by', 'updated_at', 'change_seq'])
+
+        activities = []
+        for ticket in moved:
+            description = []
+            if original_status[ticket.id] != ticket.status:
+                description.append(f'Status changed from {original_status[ticket.id]} to {ticket.status}')
+            description.append('Priority reordered')
+            activities.append(TicketActivity(
+                ticket=ticket,
+                board_id=ticket.board_id,
+                user=user,
+                activity_type='updated',
+                description=', '.join(description),
+                change_seq=seq,
+            ))
+        TicketActivity.objects.bulk_create(activities)
+
+        for ticket in moved:
+            publish_on_commit(board_id, lambda ticket=ticket: {'type': 'ticket', 'ticket': serialize_ticket(ticket)})
+    return moved
@@ -0,0 +1,189 @@
+"""Gap-based ranking for ``Ticket.sort_order``.
+
+Cards in a board column are ordered by ``(sort_order, id)``. Ranks are handed
+out ``RANK_GAP`` apart, so dropping a card between two neighbours is a
+single-row write of the midpoint rank. When two neighbours end up adjacent
+(no integer left between them) the column is rebalanced: every card is
+re-spaced ``RANK_GAP`` apart in one bulk UPDATE.
+"""
+from django.db import transaction
+from django.db.models import Max, Q
+
+from .live import publish_on_commit
+from .models import Board, Ticket
+
+RANK_GAP = 1 << 16
+
+
+class RankingError(ValueError):
+    """Raised when neighbour tickets don't belong to the target column."""
+
+
+def rank_between(above, below):
+    """Rank strictly between two neighbour ranks, or ``None`` if there's no room.
+
+    ``above`` is the rank of the card above, ``below`` the card below; either
+    may be ``None`` for the top or bottom of the column.
+    """
+    if above is None and below is None:
+        return RANK_GAP
+    if above is None:
+        return below - RANK_GAP
+    if below is None:
+        return above + RANK_GAP
+    if below - above > 1:
+        return above + (below - above) // 2
+    return None
+
+
+def next_rank(board_id, status):
+    """Rank that appends a card to the bottom of a column."""
+    top = Ticket.objects.filter(board_id=board_id, status=status).aggregate(top=Max('sort_order'))['top']
+    return rank_between(top, None)
+
+
+def rebalance_column(board_id, status):
+    """Re-space every card of a column ``RANK_GAP`` apart, keeping their order.
+
+    Runs as one bulk UPDATE and one board version bump; viewers get a
+    ``resync`` event so they pick the new ranks up through delta sync.
+    Returns the number of tickets re-ranked.
+    """
+    with transaction.atomic():
+        ids = list(
+            Ticket.objects.select_for_update()
+            .filter(board_id=board_id, status=status)
+            .order_by('sort_order', 'id')
+            .values_list('id', flat=True)
+        )
+        if not ids:
+            return 0
+        seq = Board.bump_version(board_id)
+        tickets = [Ticket(id=pk, sort_order=(i + 1) * RANK_GAP, change_seq=seq) for i, pk in enumerate(ids)]
+        Ticket.objects.bulk_update(tickets, ['sort_order', 'change_seq'], batch_size=500)
+        publish_on_commit(board_id, lambda: {'type': 'resync'})
+    return len(ids)
+
+
+def _neighbour(column, rank, pk, below):
+    """Closest card strictly below (or above) ``(rank, pk)`` in column order."""
+    if below:
+        qs = column.filter(Q(sort_order__gt=rank) | Q(sort_order=rank, id__gt=pk)).order_by('sort_order', 'id')
+    else:
+        qs = column.filter(Q(sort_order__lt=rank) | Q(sort_order=rank, id__lt=pk)).order_by('-sort_order', '-id')
+    return qs.values_list('id', 'sort_order').first() or (None, None)
+
+
+def rank_for_drop(board_id, status, before_id=None, after_id=None, exclude_id=None):
+    """Server-side rank for a card dropped between ``before_id`` and ``after_id``.
+
+    ``before_id`` is the card that ends up directly above the dropped card and
+    ``after_id`` the one directly below it; pass neither to append. When only
+    one neighbour is known (e.g. the client hasn't paged the rest of the
+    column in) the other is looked up, so the new rank never overtakes cards
+    the client can't see. The column is rebalanced first if the neighbours
+    have no gap left.
+    """
+    if exclude_id is not None and exclude_id in (before_id, after_id):
+        raise RankingError('A ticket cannot be positioned relative to itself')
+    if before_id is None and after_id is None:
+        return next_rank(board_id, status)
+    column = Ticket.objects.filter(board_id=board_id, status=status)
+    if exclude_id is not None:
+        column = column.exclude(id=exclude_id)
+    for attempt in range(2):
+        neighbour_ids = [pk for pk in (before_id, after_id) if pk is not None]
+        ranks = dict(column.filter(id__in=neighbour_ids).values_list('id', 'sort_order'))
+        if len(ranks) != len(neighbour_ids):
+            raise RankingError('Neighbour tickets must be in the target column')
+        above_id, below_id = before_id, after_id
+        above, below = ranks.get(before_id), ranks.get(after_id)
+        if below_id is None:
+            below_id, below = _neighbour(column, above, above_id, below=True)
+        elif above_id is None:
+            above_id, above = _neighbour(column, below, below_id, below=False)
+        if above is not None and below is not None and (above, above_id) > (below, below_id):
+            raise RankingError('before_id must sort above after_id')
+        rank = rank_between(above, below)
+        if rank is not None:
+            return rank
+        rebalance_column(board_id, status)
+    raise RankingError('Could not find room between the neighbour tickets')
+
+
+class NeedsRebalance(Exception):
+    """Raised by ``BatchRanker`` when a column has no gap left for a drop."""
+
+    def __init__(self, status):
+        super().__init__(status)
+        self.status = status
+
+
+class BatchRanker:
+    """Plans ranks for several drops on one board without writing in between.
+
+    Later moves may reference cards moved earlier in the same batch, so the
+    planner keeps the in-flight ``(status, rank)`` of every moving card in
+    memory and only asks the database about cards outside the batch.
+    """
+
+    def __init__(self, board_id, positions):
+        # positions: id -> (status, rank) for the moving cards and every
+        # referenced neighbour, as currently stored.
+        self.board_id = board_id
+        self.positions = dict(positions)
+        self.moving = set()
+
+    def _column(self, status):
+        return Ticket.objects.filter(board_id=self.board_id, status=status).exclude(id__in=self.moving)
+
+    def _in_flight(self, status, exclude_id):
+        return [
+            (rank, pk) for pk, (st, rank) in self.positions.items()
+            if pk in self.moving and st == status and pk != exclude_id
+        ]
+
+    def _closest(self, status, key, below, exclude_id):
+        """Nearest card past ``key`` among stored and in-flight cards."""
+        rank, pk = key
+        pk_db, rank_db = _neighbour(self._column(status), rank, pk, below=below)
+        candidates = [(rank_db, pk_db)] if pk_db is not None else []
+        candidates += [c for c in self._in_flight(status, exclude_id) if (c > key if below else c < key)]
+        if not candidates:
+            return None, None
+        best = min(candidates) if below else max(candidates)
+        return best[1], best[0]
+
+    def place(self, ticket_id, status, before_id=None, after_id=None):
+        """Rank for ``ticket_id`` dropped between ``before_id`` and ``after_id``.
+
+        Same neighbour semantics as ``rank_for_drop``; the planned position is
+        remembered so later moves can be dropped relative to it.
+        """
+        if ticket_id in (before_id, after_id):
+            raise RankingError('A ticket cannot be positioned relative to itself')
+        self.moving.add(ticket_id)
+        above_id, below_id = before_id, after_id
+        above = below = None
+        for pk in (before_id, after_id):
+            if pk is not None and self.positions.get(pk, (None,))[0] != status:
+                raise RankingError('Neighbour tickets must be in the target column')
+        if above_id is not None:
+            above = self.positions[above_id][1]
+        if below_id is not None:
+            below = self.positions[below_id][1]
+        if above_id is None and below_id is None:
+            top = self._column(status).exclude(id=ticket_id).aggregate(top=Max('sort_order'))['top']
+            in_flight = [rank for rank, _ in self._in_flight(status, ticket_id)]
+            above = max([r for r in [top, *in_flight] if r is not None], default=None)
+        elif below_id is None:
+            below_id, below = self._closest(status, (above, above_id), True, ticket_id)
+        elif above_id is None:
+            above_id, above = self._closest(status, (below, below_id), False, ticket_id)
+        if above is not None and below is not None and (above, above_id) > (below, below_id):
+            raise RankingError('before_id must sort above after_id')
+        rank = rank_between(above, below)
+        if rank is None:
+            raise NeedsRebalance(status)
+        self.positions[ticket_id] = (status, rank)
+        return rank
@@ -0,0 +1,183 @@
+"""Archiving old ``TicketActivity`` rows out of the hot table and back.
+
+``archive_activities`` streams every activity older than a cutoff, in id
+order and in chunks, into one gzip-compressed JSON-lines file. Only once
+that file is complete on disk does it delete the archived rows, one chunk
+per transaction. Each chunk's rows are folded into ``TicketActivitySummary``
+(counts per ticket, day and type) in the same transaction, so per-ticket
+history survives the delete. Every board that lost rows is bumped once per
+run, since its activity feed (and so its page ETag) changed.
+
+``restore_activities`` reads an archive file back. Rows come back with
+their original ids and are subtracted from the summaries again. Rows
+already present are skipped, so an archive can be restored twice safely.
+Boards that got rows back are bumped once per run as well.
+"""
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Max, Min
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Board, Ticket, TicketActivity, TicketActivitySummary
+
+DEFAULT_RETENTION_DAYS = 90
+DEFAULT_CHUNK_SIZE = 1000
+ARCHIVE_FIELDS = ('id', 'ticket_id', 'board_id', 'user_id', 'activity_type', 'description', 'timestamp', 'change_seq')
+
+
+def retention_days():
+    return getattr(settings, 'TICKETS_ACTIVITY_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+
+
+def archive_dir():
+    return getattr(settings, 'TICKETS_ACTIVITY_ARCHIVE_DIR', os.path.join(settings.BASE_DIR, 'archive'))
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _merge_summaries(deltas, sign=1):
+    """Add (or with ``sign=-1`` take away) ``{(board, ticket, day, type): (count, first, last)}``."""
+    if not deltas:
+        return
+    existing = {}
+    days = {key[2] for key in deltas}
+    for summary in TicketActivitySummary.objects.filter(day__in=days, ticket_id__in={key[1] for key in deltas}):
+        existing.setdefault((summary.board_id, summary.ticket_id, summary.day, summary.activity_type), summary)
+    # ticket_id IN (...) never matches NULL; unlinked summaries are looked up separately.
+    if any(key[1] is None for key in deltas):
+        for summary in TicketActivitySummary.objects.filter(day__in=days, ticket__isnull=True):
+            existing.setdefault((summary.board_id, None, summary.day, summary.activity_type), summary)
+    created, updated, emptied = [], [], []
+    for key, (count, first_at, last_at) in deltas.items():
+        summary = existing.get(key)
+        if summary is None:
+            if sign > 0:
+                board_id, ticket_id, day, activity_type = key
+                created.append(TicketActivitySummary(
+                    board_id=board_id, ticket_id=ticket_id, day=day, activity_type=activity_type,
+                    count=count, first_at=first_at, last_at=last_at,
+                ))
+            continue
+        summary.count = max(summary.count + sign * count, 0)
+        if not summary.count:
+            emptied.append(summary.pk)
+            continue
+        if sign > 0:
+            summary.first_at, summary.last_at = min(summary.first_at, first_at), max(summary.last_at, last_at)
+        updated.append(summary)
+    TicketActivitySummary.objects.bulk_create(created)
+    TicketActivitySummary.objects.bulk_update(updated, ['count', 'first_at', 'last_at'])
+    TicketActivitySummary.objects.filter(pk__in=emptied).delete()
+
+
+def _bump_boards(board_ids):
+    for board_id in board_ids - {None}:
+        Board.bump_version(board_id)
+
+
+def _archive_chunk(first_id, last_id, cutoff, boards):
+    rows = TicketActivity.objects.filter(id__gte=first_id, id__lte=last_id, timestamp__lt=cutoff)
+    with transaction.atomic():
+        deltas = {
+            (row['board_id'], row['ticket_id'], row['day'], row['activity_type']): (row['n'], row['first_at'], row['last_at'])
+            for row in rows.order_by()
+            .annotate(day=TruncDate('timestamp'))
+            .values('board_id', 'ticket_id', 'day', 'activity_type')
+            .annotate(n=Count('id'), first_at=Min('timestamp'), last_at=Max('timestamp'))
+        }
+        _merge_summaries(deltas)
+        boards.update(key[0] for key in deltas)
+        rows._archived = True
+        return rows.delete()[0]
+
+
+def archive_activities(cutoff=None, directory=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Move activities older than ``cutoff`` into a compressed archive file.
+
+    Returns ``(path, count)``; ``path`` is ``None`` when nothing was old enough.
+    """
+    cutoff = cutoff or timezone.now() - timedelta(days=retention_days())
+    directory = directory or archive_dir()
+    os.makedirs(directory, exist_ok=True)
+    old = TicketActivity.objects.filter(timestamp__lt=cutoff).order_by('id')
+    path = os.path.join(directory, f"activity-{cutoff:%Y%m%dT%H%M%S}-{timezone.now():%Y%m%dT%H%M%S%f}.jsonl.gz")
+    partial = path + '.part'
+    ranges = []
+    with gzip.open(partial, 'wt', encoding='utf-8') as archive:
+        rows = old.values(*ARCHIVE_FIELDS).iterator(chunk_size=chunk_size)
+        for chunk in _chunks(rows, chunk_size):
+            for row in chunk:
+                row['timestamp'] = row['timestamp'].isoformat()
+                archive.write(json.dumps(row, ensure_ascii=False) + '\n')
+            ranges.append((chunk[0]['id'], chunk[-1]['id']))
+    if not ranges:
+        os.remove(partial)
+        return None, 0
+    with open(partial, 'rb') as archive:
+        os.fsync(archive.fileno())
+    os.replace(partial, path)
+    # Rows only leave the table once the file holding them is complete.
+    boards = set()
+    deleted = sum(_archive_chunk(first_id, last_id, cutoff, boards) for first_id, last_id in ranges)
+    _bump_boards(boards)
+    return path, deleted
+
+
+def restore_activities(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Load an archive file back into ``TicketActivity``; returns the number of rows restored."""
+    restored, boards = 0, set()
+    with gzip.open(path, 'rt', encoding='utf-8') as archive:
+        rows = (json.loads(line) for line in archive if line.strip())
+        for chunk in _chunks(rows, chunk_size):
+            restored += _restore_chunk(chunk, boards)
+    _bump_boards(boards)
+    return restored
+
+
+def _restore_chunk(chunk, boards):
+    with transaction.atomic():
+        present = set(TicketActivity.objects.filter(id__in=[row['id'] for row in chunk]).values_list('id', flat=True))
+        chunk = [row for row in chunk if row['id'] not in present]
+        if not chunk:
+            return 0
+        tickets = set(Ticket.objects.filter(id__in={row['ticket_id'] for row in chunk}).values_list('id', flat=True))
+        users = set(get_user_model().objects.filter(id__in={row['user_id'] for row in chunk}).values_list('id', flat=True))
+        live_boards = set(Board.objects.filter(id__in={row['board_id'] for row in chunk}).values_list('id', flat=True))
+        activities, deltas = [], {}
+        for row in chunk:
+            timestamp = datetime.fromisoformat(row['timestamp'])
+            activities.append(TicketActivity(
+                id=row['id'],
+                ticket_id=row['ticket_id'] if row['ticket_id'] in tickets else None,
+                board_id=row['board_id'] if row['board_id'] in live_boards else None,
+                user_id=row['user_id'] if row['user_id'] in users else None,
+                activity_type=row['activity_type'],
+                description=row['description'],
+                timestamp=timestamp,
+                change_seq=row['change_seq'],
+            ))
+            # Keyed as archived, so the summary it was folded into is found again.
+            key = (row['board_id'], row['ticket_id'] if row['ticket_id'] in tickets else None,
+                   timezone.localdate(timestamp), row['activity_type'])
+            count, first_at, last_at = deltas.get(key, (0, timestamp, timestamp))
+            deltas[key] = (count + 1, min(first_at, timestamp), max(last_at, timestamp))
+        TicketActivity.objects.bulk_create(activities)
+        _merge_summaries(deltas, sign=-1)
+        boards.update(live_boards)
+        return len(activities)
@@ -0,0 +1,290 @@
+"""Full-text search over ticket titles, descriptions and comments.
+
+Each ticket has one search document (title, description and all of its
+comment bodies) in the ``tickets_search`` table, created by migration 0025:
+
+* SQLite: an FTS5 virtual table keyed by ``rowid = ticket id``, ranked with
+  ``bm25`` (title weighted over description over comments).
+* PostgreSQL: a ``tsvector`` column with a GIN index, ranked with
+  ``ts_rank`` over the same A/B/C weights.
+
+Other databases fall back to an (unindexed) ``icontains`` scan.
+
+Documents are kept current incrementally: ticket saves, queryset
+``update()``/``bulk_create()`` and comment writes re-index just the affected
+tickets (see ``signals.py`` and ``TicketQuerySet``). ``rebuild_search_index``
+rebuilds the table from scratch.
+"""
+import re
+
+from django.db import connection as default_connection
+
+SEARCH_TABLE = 'tickets_search'
+DEFAULT_SEARCH_LIMIT = 50
+MAX_SEARCH_LIMIT = 200
+# Ticket fields the search document is built from.
+SEARCH_FIELDS = frozenset({'title', 'description', 'board', 'board_id'})
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_tokens(term):
+    """Words of a user query; punctuation and query operators are dropped."""
+    return _TOKEN_RE.findall(term or '')[:16]
+
+
+def _documents(ticket_ids):
+    """``(ticket_id, board_id, title, description, comments)`` for existing tickets."""
+    from .models import Ticket, TicketComment
+
+    comments = {}
+    for ticket_id, body in TicketComment.objects.filter(ticket_id__in=ticket_ids).order_by('id').values_list('ticket_id', 'body'):
+        comments.setdefault(ticket_id, []).append(body)
+    return [
+        (pk, board_id, title, description, '\n'.join(comments.get(pk, ())))
+        for pk, board_id, title, description in Ticket.objects.filter(id__in=ticket_ids).values_list('id', 'board_id', 'title', 'description')
+    ]
+
+
+def _chunks(ids, size=500):
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+class SearchBackend:
+    """Database-specific index maintenance and querying."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def index(self, ticket_ids):
+        """(Re)build the documents of ``ticket_ids``; deleted tickets drop out."""
+        for chunk in _chunks(set(ticket_ids)):
+            self.remove(chunk)
+            docs = _documents(chunk)
+            if docs:
+                self._insert(docs)
+
+    def rebuild(self, board_id=None):
+        """Re-index every ticket (on one board); returns the number indexed."""
+        from .models import Ticket
+
+        tickets = Ticket.objects.all()
+        if board_id is not None:
+            tickets = tickets.filter(board_id=board_id)
+        ids = list(tickets.values_list('id', flat=True))
+        if board_id is None:
+            self.clear()
+        self.index(ids)
+        return len(ids)
+
+    def clear(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+
+    def remove(self, ticket_ids):
+        raise NotImplementedError
+
+    def _insert(self, docs):
+        raise NotImplementedError
+
+    def search(self, term, board_id=None, limit=DEFAULT_SEARCH_LIMIT):
+        """Ticket ids matching every word of ``term``, best match first (``limit=None``: all)."""
+        raise NotImplementedError
+
+    def matches(self, term, titles_only=False):
+        """``Q`` for tickets matching ``term``, unranked, as a subquery on the index.
+
+        ``titles_only`` restricts the match to the title column of the document.
+        """
+        from django.db.models import Q
+        from django.db.models.expressions import RawSQL
+
+        tokens = search_tokens(term)
+        if not tokens:
+            return Q(pk__in=[])
+        sql, params = self._match_sql(tokens, titles_only)
+        return Q(id__in=RawSQL(sql, params))
+
+    def _match_sql(self, tokens, titles_only=False):
+        raise NotImplementedError
+
+
+class SQLiteSearchBackend(SearchBackend):
+    # bm25 weights per column: title, description, comments (board_id is unindexed)
+    RANK = f'bm25({SEARCH_TABLE}, 10.0, 4.0, 1.0)'
+
+    def remove(self, ticket_ids):
+        for ids in _chunks(ticket_ids):
+            with self.connection.cursor() as cursor:
+                cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({", ".join(["%s"] * len(ids))})', ids)
+
+    def _insert(self, docs):
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {SEARCH_TABLE} (rowid, board_id, title, description, comments) VALUES (%s, %s, %s, %s, %s)',
+                docs,
+            )
+
+    def _match_sql(self, tokens, titles_only=False):
+        # Quote every word (no FTS syntax from users) and prefix-match the last one
+        query = (' '.join(f'"{t}"' for t in tokens[:-1]) + f' "{tokens[-1]}"*').strip()
+        if titles_only:
+            query = f'title : ({query})'
+        return f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s', [query]
+
+    def search(self, term, board_id=None, limit=DEFAULT_SEARCH_LIMIT):
+        tokens = search_tokens(term)
+        if not tokens:
+            return []
+        sql, params = self._match_sql(tokens)
+        if board_id is not None:
+            sql += ' AND board_id = %s'
+            params.append(board_id)
+        sql += f' ORDER BY {self.RANK}, rowid LIMIT %s'
+        params.append(-1 if limit is None else limit)
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend(SearchBackend):
+    CONFIG = 'english'
+    DOCUMENT = (
+        "setweight(to_tsvector(%s::regconfig, %s), 'A') || "
+        "setweight(to_tsvector(%s::regconfig, %s), 'B') || "
+        "setweight(to_tsvector(%s::regconfig, %s), 'C')"
+    )
+
+    def remove(self, ticket_ids):
+        ids = list(ticket_ids)
+        if ids:
+            with self.connection.cursor() as cursor:
+                cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE ticket_id = ANY(%s)', [ids])
+
+    def _insert(self, docs):
+        rows = [
+            (pk, board_id, self.CONFIG, title, self.CONFIG, description, self.CONFIG, comments)
+            for pk, board_id, title, description, comments in docs
+        ]
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {SEARCH_TABLE} (ticket_id, board_id, document) VALUES (%s, %s, {self.DOCUMENT})',
+                rows,
+            )
+
+    def _query(self, tokens, titles_only=False):
+        # Titles are the 'A'-weighted lexemes of the document
+        weight = 'A' if titles_only else ''
+        return ' & '.join([f'{t}:{weight}' if weight else t for t in tokens[:-1]] + [f'{tokens[-1]}:*{weight}'])
+
+    def _match_sql(self, tokens, titles_only=False):
+        return (
+            f'SELECT ticket_id FROM {SEARCH_TABLE} WHERE document @@ to_tsquery(%s::regconfig, %s)',
+            [self.CONFIG, self._query(tokens, titles_only)],
+        )
+
+    def search(self, term, board_id=None, limit=DEFAULT_SEARCH_LIMIT):
+        tokens = search_tokens(term)
+        if not tokens:
+            return []
+        query = self._query(tokens)
+        sql = (
+            f'SELECT ticket_id FROM {SEARCH_TABLE}, to_tsquery(%s::regconfig, %s) query '
+            'WHERE document @@ query'
+        )
+        params = [self.CONFIG, query]
+        if board_id is not None:
+            sql += ' AND board_id = %s'
+            params.append(board_id)
+        sql += ' ORDER BY ts_rank(document, query) DESC, ticket_id LIMIT %s'
+        params.append(limit)
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+
+class FallbackSearchBackend(SearchBackend):
+    """No index: every query scans titles, descriptions and comments."""
+
+    def index(self, ticket_ids):
+        pass
+
+    def rebuild(self, board_id=None):
+        return 0
+
+    def remove(self, ticket_ids):
+        pass
+
+    def _matching(self, tokens, titles_only=False):
+        from django.db.models import Q
+        from .models import Ticket
+
+        tickets = Ticket.objects.all()
+        for token in tokens:
+            match = Q(title__icontains=token)
+            if not titles_only:
+                match |= Q(description__icontains=token) | Q(comments__body__icontains=token)
+            tickets = tickets.filter(match)
+        return tickets
+
+    def matches(self, term, titles_only=False):
+        from django.db.models import Q
+
+        tokens = search_tokens(term)
+        if not tokens:
+            return Q(pk__in=[])
+        return Q(id__in=self._matching(tokens, titles_only).values('id'))
+
+    def search(self, term, board_id=None, limit=DEFAULT_SEARCH_LIMIT):
+        tokens = search_tokens(term)
+        if not tokens:
+            return []
+        tickets = self._matching(tokens)
+        if board_id is not None:
+            tickets = tickets.filter(board_id=board_id)
+        return list(tickets.order_by('-updated_at', 'id').values_list('id', flat=True).distinct()[:limit])
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_search_backend(connection=None):
+    connection = connection or default_connection
+    return BACKENDS.get(connection.vendor, FallbackSearchBackend)(connection)
+
+
+def index_tickets(ticket_ids):
+    get_search_backend().index(ticket_ids)
+
+
+def remove_tickets(ticket_ids):
+    get_search_backend().remove(ticket_ids)
+
+
+def search_ticket_ids(term, board_id=None, limit=DEFAULT_SEARCH_LIMIT):
+    """Ranked ids of tickets matching ``term`` (optionally on one board).
+
+    ``limit=None`` returns every match.
+    """
+    if limit is not None:
+        limit = min(limit, MAX_SEARCH_LIMIT)
+    return get_search_backend().search(term, board_id=board_id, limit=limit)
+
+
+def ticket_search_filter(term, titles_only=False):
+    """``Q`` matching tickets for ``term`` as a subquery, for filtering large querysets."""
+    return get_search_backend().matches(term, titles_only=titles_only)
+
+
+def search_tickets(term, board_id=None, limit=DEFAULT_SEARCH_LIMIT):
+    """Matching tickets in rank order, with ``parent`` loaded for serialization."""
+    from .models import Ticket
+
+    ids = search_ticket_ids(term, board_id=board_id, limit=limit)
+    tickets = Ticket.objects.select_related('parent').in_bulk(ids)
+    return [tickets[pk] for pk in ids if pk in tickets]
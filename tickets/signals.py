@@ -0,0 +1,197 @@
+from django.db.models import DEFERRED, F
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .board_loader import serialize_ticket
+from .graph import get_board_graph, restamp_dependents
+from .live import publish_on_commit
+from .models import Board, Ticket, TicketActivity, TicketComment, TicketTombstone
+from .models_theme import ThemePreference, UserTheme
+from .search import SEARCH_FIELDS, index_tickets, remove_tickets
+from .themes import compile_theme
+
+
+def _is_cascade(sender, origin):
+    """True when a row is being removed as a side effect of deleting something else."""
+    if origin is None:
+        return False
+    model = getattr(origin, 'model', None) or type(origin)
+    return model is not sender
+
+
+def _board_id_for(instance):
+    """Board of a comment/activity, without a query when the ticket is cached."""
+    if getattr(instance, 'board_id', None) is not None:
+        return instance.board_id
+    if instance.ticket_id is None:
+        return None
+    if instance._meta.get_field('ticket').is_cached(instance):
+        return instance.ticket.board_id
+    return Ticket.objects.filter(pk=instance.ticket_id).values_list('board_id', flat=True).first()
+
+
+@receiver(pre_save, sender=Ticket)
+def ticket_saving(sender, instance, update_fields=None, **kwargs):
+    previous_board_id = instance.loaded_value('board_id')
+    moving = update_fields is None or 'board' in update_fields or 'board_id' in update_fields
+    if moving and previous_board_id not in (None, DEFERRED) and previous_board_id != instance.board_id:
+        TicketTombstone.objects.create(
+            board_id=previous_board_id,
+            ticket_id=instance.pk,
+            change_seq=Board.bump_version(previous_board_id) or 0,
+        )
+        publish_on_commit(previous_board_id, lambda: {'type': 'ticket_deleted', 'ticket_id': instance.pk})
+    instance.change_seq = Board.bump_version(instance.board_id) or 0
+    previous_status = instance.loaded_value('status')
+    instance._reopened_or_closed = (
+        not instance._state.adding
+        and (update_fields is None or 'status' in update_fields)
+        and (previous_status is DEFERRED or (previous_status == 'done') != (instance.status == 'done'))
+    )
+
+
+@receiver(post_save, sender=Ticket)
+def ticket_saved(sender, instance, update_fields=None, **kwargs):
+    if getattr(instance, '_reopened_or_closed', False):
+        # Dependents' ``blocked`` flag may have flipped, here or on other boards.
+        restamp_dependents([instance.pk])
+    if (update_fields is None or SEARCH_FIELDS & set(update_fields)) and instance.search_document_stale:
+        index_tickets([instance.pk])
+    publish_on_commit(instance.board_id, lambda: {'type': 'ticket', 'ticket': serialize_ticket(instance)})
+
+
+def _refresh_ancestor_rollups(instance, origin):
+    """Recompute the surviving ancestors' rollups after a ticket delete.
+
+    A ticket removed by the cascade from a deleted ancestor is skipped: that
+    ancestor's own delete already refreshes everything above it. One bulk
+    delete refreshes each ancestor once.
+    """
+    if isinstance(origin, Ticket) and origin is not instance:
+        return
+    if origin is not None and getattr(origin, 'model', type(origin)) is not Ticket:
+        return  # e.g. the whole board is going
+    refreshed = getattr(origin, '_rollups_refreshed', set()) if origin is not None else set()
+    ancestor_ids = [pk for pk in instance.ancestor_ids if pk not in refreshed]
+    if ancestor_ids:
+        Ticket.objects.filter(id__in=ancestor_ids).recompute_rollups()
+    if origin is not None:
+        origin._rollups_refreshed = refreshed | set(ancestor_ids)
+
+
+@receiver(post_delete, sender=Ticket)
+def ticket_deleted(sender, instance, origin=None, **kwargs):
+    if instance.pk in getattr(origin, '_bulk_deleted', ()):
+        return  # TicketQuerySet.delete() does the bookkeeping for the whole set
+    _refresh_ancestor_rollups(instance, origin)
+    remove_tickets([instance.pk])
+    seq = Board.bump_version(instance.board_id)
+    if seq is not None:
+        TicketTombstone.objects.create(board_id=instance.board_id, ticket_id=instance.pk, change_seq=seq)
+        ticket_id = instance.pk
+        publish_on_commit(instance.board_id, lambda: {'type': 'ticket_deleted', 'ticket_id': ticket_id})
+
+
+@receiver(m2m_changed, sender=Ticket.related_tickets.through)
+def ticket_links_changed(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """Dependency links feed the cached board graph.
+
+    Every board involved advances its version (invalidating the graph), and
+    the dependent side of the changed links is stamped with it together with
+    everything downstream, so delta sync delivers their new ``blocked`` flag.
+    """
+    if action == 'pre_clear':
+        column, other = ('to_ticket_id', 'from_ticket_id') if reverse else ('from_ticket_id', 'to_ticket_id')
+        instance._cleared_links = set(sender.objects.filter(**{column: instance.pk}).values_list(other, flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if action == 'post_clear':
+        pk_set = getattr(instance, '_cleared_links', set())
+    linked = dict(Ticket.objects.filter(id__in=pk_set or ()).values_list('id', 'board_id'))
+    dependents = set(linked) if reverse else {instance.pk}
+    for board_id in set(linked.values()) | {instance.board_id}:
+        seq = Board.bump_version(board_id)
+        if seq is None:
+            continue
+        graph = get_board_graph(board_id)
+        stale = set(dependents)
+        for pk in dependents:
+            stale |= graph.transitive_dependents(pk)
+        Ticket.objects.filter(board_id=board_id, id__in=stale).update(change_seq=seq)
+        publish_on_commit(board_id, lambda: {'type': 'resync'})
+
+
+@receiver(pre_save, sender=TicketActivity)
+def activity_saving(sender, instance, **kwargs):
+    # Activities are append-only; the sequence is assigned once on insert.
+    if instance._state.adding:
+        board_id = _board_id_for(instance)
+        if board_id is not None:
+            instance.board_id = board_id
+            instance.change_seq = Board.bump_version(board_id) or 0
+
+
+@receiver(post_save, sender=TicketComment)
+def comment_saved(sender, instance, created=False, **kwargs):
+    board_id = _board_id_for(instance)
+    if board_id is not None:
+        Board.bump_version(board_id)
+        index_tickets([instance.ticket_id])
+        if created:
+            publish_on_commit(board_id, lambda: {
+                'type': 'comment',
+                'ticket_id': instance.ticket_id,
+                'user': instance.user.username if instance.user_id else None,
+            })
+
+
+@receiver(post_delete, sender=TicketComment)
+@receiver(post_delete, sender=TicketActivity)
+def ticket_child_deleted(sender, instance, origin=None, **kwargs):
+    # Deleting a ticket cascades to its comments (activities are kept, unlinked);
+    # the ticket's own post_delete already bumps the board, so skip per-row bumps.
+    # Archived activities leave quietly too: archive_activities bumps each board once per run.
+    if _is_cascade(sender, origin) or getattr(origin, '_archived', False):
+        return
+    board_id = _board_id_for(instance)
+    if board_id is not None:
+        Board.bump_version(board_id)
+        if sender is TicketComment:
+            index_tickets([instance.ticket_id])
+
+
+@receiver(post_delete, sender=Board)
+def board_deleted(sender, instance, **kwargs):
+    TicketTombstone.objects.filter(board_id=instance.pk).delete()
+
+
+@receiver(pre_save, sender=UserTheme)
+def theme_saving(sender, instance, **kwargs):
+    compile_theme(instance)
+
+
+@receiver(pre_save, sender=ThemePreference)
+def theme_preference_saving(sender, instance, **kwargs):
+    instance._previous_theme_id = (
+        ThemePreference.objects.filter(pk=instance.pk).values_list('theme_id', flat=True).first()
+        if instance.pk else None
+    )
+
+
+def _count_preference(theme_id, delta):
+    if theme_id is not None:
+        UserTheme.objects.filter(pk=theme_id).update(preference_count=F('preference_count') + delta)
+
+
+@receiver(post_save, sender=ThemePreference)
+def theme_preference_saved(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_theme_id', None)
+    if previous != instance.theme_id:
+        _count_preference(previous, -1)
+        _count_preference(instance.theme_id, 1)
+
+
+@receiver(post_delete, sender=ThemePreference)
+def theme_preference_deleted(sender, instance, **kwargs):
+    _count_preference(instance.theme_id, -1)
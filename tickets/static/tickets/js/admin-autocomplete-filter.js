@@ -0,0 +1,49 @@
+// Typeahead for admin_scale.AutocompleteFilter: suggestions come from the
+// admin's autocomplete view; picking one reloads the changelist filtered by it.
+document.addEventListener('DOMContentLoaded', () => {
+    document.querySelectorAll('.autocomplete-filter').forEach(setupAutocompleteFilter);
+});
+
+function setupAutocompleteFilter(box) {
+    const input = box.querySelector('input');
+    const options = box.querySelector('datalist');
+    let timer = null;
+    let request = 0;
+
+    async function suggest() {
+        const current = ++request;
+        const params = new URLSearchParams({
+            term: input.value.trim(),
+            app_label: box.dataset.appLabel,
+            model_name: box.dataset.modelName,
+            field_name: box.dataset.fieldName,
+        });
+        try {
+            const response = await fetch(`${box.dataset.url}?${params}`, {credentials: 'same-origin'});
+            const data = await response.json();
+            if (current !== request) return;
+            options.replaceChildren(...data.results.map(result => {
+                const option = document.createElement('option');
+                option.value = `${result.text} (#${result.id})`;
+                option.dataset.id = result.id;
+                return option;
+            }));
+        } catch (error) {
+            console.error('Filter lookup failed:', error);
+        }
+    }
+
+    input.addEventListener('input', () => {
+        const chosen = Array.from(options.options).find(option => option.value === input.value);
+        if (chosen) {
+            const url = new URL(window.location.href);
+            url.searchParams.set(box.dataset.lookup, chosen.dataset.id);
+            url.searchParams.delete('cursor');
+            url.searchParams.delete('p');
+            window.location.assign(url);
+            return;
+        }
+        clearTimeout(timer);
+        timer = setTimeout(suggest, 250);
+    });
+}
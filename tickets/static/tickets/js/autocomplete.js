@@ -0,0 +1,122 @@
+// Typeahead pickers for selects rendered by forms.AutocompleteSelect.
+// The select only carries the chosen option; matches are fetched page by page
+// from its data-autocomplete-url as the user types.
+document.addEventListener('DOMContentLoaded', () => {
+    document.querySelectorAll('select[data-autocomplete-url]').forEach(setupAutocomplete);
+});
+
+const AUTOCOMPLETE_DEBOUNCE_MS = 200;
+
+function setupAutocomplete(select) {
+    const wrapper = document.createElement('div');
+    wrapper.className = 'autocomplete';
+    const input = document.createElement('input');
+    input.type = 'search';
+    input.autocomplete = 'off';
+    input.className = 'autocomplete-input form-control';
+    input.placeholder = 'Type to search…';
+    input.setAttribute('role', 'combobox');
+    input.setAttribute('aria-expanded', 'false');
+    const list = document.createElement('ul');
+    list.className = 'autocomplete-results';
+    list.setAttribute('role', 'listbox');
+    list.hidden = true;
+
+    select.hidden = true;
+    select.parentNode.insertBefore(wrapper, select);
+    wrapper.append(select, input, list);
+
+    const selected = select.options[select.selectedIndex];
+    input.value = selected && selected.value ? selected.text : '';
+
+    let timer = null;
+    let nextCursor = null;
+    let loading = false;
+    let request = 0;
+
+    function params(cursor) {
+        const query = new URLSearchParams({q: input.value.trim()});
+        const typeField = select.dataset.autocompleteTypeField && document.getElementById(select.dataset.autocompleteTypeField);
+        if (typeField) query.set('type', typeField.value);
+        if (select.dataset.autocompleteExclude) query.set('exclude', select.dataset.autocompleteExclude);
+        if (cursor) query.set('cursor', cursor);
+        return query;
+    }
+
+    function close() {
+        list.hidden = true;
+        input.setAttribute('aria-expanded', 'false');
+    }
+
+    function choose(value, label) {
+        select.replaceChildren(new Option('---------', ''));
+        if (value) select.add(new Option(label, value, true, true));
+        select.value = value;
+        input.value = label;
+        select.dispatchEvent(new Event('change', {bubbles: true}));
+        close();
+    }
+
+    function render(results, append) {
+        if (!append) list.replaceChildren();
+        results.forEach(result => {
+            const item = document.createElement('li');
+            item.setAttribute('role', 'option');
+            item.dataset.value = result.id;
+            item.textContent = result.label;
+            item.addEventListener('mousedown', e => {
+                e.preventDefault();
+                choose(String(result.id), result.label);
+            });
+            list.appendChild(item);
+        });
+        if (!list.children.length) {
+            const empty = document.createElement('li');
+            empty.className = 'autocomplete-empty';
+            empty.textContent = 'No matches';
+            list.appendChild(empty);
+        }
+        list.hidden = false;
+        input.setAttribute('aria-expanded', 'true');
+    }
+
+    async function load(cursor) {
+        const current = ++request;
+        loading = true;
+        try {
+            const response = await fetch(`${select.dataset.autocompleteUrl}?${params(cursor)}`, {
+                headers: {'Accept': 'application/json'},
+                credentials: 'same-origin',
+            });
+            const data = await response.json();
+            if (current !== request || !data.success) return;
+            nextCursor = data.next_cursor;
+            render(data.results, Boolean(cursor));
+        } catch (error) {
+            console.error('Autocomplete lookup failed:', error);
+        } finally {
+            if (current === request) loading = false;
+        }
+    }
+
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        if (!input.value.trim()) choose('', '');
+        timer = setTimeout(() => load(null), AUTOCOMPLETE_DEBOUNCE_MS);
+    });
+    input.addEventListener('focus', () => load(null));
+    input.addEventListener('blur', close);
+    input.addEventListener('keydown', e => {
+        if (e.key === 'Escape') close();
+    });
+    // Fetch the next page once the list is scrolled to the bottom
+    list.addEventListener('scroll', () => {
+        if (nextCursor && !loading && list.scrollTop + list.clientHeight >= list.scrollHeight - 8) {
+            load(nextCursor);
+        }
+    });
+
+    // A different ticket type needs a different kind of parent
+    const typeField = select.dataset.autocompleteTypeField && document.getElementById(select.dataset.autocompleteTypeField);
+    if (typeField) typeField.addEventListener('change', () => choose('', ''));
+}
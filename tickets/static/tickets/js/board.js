@@ -5,24 +5,34 @@ document.addEventListener('DOMContentLoaded', () => {
     
     // Ensure we have the CSRF token
     setupCSRFToken();
+
+    // Stream further cards into long columns as they scroll into view
+    setupColumnPaging();
+
+    // Apply other viewers' changes without reloading
+    setupLiveUpdates();
+
+    // Full-text search over this board's tickets and comments
+    setupBoardSearch();
 });
 
 function getCsrfToken() {
-    // First try to get from input field
-    const csrfInput = document.querySelector('[name=csrfmiddlewaretoken]');
-    let token = csrfInput ? csrfInput.value : null;
-    
-    // Then try meta tag
+    // First try the cookie: it always holds the current secret, while a page
+    // served from the browser cache may embed a token from before a re-login
+    const cookies = document.cookie.split('; ');
+    const csrfCookie = cookies.find(row => row.startsWith('csrftoken='));
+    let token = csrfCookie ? csrfCookie.split('=')[1] : null;
+
+    // Then try input field
     if (!token) {
-        const metaTag = document.querySelector('meta[name="csrf-token"]');
-        token = metaTag ? metaTag.content : null;
+        const csrfInput = document.querySelector('[name=csrfmiddlewaretoken]');
+        token = csrfInput ? csrfInput.value : null;
     }
     
-    // Finally try cookie
+    // Finally try meta tag
     if (!token) {
-        const cookies = document.cookie.split('; ');
-        const csrfCookie = cookies.find(row => row.startsWith('csrftoken='));
-        token = csrfCookie ? csrfCookie.split('=')[1] : null;
+        const metaTag = document.querySelector('meta[name="csrf-token"]');
+        token = metaTag ? metaTag.content : null;
     }
     
     if (!token) {
@@ -92,7 +102,7 @@ function handleDragOver(event) {
     if (nextSibling) {
         ticketList.insertBefore(draggingTicket, nextSibling);
     } else {
-        ticketList.appendChild(draggingTicket);
+        ticketList.insertBefore(draggingTicket, ticketList.querySelector('.column-sentinel'));
     }
 }
 
@@ -145,7 +155,7 @@ function handleDrop(event) {
     if (ticket.parentElement === ticketList) {
         // Just update the position if the ticket was reordered in the same list
         const position = calculatePosition(ticket, ticketList);
-        updateTicket(ticketId, newStatus, position).catch(error => {
+        updateTicket(ticketId, newStatus, position, dropNeighbours(ticket)).catch(error => {
             console.error('Failed to update ticket position:', error);
             showError('Failed to update ticket position');
         });
@@ -157,14 +167,14 @@ function handleDrop(event) {
     const originalNextSibling = ticket.nextSibling;
     
     // Move the ticket to the new list first for better UX
-    ticketList.appendChild(ticket);
+    ticketList.insertBefore(ticket, ticketList.querySelector('.column-sentinel'));
     ticket.classList.remove('dragging');
     
     // Get position in the new list
     const position = calculatePosition(ticket, ticketList);
     
     // Update the ticket in the backend
-    updateTicket(ticketId, newStatus, position).catch(error => {
+    updateTicket(ticketId, newStatus, position, dropNeighbours(ticket)).catch(error => {
         console.error('Failed to update ticket:', error);
         showError('Failed to update ticket. Rolling back changes...');
         
@@ -177,41 +187,86 @@ function handleDrop(event) {
     });
 }
 
-async function updateTicket(ticketId, newStatus, position) {
+// Ids of the cards directly above and below a dropped card; the server
+// derives the new rank from them.
+function dropNeighbours(ticket) {
+    // Cards sorted by priority score aren't rank neighbours: just append.
+    if (getColumnOrder() !== 'rank') return {};
+    const sibling = (el, step) => {
+        let node = el[step];
+        while (node && !node.classList.contains('ticket')) node = node[step];
+        return node ? Number(node.dataset.ticketId) : null;
+    };
+    return {
+        before_id: sibling(ticket, 'previousElementSibling'),
+        after_id: sibling(ticket, 'nextElementSibling')
+    };
+}
+
+// Drops made in quick succession (a multi-card drag, a burst of re-sorts)
+// are coalesced into one POST to the batch endpoint, which applies them in
+// order inside a single transaction.
+const pendingMoves = [];
+let moveFlushTimer = null;
+
+function queueMove(move) {
+    return new Promise((resolve, reject) => {
+        pendingMoves.push({ move, resolve, reject });
+        if (!moveFlushTimer) {
+            moveFlushTimer = setTimeout(flushMoves, 50);
+        }
+    });
+}
+
+async function flushMoves() {
+    const batch = pendingMoves.splice(0);
+    moveFlushTimer = null;
+    try {
+        const response = await fetch('/api/tickets/batch-move/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCsrfToken()
+            },
+            credentials: 'same-origin',
+            body: JSON.stringify({ moves: batch.map(entry => entry.move) })
+        });
+        if (response.status === 401) {
+            window.location.href = '/login/?next=' + encodeURIComponent(window.location.pathname);
+            return;
+        }
+        if (response.status === 403) {
+            throw new Error('Permission denied. You may not have the right access level.');
+        }
+        const data = await response.json();
+        if (!response.ok || !data.success) {
+            throw new Error(data.error || `Status update failed: ${response.statusText}`);
+        }
+        const byId = new Map(data.tickets.map(ticket => [ticket.id, ticket]));
+        batch.forEach(entry => entry.resolve(byId.get(entry.move.ticket_id)));
+    } catch (error) {
+        batch.forEach(entry => entry.reject(error));
+    }
+}
+
+async function updateTicket(ticketId, newStatus, position, neighbours = {}) {
     let retryCount = 0;
     const maxRetries = 3;
     const baseDelay = 1000; // Start with 1 second delay
 
     while (retryCount < maxRetries) {
         try {
-            // First update the status
-            const statusResponse = await fetch('/update-ticket-status/', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                    'X-CSRFToken': getCsrfToken()
-                },
-                credentials: 'same-origin',
-                body: JSON.stringify({
-                    ticket_id: ticketId,
-                    new_status: newStatus
-                })
+            // First update the status (coalesced with any other pending drops)
+            const moved = await queueMove({
+                ticket_id: Number(ticketId),
+                status: newStatus,
+                before_id: neighbours.before_id ?? null,
+                after_id: neighbours.after_id ?? null
             });
-
-            if (!statusResponse.ok) {
-                if (statusResponse.status === 403) {
-                    throw new Error('Permission denied. You may not have the right access level.');
-                }
-                if (statusResponse.status === 401) {
-                    window.location.href = '/login/?next=' + encodeURIComponent(window.location.pathname);
-                    return;
-                }
-                throw new Error(`Status update failed: ${statusResponse.statusText}`);
-            }
-
-            const statusData = await statusResponse.json();
-            if (!statusData.success) {
-                throw new Error(statusData.error || 'Status update failed');
+            const card = document.getElementById(`ticket-${ticketId}`);
+            if (card && moved) {
+                card.dataset.sortOrder = moved.sort_order;
+                card.dataset.priorityScore = moved.priority_score;
             }
             
             // Then update the position
@@ -353,4 +408,321 @@ function setupDragAndDrop() {
             subtree: true
         });
     }
-}
\ No newline at end of file
+}
+
+// Column paging: the board page renders the first page of every column and
+// the rest is fetched from the keyset-paginated column API on scroll.
+let boardTypeFilter = [];
+
+function getColumnOrder() {
+    const container = document.querySelector('.board-container');
+    return (container && container.dataset.columnOrder) || 'rank';
+}
+
+function getBoardId() {
+    const container = document.querySelector('.board-container');
+    return container ? container.dataset.boardId : null;
+}
+
+function renderTicketCard(data) {
+    const card = document.createElement('div');
+    card.className = 'ticket';
+    card.id = `ticket-${data.id}`;
+    card.dataset.ticketId = data.id;
+    card.dataset.ticketType = data.ticket_type;
+    card.dataset.sortOrder = data.sort_order;
+    card.dataset.priorityScore = data.priority_score;
+    card.dataset.priority = data.priority || 1000;
+
+    const header = document.createElement('div');
+    header.className = 'ticket-header';
+    const link = document.createElement('a');
+    link.href = data.edit_url;
+    link.className = 'ticket-title';
+    link.setAttribute('draggable', 'false');
+    link.textContent = data.title;
+    header.appendChild(link);
+    card.appendChild(header);
+
+    const desc = document.createElement('p');
+    desc.className = 'ticket-desc';
+    desc.textContent = data.description;
+    card.appendChild(desc);
+
+    const meta = document.createElement('div');
+    meta.className = 'ticket-meta';
+    const idSpan = document.createElement('span');
+    idSpan.className = 'ticket-id';
+    idSpan.setAttribute('draggable', 'false');
+    idSpan.textContent = `#${data.id}`;
+    meta.appendChild(idSpan);
+    if (data.blocked) {
+        card.classList.add('is-blocked');
+        const blocked = document.createElement('span');
+        blocked.className = 'ticket-blocked-badge';
+        blocked.setAttribute('draggable', 'false');
+        blocked.title = 'Waiting on an open related ticket';
+        blocked.textContent = 'Blocked';
+        meta.appendChild(blocked);
+    }
+    if (data.ticket_type !== 'epic' && data.parent_title) {
+        const badge = document.createElement('span');
+        badge.className = 'ticket-parent-badge';
+        badge.setAttribute('draggable', 'false');
+        badge.textContent = data.parent_title;
+        meta.appendChild(badge);
+    }
+    if (data.descendant_count) {
+        const rollup = document.createElement('span');
+        rollup.className = 'ticket-rollup';
+        rollup.setAttribute('draggable', 'false');
+        rollup.title = `Score sum ${data.descendant_score_sum}`;
+        rollup.textContent = `${data.descendant_done_count}/${data.descendant_count} done`;
+        if (data.open_bug_count) {
+            rollup.textContent += ` · ${data.open_bug_count} open bug${data.open_bug_count === 1 ? '' : 's'}`;
+        }
+        meta.appendChild(rollup);
+    }
+    card.appendChild(meta);
+    return card;
+}
+
+async function loadColumnPage(list, reset = false) {
+    const boardId = getBoardId();
+    const column = list.closest('.board-column');
+    if (!boardId || !column || list.dataset.loading === '1') return;
+    const cursor = reset ? '' : list.dataset.nextCursor;
+    if (!reset && !cursor) return;
+
+    const params = new URLSearchParams();
+    if (cursor) params.set('cursor', cursor);
+    params.set('order', getColumnOrder());
+    boardTypeFilter.forEach(t => params.append('type', t));
+    list.dataset.loading = '1';
+    try {
+        const response = await fetch(`/api/boards/${boardId}/columns/${column.dataset.status}/?${params}`, {
+            credentials: 'same-origin'
+        });
+        const data = await response.json();
+        if (!data.success) {
+            throw new Error(data.error || 'Failed to load tickets');
+        }
+        if (reset) {
+            list.querySelectorAll('.ticket').forEach(card => card.remove());
+        }
+        const sentinel = list.querySelector('.column-sentinel');
+        data.tickets.forEach(ticket => {
+            if (!document.getElementById(`ticket-${ticket.id}`)) {
+                list.insertBefore(renderTicketCard(ticket), sentinel);
+            }
+        });
+        list.dataset.nextCursor = data.next_cursor || '';
+        list.dataset.paged = '1';
+        document.dispatchEvent(new CustomEvent('board:cards-loaded', {detail: {list}}));
+    } catch (error) {
+        console.error('Failed to load column page:', error);
+        showError('Failed to load more tickets');
+    } finally {
+        list.dataset.loading = '';
+    }
+}
+
+function setupColumnPaging() {
+    if (!('IntersectionObserver' in window)) return;
+    const observer = new IntersectionObserver(entries => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                loadColumnPage(entry.target.closest('.ticket-list'));
+            }
+        });
+    }, {rootMargin: '200px'});
+
+    document.querySelectorAll('.ticket-list').forEach(list => {
+        if (list.dataset.nextCursor) list.dataset.paged = '1';
+        const sentinel = document.createElement('div');
+        sentinel.className = 'column-sentinel';
+        list.appendChild(sentinel);
+        observer.observe(sentinel);
+    });
+}
+
+// Called by the type filter buttons. Columns that were fully rendered keep
+// filtering client-side; paginated columns are re-fetched with the filter
+// applied server-side so hidden cards don't eat the page budget.
+function setBoardTypeFilter(types) {
+    boardTypeFilter = types;
+    document.querySelectorAll('.ticket-list[data-paged="1"]').forEach(list => loadColumnPage(list, true));
+}
+
+
+// Live updates: server-sent events from the board's event stream, with the
+// delta-sync endpoint used to catch up (and as a polling fallback when the
+// server can't hold a stream open).
+const LIVE_POLL_INTERVAL = 15000;
+let boardCursor = null;
+
+function cardPrecedes(card, data) {
+    if (getColumnOrder() === 'priority') {
+        const score = Number(card.dataset.priorityScore);
+        if (score !== data.priority_score) return score > data.priority_score;
+    }
+    const order = Number(card.dataset.sortOrder);
+    const id = Number(card.dataset.ticketId);
+    return order < data.sort_order || (order === data.sort_order && id < data.id);
+}
+
+function applyTicketUpdate(data) {
+    const existing = document.getElementById(`ticket-${data.id}`);
+    if (existing && existing.classList.contains('dragging')) return;
+    if (existing && data.blocked === undefined) {
+        // Live events don't carry the dependency graph; keep the last known flag.
+        data = {...data, blocked: existing.classList.contains('is-blocked')};
+    }
+    if (existing) existing.remove();
+
+    const column = document.querySelector(`.board-column[data-status="${data.status}"]`);
+    const list = column ? column.querySelector('.ticket-list') : null;
+    if (!list) return;
+    const cards = [...list.querySelectorAll('.ticket')];
+    const next = cards.find(card => !cardPrecedes(card, data));
+    // Past the last loaded card of a paginated column: paging will bring it in.
+    if (!next && list.dataset.nextCursor) return;
+    const card = renderTicketCard(data);
+    list.insertBefore(card, next || list.querySelector('.column-sentinel'));
+    document.dispatchEvent(new CustomEvent('board:cards-loaded', {detail: {list}}));
+}
+
+function applyTicketRemoval(ticketId) {
+    const card = document.getElementById(`ticket-${ticketId}`);
+    if (card && !card.classList.contains('dragging')) card.remove();
+}
+
+async function catchUpBoard() {
+    const boardId = getBoardId();
+    if (!boardId || boardCursor === null) return;
+    let hasMore = true;
+    while (hasMore) {
+        const response = await fetch(`/api/boards/${boardId}/changes/?since=${boardCursor}`, {
+            credentials: 'same-origin'
+        });
+        const data = await response.json();
+        if (!data.success) throw new Error(data.error || 'Sync failed');
+        data.tickets.forEach(applyTicketUpdate);
+        data.deleted.forEach(applyTicketRemoval);
+        boardCursor = data.cursor;
+        hasMore = data.has_more;
+    }
+}
+
+function startBoardPolling() {
+    setInterval(() => {
+        catchUpBoard().catch(error => console.error('Board sync failed:', error));
+    }, LIVE_POLL_INTERVAL);
+}
+
+function setupLiveUpdates() {
+    const container = document.querySelector('.board-container');
+    const boardId = getBoardId();
+    if (!container || !boardId) return;
+    boardCursor = Number(container.dataset.boardVersion || 0);
+
+    if (!('EventSource' in window)) {
+        startBoardPolling();
+        return;
+    }
+    const source = new EventSource(`/api/boards/${boardId}/events/`);
+    let connected = false;
+    const catchUp = () => catchUpBoard().catch(error => console.error('Board sync failed:', error));
+
+    // Every (re)connect may have missed events; the delta feed fills the gap.
+    source.addEventListener('hello', () => { connected = true; catchUp(); });
+    source.addEventListener('resync', catchUp);
+    source.addEventListener('ticket', event => {
+        applyTicketUpdate(JSON.parse(event.data).ticket);
+    });
+    source.addEventListener('ticket_deleted', event => {
+        applyTicketRemoval(JSON.parse(event.data).ticket_id);
+    });
+    source.addEventListener('comment', event => {
+        const data = JSON.parse(event.data);
+        showMessage(`${data.user || 'Someone'} commented on #${data.ticket_id}`, 'info');
+    });
+    source.onerror = () => {
+        if (!connected) {
+            // The stream was refused outright (e.g. served over WSGI): poll instead.
+            source.close();
+            startBoardPolling();
+        }
+    };
+}
+
+const SEARCH_DEBOUNCE_MS = 250;
+
+function setupBoardSearch() {
+    const form = document.querySelector('.board-search');
+    if (!form) return;
+    const input = form.querySelector('.board-search-input');
+    const results = form.querySelector('.board-search-results');
+    let timer = null;
+    let request = 0;
+
+    function hide() {
+        results.hidden = true;
+    }
+
+    function render(tickets) {
+        results.replaceChildren();
+        if (!tickets.length) {
+            const empty = document.createElement('li');
+            empty.className = 'board-search-empty';
+            empty.textContent = 'No matching tickets';
+            results.appendChild(empty);
+        }
+        tickets.forEach(ticket => {
+            const item = document.createElement('li');
+            const link = document.createElement('a');
+            link.href = ticket.edit_url;
+            link.textContent = ticket.title;
+            const meta = document.createElement('small');
+            meta.textContent = ` ${ticket.ticket_type} · ${ticket.status.replace('_', ' ')}`;
+            item.append(link, meta);
+            results.appendChild(item);
+        });
+        results.hidden = false;
+    }
+
+    async function search() {
+        const query = input.value.trim();
+        const current = ++request;
+        if (!query) {
+            hide();
+            return;
+        }
+        try {
+            const response = await fetch(`${form.dataset.searchUrl}?${new URLSearchParams({q: query})}`, {
+                headers: {'Accept': 'application/json'},
+                credentials: 'same-origin',
+            });
+            const data = await response.json();
+            if (current === request && data.success) render(data.tickets);
+        } catch (error) {
+            console.error('Board search failed:', error);
+        }
+    }
+
+    form.addEventListener('submit', e => {
+        e.preventDefault();
+        clearTimeout(timer);
+        search();
+    });
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        timer = setTimeout(search, SEARCH_DEBOUNCE_MS);
+    });
+    input.addEventListener('keydown', e => {
+        if (e.key === 'Escape') hide();
+    });
+    document.addEventListener('click', e => {
+        if (!form.contains(e.target)) hide();
+    });
+}
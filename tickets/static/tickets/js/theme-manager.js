@@ -19,6 +19,33 @@ class ThemeManager {
             themeSelector.addEventListener('change', (e) => {
                 this.loadTheme(e.target.value);
             });
+            // Public themes come from the gallery API the first time the picker is opened
+            const loadGallery = () => this.loadPublicThemes(themeSelector);
+            themeSelector.addEventListener('focus', loadGallery, { once: true });
+            themeSelector.addEventListener('mousedown', loadGallery, { once: true });
+        }
+    }
+
+    async loadPublicThemes(themeSelector) {
+        const url = themeSelector.dataset.galleryUrl;
+        const group = themeSelector.querySelector('.public-theme-options');
+        if (!url || !group || this.galleryLoaded) return;
+        this.galleryLoaded = true;
+        try {
+            const response = await fetch(url);
+            if (!response.ok) throw new Error('Failed to load public themes');
+            const data = await response.json();
+            const present = new Set(Array.from(themeSelector.options, (o) => o.value));
+            (data.results || []).forEach((t) => {
+                if (present.has(String(t.id))) return;
+                const option = document.createElement('option');
+                option.value = t.id;
+                option.textContent = `Public: ${t.name}`;
+                group.appendChild(option);
+            });
+        } catch (error) {
+            this.galleryLoaded = false;
+            console.error('Error loading public themes:', error);
         }
     }
 
@@ -34,7 +61,11 @@ class ThemeManager {
             const data = await response.json();
             // Attach raw colors object on window for theme creator prefill
             window.__activeThemeColors = data.colors || {};
-            window.theme.applyTheme(data.colors || {});
+            if (data.css_url) {
+                window.theme.useStylesheet(data.css_url);
+            } else {
+                window.theme.applyTheme(data.colors || {});
+            }
             this.saveThemePreference(themeId);
         } catch (error) {
             console.error('Error loading theme:', error);
@@ -52,6 +83,11 @@ class ThemeManager {
                 'X-CSRFToken': csrfToken
             },
             body: JSON.stringify({ theme_id: themeId })
+        }).then(response => response.json()).then(data => {
+            // Clearing the preference falls back to another theme; follow it
+            if (!themeId && data.css_url) {
+                window.theme.useStylesheet(data.css_url);
+            }
         }).catch(error => {
             console.error('Error saving theme preference:', error);
         });
@@ -3,6 +3,15 @@
 class Theme {
     constructor() {
         this.themeVars = document.getElementById('theme-vars');
+        this.stylesheet = document.getElementById('theme-stylesheet');
+    }
+
+    useStylesheet(url) {
+        // Switch to a saved theme's compiled CSS and drop any preview overrides
+        if (this.stylesheet && url) {
+            this.stylesheet.href = url;
+        }
+        this.themeVars.textContent = '';
     }
 
     applyTheme(theme) {
@@ -0,0 +1,73 @@
+"""Delta sync: everything that changed on a board after a given sequence.
+
+Every ticket save, ticket delete and activity insert on a board takes the
+next value of ``Board.version`` as its ``change_seq`` (see ``signals.py``),
+so a client holding cursor ``N`` only needs rows with ``change_seq > N``.
+"""
+from .board_loader import serialize_ticket
+from .graph import get_board_graph
+from .models import Board, Ticket, TicketActivity, TicketTombstone
+
+DEFAULT_CHANGES_LIMIT = 200
+MAX_CHANGES_LIMIT = 1000
+
+
+def serialize_activity(activity):
+    """JSON-safe activity payload; expects ``user`` to be select_related."""
+    return {
+        'id': activity.id,
+        'ticket_id': activity.ticket_id,
+        'user': activity.user.username if activity.user_id else None,
+        'activity_type': activity.activity_type,
+        'description': activity.description,
+        'timestamp': activity.timestamp.isoformat() if activity.timestamp else None,
+        'change_seq': activity.change_seq,
+    }
+
+
+def board_changes(board_id, since, limit=None):
+    """Collect upserted tickets, tombstones and new activities after ``since``.
+
+    The window is capped at the board version read up front, so rows written
+    while the queries run are left for the next call rather than skipped.
+    When any stream holds more than ``limit`` rows the window is shortened to
+    the last sequence that fits and ``has_more`` is set; the returned
+    ``cursor`` is always safe to pass back as the next ``since``.
+    Returns ``None`` if the board does not exist.
+    """
+    limit = min(limit or DEFAULT_CHANGES_LIMIT, MAX_CHANGES_LIMIT)
+    version = Board.objects.filter(pk=board_id).values_list('version', flat=True).first()
+    if version is None:
+        return None
+    window = {'change_seq__gt': since, 'change_seq__lte': version}
+    streams = {
+        'tickets': list(
+            Ticket.objects.filter(board_id=board_id, **window)
+            .select_related('parent').order_by('change_seq')[:limit + 1]
+        ),
+        'deleted': list(
+            TicketTombstone.objects.filter(board_id=board_id, **window)
+            .order_by('change_seq')[:limit + 1]
+        ),
+        'activities': list(
+            TicketActivity.objects.filter(board_id=board_id, **window)
+            .select_related('user').order_by('change_seq')[:limit + 1]
+        ),
+    }
+    cursor = version
+    for rows in streams.values():
+        if len(rows) > limit:
+            cursor = min(cursor, rows[limit - 1].change_seq)
+    for key, rows in streams.items():
+        streams[key] = [row for row in rows[:limit] if row.change_seq <= cursor]
+    if streams['tickets']:
+        get_board_graph(board_id).mark_blocked(streams['tickets'])
+    upserted = {t.id for t in streams['tickets']}
+    return {
+        'cursor': cursor,
+        'has_more': cursor < version,
+        'tickets': [serialize_ticket(t) for t in streams['tickets']],
+        # A ticket that left and came back is current, not deleted.
+        'deleted': sorted({t.ticket_id for t in streams['deleted']} - upserted),
+        'activities': [serialize_activity(a) for a in streams['activities']],
+    }
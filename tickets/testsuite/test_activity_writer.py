@@ -0,0 +1,127 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from tickets import activity
+from tickets.activity import ActivityWriter, record_activity
+from tickets.models import Board, Ticket, TicketActivity
+
+
+def entry(ticket, user, description='moved'):
+    return {
+        'board_id': ticket.board_id, 'ticket_id': ticket.pk, 'user_id': user.pk,
+        'activity_type': 'updated', 'description': description, 'timestamp': timezone.now().isoformat(),
+    }
+
+
+class ActivityWriterTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='writer', password='pass123')
+        self.board = Board.objects.create(name='Buffered')
+        self.ticket = Ticket.objects.create(title='T', board=self.board)
+        self.spool = os.path.join(tempfile.mkdtemp(), 'spool.jsonl')
+
+    def test_flushes_in_one_insert_when_full(self):
+        writer = ActivityWriter(max_size=3, interval=None, spool_path=self.spool)
+        writer.add(entry(self.ticket, self.user))
+        writer.add(entry(self.ticket, self.user))
+        self.assertEqual(TicketActivity.objects.count(), 0)
+        version = Board.objects.get(pk=self.board.pk).version
+        with CaptureQueriesContext(connection) as ctx:
+            writer.add(entry(self.ticket, self.user))
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT INTO "tickets_ticketactivity"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(len(writer), 0)
+        self.assertEqual(set(TicketActivity.objects.values_list('change_seq', flat=True)), {version + 1})
+
+    def test_close_writes_what_is_left(self):
+        writer = ActivityWriter(max_size=100, interval=None, spool_path=self.spool)
+        writer.add(entry(self.ticket, self.user))
+        writer.close()
+        self.assertEqual(TicketActivity.objects.get().description, 'moved')
+
+    def test_failed_flush_is_spooled_and_replayed(self):
+        writer = ActivityWriter(max_size=100, interval=None, spool_path=self.spool)
+        writer.add(entry(self.ticket, self.user, 'first'))
+        with mock.patch.object(activity, 'write_activities', side_effect=RuntimeError('db down')), \
+                self.assertLogs('tickets.activity', 'ERROR'):
+            self.assertEqual(writer.flush(), 0)
+        with open(self.spool) as spool:
+            self.assertEqual([json.loads(line)['description'] for line in spool], ['first'])
+        writer.add(entry(self.ticket, self.user, 'second'))
+        self.assertEqual(writer.flush(), 2)
+        self.assertFalse(os.path.exists(self.spool))
+        self.assertEqual(sorted(TicketActivity.objects.values_list('description', flat=True)), ['first', 'second'])
+
+    def test_buffered_rows_are_journaled_until_written(self):
+        writer = ActivityWriter(max_size=100, interval=None, spool_path=self.spool)
+        writer.add(entry(self.ticket, self.user, 'pending'))
+        journal = f'{self.spool}.{os.getpid()}'
+        with open(journal) as f:
+            self.assertEqual([json.loads(line)['description'] for line in f], ['pending'])
+        writer.flush()
+        self.assertEqual(os.listdir(os.path.dirname(self.spool)), [])
+
+    def test_journal_of_a_dead_worker_is_replayed(self):
+        dead = subprocess.Popen([sys.executable, '-c', 'pass'])
+        dead.wait()
+        with open(f'{self.spool}.{dead.pid}', 'w') as f:
+            f.write(json.dumps(entry(self.ticket, self.user, 'orphaned')) + '\n')
+        alive = f'{self.spool}.{os.getppid()}'
+        with open(alive, 'w') as f:
+            f.write(json.dumps(entry(self.ticket, self.user, 'in flight')) + '\n')
+        writer = ActivityWriter(max_size=100, interval=None, spool_path=self.spool)
+        self.assertEqual(writer.flush(), 1)
+        self.assertEqual(TicketActivity.objects.get().description, 'orphaned')
+        self.assertEqual(os.listdir(os.path.dirname(self.spool)), [os.path.basename(alive)])
+
+    def test_activity_for_deleted_ticket_is_kept_unlinked(self):
+        writer = ActivityWriter(max_size=100, interval=None, spool_path=self.spool)
+        writer.add(entry(self.ticket, self.user))
+        Ticket.objects.filter(pk=self.ticket.pk).delete()
+        writer.flush()
+        self.assertIsNone(TicketActivity.objects.get(description='moved').ticket_id)
+
+    def test_keeps_the_time_of_the_change(self):
+        writer = ActivityWriter(max_size=100, interval=None, spool_path=self.spool)
+        queued = entry(self.ticket, self.user)
+        queued['timestamp'] = '2024-01-02T03:04:05+00:00'
+        writer.add(queued)
+        writer.flush()
+        self.assertEqual(TicketActivity.objects.get().timestamp.year, 2024)
+
+
+class RecordActivityTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='recorder', password='pass123')
+        self.client.login(username='recorder', password='pass123')
+        self.board = Board.objects.create(name='Recorded')
+        self.ticket = Ticket.objects.create(title='T', board=self.board)
+
+    def test_synchronous_by_default(self):
+        record_activity(self.ticket, self.user, 'updated', 'now')
+        self.assertTrue(TicketActivity.objects.filter(description='now').exists())
+
+    @override_settings(TICKETS_ACTIVITY_WRITE_BEHIND=True)
+    def test_write_behind_buffers_after_commit(self):
+        writer = ActivityWriter(max_size=100, interval=None)
+        with mock.patch.object(activity, 'get_writer', return_value=writer):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    reverse('tickets:update-ticket-status'),
+                    data=json.dumps({'ticket_id': self.ticket.pk, 'new_status': 'done'}), content_type='application/json',
+                )
+            self.assertEqual(response.json()['success'], True)
+            self.assertEqual(len(writer), 1)
+            self.assertFalse(TicketActivity.objects.exists())
+            writer.flush()
+        self.assertEqual(TicketActivity.objects.get().description, 'Status changed from todo to done')
@@ -0,0 +1,105 @@
+from unittest import mock
+
+from django.contrib.admin import helpers
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from tickets.audit import ActivityLog
+from tickets.models import Board, Ticket, TicketActivity, TicketTombstone
+
+
+def activity_inserts(ctx):
+    return [q for q in ctx.captured_queries if q['sql'].startswith('INSERT INTO "tickets_ticketactivity"')]
+
+
+class AdminBulkAuditTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='auditor', password='pass123', email='a@example.com')
+        self.client.login(username='auditor', password='pass123')
+        self.board = Board.objects.create(name='Audit Board')
+        self.tickets = [Ticket.objects.create(title=f'T{i}', board=self.board) for i in range(4)]
+        self.url = reverse('admin:tickets_ticket_changelist')
+
+    def _action(self, action, tickets, **extra):
+        data = {'action': action, helpers.ACTION_CHECKBOX_NAME: [t.pk for t in tickets], **extra}
+        return self.client.post(self.url, data)
+
+    def test_set_based_status_action(self):
+        before = Board.objects.get(pk=self.board.pk).version
+        with CaptureQueriesContext(connection) as ctx:
+            self._action('set_status_done', self.tickets[:3])
+        self.assertEqual(Ticket.objects.filter(status='done').count(), 3)
+        self.assertEqual(len(activity_inserts(ctx)), 1)
+        board = Board.objects.get(pk=self.board.pk)
+        self.assertEqual(board.version, before + 1)
+        self.assertEqual(set(Ticket.objects.filter(status='done').values_list('change_seq', flat=True)), {board.version})
+        log = TicketActivity.objects.filter(activity_type='updated', user=self.admin)
+        self.assertEqual(log.count(), 3)
+        self.assertEqual(log.first().description, 'status=todo→done')
+
+    def test_assign_action(self):
+        assignee = User.objects.create_user(username='dev')
+        self._action('assign_to_user', self.tickets[:2], assignee='dev')
+        self.assertEqual(Ticket.objects.filter(assignee=assignee).count(), 2)
+        response = self._action('assign_to_user', self.tickets, assignee='nobody')
+        self.assertEqual(Ticket.objects.filter(assignee=assignee).count(), 2)
+        self.assertEqual(response.status_code, 302)
+
+    def _list_editable(self, tickets, status='in_progress'):
+        data = {
+            'form-TOTAL_FORMS': len(tickets), 'form-INITIAL_FORMS': len(tickets), 'form-MIN_NUM_FORMS': 0, 'form-MAX_NUM_FORMS': 1000,
+            '_save': 'Save',
+        }
+        for i, ticket in enumerate(sorted(tickets, key=lambda t: -t.pk)):
+            data.update({
+                f'form-{i}-id': ticket.pk, f'form-{i}-status': status, f'form-{i}-priority': 'high',
+                f'form-{i}-importance': ticket.importance, f'form-{i}-urgency': ticket.urgency,
+            })
+        return self.client.post(self.url + '?id__in=' + ','.join(str(t.pk) for t in tickets), data)
+
+    def test_list_editable_edits_roll_back_with_their_audit_rows(self):
+        with mock.patch.object(ActivityLog, 'flush', side_effect=RuntimeError('db down')):
+            with self.assertRaises(RuntimeError):
+                self._list_editable(self.tickets[:2])
+        self.assertFalse(Ticket.objects.filter(status='in_progress').exists())
+        self.assertFalse(TicketActivity.objects.filter(activity_type='updated').exists())
+
+    def test_invalid_list_editable_logs_nothing(self):
+        response = self._list_editable(self.tickets[:2], status='bogus')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(TicketActivity.objects.filter(activity_type='updated').exists())
+
+    def test_list_editable_save_logs_in_one_insert(self):
+        data = {
+            'form-TOTAL_FORMS': 2, 'form-INITIAL_FORMS': 2, 'form-MIN_NUM_FORMS': 0, 'form-MAX_NUM_FORMS': 1000,
+            '_save': 'Save',
+        }
+        for i, ticket in enumerate(sorted(self.tickets[:2], key=lambda t: -t.pk)):
+            data.update({
+                f'form-{i}-id': ticket.pk, f'form-{i}-status': 'in_progress', f'form-{i}-priority': 'high',
+                f'form-{i}-importance': ticket.importance, f'form-{i}-urgency': ticket.urgency,
+            })
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.url + '?id__in=' + ','.join(str(t.pk) for t in self.tickets[:2]), data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Ticket.objects.filter(status='in_progress', priority='high').count(), 2)
+        self.assertEqual(len(activity_inserts(ctx)), 1)
+        self.assertIn('status=todo→in_progress', TicketActivity.objects.filter(activity_type='updated').first().description)
+
+    def test_bulk_delete_keeps_an_audit_trail(self):
+        TicketActivity.objects.create(ticket=self.tickets[0], user=self.admin, activity_type='updated', description='earlier')
+        with CaptureQueriesContext(connection) as ctx:
+            self._action('delete_selected', self.tickets[:3], post='yes')
+        self.assertEqual(Ticket.objects.count(), 1)
+        self.assertEqual(len(activity_inserts(ctx)), 1)
+        deleted = TicketActivity.objects.filter(activity_type='deleted')
+        self.assertEqual(deleted.count(), 3)
+        self.assertTrue(all(a.ticket_id is None for a in deleted))
+        version = Board.objects.get(pk=self.board.pk).version
+        self.assertEqual({(a.board_id, a.change_seq) for a in deleted}, {(self.board.id, version)})
+        changes = self.client.get(reverse('tickets:board-changes', args=[self.board.id]), {'since': version - 1}).json()
+        self.assertEqual(sum(a['activity_type'] == 'deleted' for a in changes['activities']), 3)
+        self.assertTrue(TicketActivity.objects.filter(description='earlier', ticket__isnull=True).exists())
+        self.assertEqual(TicketTombstone.objects.filter(board=self.board).count(), 3)
@@ -0,0 +1,95 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from tickets.autocomplete import parent_choices, user_choices
+from tickets.forms import TicketForm
+from tickets.models import Board, Ticket
+from tickets.search import SEARCH_TABLE
+
+
+class AutocompleteTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='picker', password='pass123')
+        self.client = Client()
+        self.client.login(username='picker', password='pass123')
+        self.board = Board.objects.create(name='Picker Board')
+        self.other_board = Board.objects.create(name='Elsewhere')
+        self.epics = [Ticket.objects.create(title=f'Epic {i}', board=self.board, ticket_type='epic') for i in range(5)]
+        self.foreign_epic = Ticket.objects.create(title='Epic elsewhere', board=self.other_board, ticket_type='epic')
+        self.story = Ticket.objects.create(title='Story', board=self.board, ticket_type='ticket', parent=self.epics[0])
+        for name in ('alice', 'albert', 'bob'):
+            User.objects.create_user(username=name, password='x')
+
+    def test_parent_pages_are_board_scoped_and_typed(self):
+        url = reverse('tickets:parent-autocomplete', args=[self.board.id])
+        first = self.client.get(url, {'type': 'ticket', 'limit': 3}).json()
+        self.assertEqual([r['label'] for r in first['results']], ['Epic 0', 'Epic 1', 'Epic 2'])
+        second = self.client.get(url, {'type': 'ticket', 'limit': 3, 'cursor': first['next_cursor']}).json()
+        self.assertEqual([r['label'] for r in second['results']], ['Epic 3', 'Epic 4'])
+        self.assertIsNone(second['next_cursor'])
+
+        bugs = self.client.get(url, {'type': 'bug', 'q': 'sto'}).json()
+        self.assertEqual([r['id'] for r in bugs['results']], [self.story.id])
+        self.assertEqual(self.client.get(url, {'type': 'epic'}).json()['results'], [])
+        self.assertEqual(self.client.get(url, {'cursor': 'garbage'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'type': 'nope'}).status_code, 400)
+
+    def test_assignee_lookup(self):
+        url = reverse('tickets:assignee-autocomplete')
+        data = self.client.get(url, {'q': 'al'}).json()
+        self.assertEqual([r['label'] for r in data['results']], ['albert', 'alice'])
+        page = self.client.get(url, {'limit': 2}).json()
+        self.assertIsNotNone(page['next_cursor'])
+
+    def test_form_renders_only_the_selected_options(self):
+        self.story.assignee = self.user
+        self.story.save()
+        html = str(TicketForm(instance=self.story)['parent']) + str(TicketForm(instance=self.story)['assignee'])
+        self.assertEqual(html.count('<option'), 4)  # an empty choice + the current value, per field
+        self.assertIn('Epic 0', html)
+        self.assertNotIn('Epic 1', html)
+        self.assertNotIn('bob', html)
+        self.assertIn('data-autocomplete-url', html)
+
+    def test_parent_from_another_board_is_rejected(self):
+        form = TicketForm(data={
+            'title': 'Cross board', 'status': 'todo', 'priority': 'medium', 'importance': 3, 'urgency': 3,
+            'board': self.board.id, 'ticket_type': 'ticket', 'parent': self.foreign_epic.id,
+        })
+        self.assertFalse(form.is_valid())
+        self.assertIn('parent', form.errors)
+
+
+class AutocompletePlanTest(TestCase):
+    """Typeahead terms are matched through indexes, not table scans."""
+
+    def setUp(self):
+        self.board = Board.objects.create(name='Plan Board')
+        self.epic = Ticket.objects.create(title='Checkout flow', board=self.board, ticket_type='epic')
+        Ticket.objects.create(title='Other flow', board=self.board, ticket_type='epic', description='checkout')
+        for name, first, last in (('alice', 'Alice', 'Liddell'), ('bob', 'Robert', 'Alder'), ('carol', 'Carol', 'King')):
+            User.objects.create_user(username=name, first_name=first, last_name=last, password='x')
+
+    def plan(self, lookup, *args):
+        """Rows returned by ``lookup`` and the query plan of the query it ran."""
+        with CaptureQueriesContext(connection) as ctx:
+            rows, _ = lookup(*args)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + ctx.captured_queries[0]['sql'])
+            return rows, ' | '.join(row[-1] for row in cursor.fetchall())
+
+    def test_parent_term_uses_title_search_index(self):
+        tickets, plan = self.plan(parent_choices, self.board.id, 'ticket', 'CHECK')
+        self.assertEqual(tickets, [self.epic])
+        self.assertIn(f'{SEARCH_TABLE} VIRTUAL TABLE INDEX', plan)
+        self.assertNotIn('SCAN tickets_ticket', plan)
+
+    def test_user_term_uses_lower_name_indexes(self):
+        users, plan = self.plan(user_choices, 'AL')
+        self.assertEqual([u.username for u in users], ['alice', 'bob'])
+        for field in ('username', 'first_name', 'last_name'):
+            self.assertIn(f'tickets_user_{field}_lower_idx', plan)
+        self.assertNotIn('SCAN auth_user', plan)
@@ -0,0 +1,89 @@
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from tickets.live import get_broker
+from tickets.models import Board, Ticket, TicketActivity
+from tickets.ranking import RANK_GAP
+
+
+def column(board, status='todo'):
+    return list(Ticket.objects.filter(board=board, status=status).order_by('sort_order', 'id').values_list('title', flat=True))
+
+
+@override_settings(TICKETS_LIVE_BROKER='tickets.testsuite.test_live.RecordingBroker')
+class BatchMoveTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='mover', password='12345')
+        self.client = Client()
+        self.client.login(username='mover', password='12345')
+        self.board = Board.objects.create(name='Batch')
+        self.tickets = {
+            title: Ticket.objects.create(title=title, board=self.board, sort_order=(i + 1) * RANK_GAP)
+            for i, title in enumerate('ABCDE')
+        }
+        self.done = Ticket.objects.create(title='X', board=self.board, status='done', sort_order=RANK_GAP)
+        self.url = reverse('tickets:batch-move-tickets')
+
+    def _post(self, moves):
+        return self.client.post(self.url, {'moves': moves}, content_type='application/json')
+
+    def test_multi_select_drag_is_one_transaction_of_bulk_writes(self):
+        t = self.tickets
+        moves = [
+            {'ticket_id': t['A'].id, 'status': 'done', 'before_id': self.done.id},
+            # Chained: dropped below a card moved earlier in the same batch
+            {'ticket_id': t['B'].id, 'status': 'done', 'before_id': t['A'].id},
+            {'ticket_id': t['E'].id, 'status': 'todo', 'after_id': t['C'].id},
+        ]
+        version = Board.objects.get(pk=self.board.pk).version
+        with CaptureQueriesContext(connection) as ctx:
+            response = self._post(moves)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([row['id'] for row in data['tickets']], [t['A'].id, t['B'].id, t['E'].id])
+        self.assertEqual(column(self.board, 'done'), ['X', 'A', 'B'])
+        self.assertEqual(column(self.board), ['E', 'C', 'D'])
+
+        writes = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith(('UPDATE "tickets_ticket"', 'INSERT INTO "tickets_ticketactivity"'))]
+        self.assertEqual(len(writes), 2)
+
+        board = Board.objects.get(pk=self.board.pk)
+        self.assertEqual(board.version, version + 1)
+        self.assertEqual({row['change_seq'] for row in data['tickets']}, {board.version})
+        activities = TicketActivity.objects.filter(change_seq=board.version)
+        self.assertEqual(activities.count(), 3)
+        self.assertIn('Status changed from todo to done', activities.get(ticket=t['A']).description)
+
+    def test_invalid_batch_writes_nothing(self):
+        t = self.tickets
+        version = Board.objects.get(pk=self.board.pk).version
+        response = self._post([
+            {'ticket_id': t['A'].id, 'status': 'done'},
+            {'ticket_id': t['B'].id, 'status': 'done', 'before_id': t['C'].id},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['success'])
+        self.assertEqual(column(self.board), ['A', 'B', 'C', 'D', 'E'])
+        self.assertEqual(Board.objects.get(pk=self.board.pk).version, version)
+
+        other = Ticket.objects.create(title='Other', board=Board.objects.create(name='Other'))
+        response = self._post([{'ticket_id': t['A'].id, 'status': 'done'}, {'ticket_id': other.id, 'status': 'done'}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self._post([{'ticket_id': t['A'].id, 'status': 'nope'}]).status_code, 400)
+
+    def test_exhausted_gap_rebalances_and_retries(self):
+        t = self.tickets
+        Ticket.objects.filter(pk=t['A'].pk).update(sort_order=5)
+        Ticket.objects.filter(pk=t['B'].pk).update(sort_order=6)
+        response = self._post([{'ticket_id': t['E'].id, 'status': 'todo', 'before_id': t['A'].id, 'after_id': t['B'].id}])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(column(self.board), ['A', 'E', 'B', 'C', 'D'])
+
+    def test_moves_published_after_commit(self):
+        broker = get_broker()
+        broker.published.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self._post([{'ticket_id': self.tickets['C'].id, 'status': 'in_progress'}])
+        self.assertEqual(broker.published[-1][1]['ticket']['status'], 'in_progress')
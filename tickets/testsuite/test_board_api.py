@@ -0,0 +1,61 @@
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.contrib.auth.models import User
+from tickets.models import Board, Ticket
+
+
+class BoardColumnApiTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='pager', password='12345')
+        self.client = Client()
+        self.client.login(username='pager', password='12345')
+        self.board = Board.objects.create(name='Paged Board')
+        self.epic = Ticket.objects.create(title='Epic', board=self.board, ticket_type='epic', status='done')
+        # Duplicate sort orders make sure the id tie-breaker keeps pages disjoint
+        self.todo = [
+            Ticket.objects.create(title=f'Todo {i}', board=self.board, status='todo', sort_order=i // 2)
+            for i in range(7)
+        ]
+        self.url = reverse('tickets:board-column', args=[self.board.id, 'todo'])
+
+    def test_pages_walk_column_in_sort_order(self):
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            params = {'limit': 3}
+            if cursor:
+                params['cursor'] = cursor
+            data = self.client.get(self.url, params).json()
+            self.assertTrue(data['success'])
+            seen.extend(t['id'] for t in data['tickets'])
+            pages += 1
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(pages, 3)
+        self.assertEqual(seen, [t.id for t in self.todo])
+
+    def test_type_filter(self):
+        url = reverse('tickets:board-column', args=[self.board.id, 'done'])
+        data = self.client.get(url, {'type': 'bug'}).json()
+        self.assertEqual(data['tickets'], [])
+        data = self.client.get(url, {'type': 'epic,bug'}).json()
+        self.assertEqual([t['id'] for t in data['tickets']], [self.epic.id])
+
+    def test_invalid_input_rejected(self):
+        bad_status = reverse('tickets:board-column', args=[self.board.id, 'archived'])
+        self.assertEqual(self.client.get(bad_status).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'cursor': '!!'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'type': 'story'}).status_code, 400)
+
+    @override_settings(BOARD_COLUMN_PAGE_SIZE=4)
+    def test_board_view_renders_first_page_with_cursor(self):
+        response = self.client.get(reverse('tickets:board-view', args=[self.board.id]))
+        grouped = response.context['grouped']
+        self.assertEqual(grouped['by_status']['todo'], self.todo[:4])
+        self.assertIsNotNone(grouped['next_cursor']['todo'])
+        self.assertIsNone(grouped['next_cursor']['done'])
+        # The rendered cursor resumes exactly where the page stopped
+        data = self.client.get(self.url, {'cursor': grouped['next_cursor']['todo']}).json()
+        self.assertEqual([t['id'] for t in data['tickets']], [t.id for t in self.todo[4:]])
@@ -0,0 +1,106 @@
+import csv
+import io
+import json
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from tickets import exporter
+from tickets.models import Board, Ticket, TicketActivity, TicketComment
+
+
+class BoardExportTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='reporter', password='pass123')
+        self.client.login(username='reporter', password='pass123')
+        self.board = Board.objects.create(name='Reported')
+        other = Board.objects.create(name='Elsewhere')
+        self.epic = Ticket.objects.create(board=self.board, title='Epic', ticket_type='epic', assignee=self.user)
+        self.ticket = Ticket.objects.create(board=self.board, title='Ticket', parent=self.epic, status='done')
+        self.bug = Ticket.objects.create(board=self.board, title='Bug', ticket_type='bug', parent=self.ticket)
+        self.ticket.related_tickets.add(self.bug, self.epic)
+        Ticket.objects.create(board=other, title='Not ours')
+        self.comment = TicketComment.objects.create(ticket=self.bug, user=self.user, body='Repro, steps "quoted"')
+        TicketActivity.objects.create(ticket=self.bug, user=self.user, activity_type='commented', description='c')
+        self.url = reverse('tickets:board-export', args=[self.board.id])
+
+    def _get(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def _csv(self, **params):
+        return list(csv.DictReader(io.StringIO(self._get(**params))))
+
+    def test_csv_tickets(self):
+        rows = self._csv()
+        self.assertEqual([r['title'] for r in rows], ['Epic', 'Ticket', 'Bug'])
+        self.assertEqual(rows[0]['assignee'], 'reporter')
+        self.assertEqual(rows[1]['parent'], str(self.epic.id))
+        self.assertEqual(rows[1]['related'], f'{self.epic.id};{self.bug.id}')
+        self.assertEqual(rows[0]['parent'], '')
+
+    def test_column_selection_and_filters(self):
+        rows = self._csv(columns='id,title', status='todo', type='bug,epic')
+        self.assertEqual(rows, [{'id': str(self.epic.id), 'title': 'Epic'}, {'id': str(self.bug.id), 'title': 'Bug'}])
+
+    def test_updated_since(self):
+        Ticket.objects.filter(pk=self.epic.pk).update(updated_at=timezone.now() - timedelta(days=10))
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        self.assertEqual([r['title'] for r in self._csv(updated_since=since)], ['Ticket', 'Bug'])
+
+    def test_jsonl_with_comments_and_activities(self):
+        lines = [json.loads(line) for line in self._get(format='ndjson', include='tickets,comments,activities').splitlines()]
+        self.assertEqual([line['record'] for line in lines], ['tickets'] * 3 + ['comments', 'activities'])
+        comment = lines[3]
+        self.assertEqual((comment['ticket_id'], comment['body'], comment['user']), (self.bug.id, self.comment.body, 'reporter'))
+        self.assertEqual(lines[4]['activity_type'], 'commented')
+
+    def test_comments_csv(self):
+        rows = self._csv(include='comments')
+        self.assertEqual([r['body'] for r in rows], [self.comment.body])
+
+    def test_reads_in_chunks(self):
+        Ticket.objects.bulk_create([Ticket(board=self.board, title=f'Bulk {i}') for i in range(7)])
+        self.patch_chunk_size(3)
+        with CaptureQueriesContext(connection) as ctx:
+            rows = self._csv()
+        self.assertEqual(len(rows), 10)
+        # one ``related`` lookup per chunk of three tickets
+        links = [q for q in ctx.captured_queries if 'tickets_ticket_related_tickets' in q['sql']]
+        self.assertEqual(len(links), 4)
+
+    def test_streams_blocks_of_lines(self):
+        Ticket.objects.bulk_create([Ticket(board=self.board, title=f'Bulk {i}') for i in range(7)])
+        self.patch_chunk_size(3)
+        response = self.client.get(self.url)
+        blocks = [block.decode() for block in response.streaming_content]
+        # header + 10 rows, three lines to a block
+        self.assertEqual([block.count('\n') for block in blocks], [3, 3, 3, 2])
+        export = exporter.BoardExport(self.board.id, fmt='jsonl')
+        self.assertEqual(len(list(export.chunks(max_chars=1))), 10)
+
+    def patch_chunk_size(self, size):
+        original = exporter.EXPORT_CHUNK_SIZE
+        exporter.EXPORT_CHUNK_SIZE = size
+        self.addCleanup(setattr, exporter, 'EXPORT_CHUNK_SIZE', original)
+
+    def test_bad_parameters(self):
+        for params in ({'format': 'xml'}, {'include': 'tickets,comments'}, {'include': 'users'},
+                       {'columns': 'secret'}, {'status': 'archived'}, {'updated_since': 'yesterday'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400, params)
+        self.assertEqual(self.client.get(reverse('tickets:board-export', args=[9999])).status_code, 404)
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command('export_board', str(self.board.id), '--format', 'jsonl', '--columns', 'title', '--type', 'bug', stdout=out)
+        self.assertEqual(out.getvalue(), '{"title": "Bug"}\n')
+        with self.assertRaises(CommandError):
+            call_command('export_board', str(self.board.id), '--include', 'tickets', '--include', 'comments', stdout=io.StringIO())
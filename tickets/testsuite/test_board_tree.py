@@ -0,0 +1,57 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth.models import User
+from tickets.models import Board, Ticket
+
+
+class BoardTreeApiTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='planner', password='pass123')
+        self.client = Client()
+        self.client.login(username='planner', password='pass123')
+        self.board = Board.objects.create(name='Tree Board')
+        self.epic = Ticket.objects.create(title='Epic', board=self.board, ticket_type='epic')
+        self.story = Ticket.objects.create(title='Story', board=self.board, parent=self.epic, status='done', sort_order=2)
+        self.story2 = Ticket.objects.create(title='Story 2', board=self.board, parent=self.epic, sort_order=1)
+        self.bug = Ticket.objects.create(title='Bug', board=self.board, ticket_type='bug', parent=self.story)
+        self.loose = Ticket.objects.create(title='Loose', board=self.board)
+        self.url = reverse('tickets:board-tree', args=[self.board.id])
+
+    def _titles(self, nodes):
+        return [(n['title'], self._titles(n['children'])) for n in nodes]
+
+    def test_nested_tree_in_one_query(self):
+        with self.assertNumQueries(5):  # session, user, ETag version, board exists, tickets
+            data = self.client.get(self.url).json()
+        self.assertEqual(self._titles(data['tree']), [
+            ('Epic', [('Story 2', []), ('Story', [('Bug', [])])]),
+            ('Loose', []),
+        ])
+        epic = data['tree'][0]
+        self.assertEqual((epic['descendant_count'], epic['descendant_done_count'], epic['open_bug_count']), (3, 1, 1))
+
+    def test_pruning_keeps_ancestors(self):
+        data = self.client.get(self.url, {'type': 'bug'}).json()
+        self.assertEqual(self._titles(data['tree']), [('Epic', [('Story', [('Bug', [])])])])
+        data = self.client.get(self.url, {'status': 'done'}).json()
+        self.assertEqual(self._titles(data['tree']), [('Epic', [('Story', [])])])
+        data = self.client.get(self.url, {'depth': 0}).json()
+        self.assertEqual(self._titles(data['tree']), [('Epic', []), ('Loose', [])])
+
+    def test_invalid_input_rejected(self):
+        self.assertEqual(self.client.get(self.url, {'depth': -1}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'type': 'story'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('tickets:board-tree', args=[999])).status_code, 404)
+
+    def test_large_board_builds_in_constant_queries(self):
+        epics = Ticket.objects.bulk_create([Ticket(title=f'E{i}', board=self.board, ticket_type='epic') for i in range(50)])
+        stories = Ticket.objects.bulk_create([
+            Ticket(title=f'S{i}', board=self.board, parent=epics[i % 50]) for i in range(1000)
+        ])
+        Ticket.objects.bulk_create([
+            Ticket(title=f'B{i}', board=self.board, ticket_type='bug', parent=stories[i % 1000]) for i in range(4000)
+        ])
+        with self.assertNumQueries(5):  # same as the five-ticket board above
+            data = self.client.get(self.url).json()
+        self.assertEqual(len(data['tree']), 52)
+        self.assertEqual(sum(len(epic['children']) for epic in data['tree']), 1002)
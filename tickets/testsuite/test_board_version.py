@@ -0,0 +1,124 @@
+from django.db.models.signals import post_save
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth.models import User
+from tickets.models import Board, Ticket, TicketActivity, TicketComment
+from tickets.models_theme import UserTheme
+
+
+class BoardVersionTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='versioner', password='12345')
+        self.board = Board.objects.create(name='Versioned')
+        self.other = Board.objects.create(name='Untouched')
+
+    def _version(self, board=None):
+        return Board.objects.get(pk=(board or self.board).pk).version
+
+    def test_ticket_comment_and_activity_changes_bump_version(self):
+        ticket = Ticket.objects.create(title='T', board=self.board)
+        v1 = self._version()
+        self.assertGreater(v1, 0)
+        ticket.status = 'done'
+        ticket.save()
+        v2 = self._version()
+        self.assertGreater(v2, v1)
+        TicketComment.objects.create(ticket=ticket, user=self.user, body='hi')
+        v3 = self._version()
+        self.assertGreater(v3, v2)
+        TicketActivity.objects.create(ticket=ticket, user=self.user, activity_type='updated')
+        v4 = self._version()
+        self.assertGreater(v4, v3)
+        ticket.delete()
+        self.assertGreater(self._version(), v4)
+        self.assertEqual(self._version(self.other), 0)
+
+    def test_activity_insert_commits_with_its_version(self):
+        ticket = Ticket.objects.create(title='T', board=self.board)
+        version = self._version()
+
+        def fail(sender, **kwargs):
+            raise RuntimeError('insert failed')
+
+        post_save.connect(fail, sender=TicketActivity)
+        self.addCleanup(post_save.disconnect, fail, sender=TicketActivity)
+        with self.assertRaises(RuntimeError):
+            TicketActivity.objects.create(ticket=ticket, user=self.user, activity_type='updated')
+        # The bump taken in pre_save went with the failed insert.
+        self.assertEqual(self._version(), version)
+
+
+class BoardETagTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='etagger', password='12345')
+        self.client = Client()
+        self.client.login(username='etagger', password='12345')
+        self.board = Board.objects.create(name='Cached Board')
+        self.ticket = Ticket.objects.create(title='Card', board=self.board)
+
+    def _assert_conditional(self, url, mutate):
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        etag = first['ETag']
+        cached = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.content, b'')
+        mutate()
+        fresh = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh['ETag'], etag)
+
+    def test_board_view_304_until_ticket_changes(self):
+        def move():
+            self.client.post(
+                reverse('tickets:update-ticket-status'),
+                {'ticket_id': self.ticket.id, 'new_status': 'done'},
+                content_type='application/json',
+            )
+        self._assert_conditional(reverse('tickets:board-view', args=[self.board.id]), move)
+
+    def test_board_view_etag_tracks_theme_changes(self):
+        def add_theme():
+            UserTheme.objects.create(user=self.user, name='Fresh', colors={'primary': '#000000'})
+        self._assert_conditional(reverse('tickets:board-view', args=[self.board.id]), add_theme)
+
+    def test_board_view_not_reused_across_logins(self):
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+        client = Client(enforce_csrf_checks=True)
+
+        def login():
+            # Through the login view, which rotates the CSRF secret
+            token = client.get(reverse('admin:login')).context['csrf_token']
+            client.post(reverse('admin:login'), {'username': 'etagger', 'password': '12345', 'csrfmiddlewaretoken': str(token)})
+
+        login()
+        url = reverse('tickets:board-view', args=[self.board.id])
+        first = client.get(url)
+        old_token = first.context['csrf_token']
+        client.post(reverse('tickets:logout'), {'csrfmiddlewaretoken': str(old_token)})
+        login()
+        fresh = client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(fresh.status_code, 200)
+        move = {'ticket_id': self.ticket.id, 'new_status': 'done'}
+        stale = client.post(reverse('tickets:update-ticket-status'), move, content_type='application/json',
+                            HTTP_X_CSRFTOKEN=str(old_token))
+        self.assertEqual(stale.status_code, 403)
+        response = client.post(reverse('tickets:update-ticket-status'), move, content_type='application/json',
+                               HTTP_X_CSRFTOKEN=str(fresh.context['csrf_token']))
+        self.assertEqual(response.status_code, 200)
+
+    def test_column_api_304_until_comment_added(self):
+        def comment():
+            self.client.post(
+                reverse('tickets:ticket-edit', args=[self.ticket.id]),
+                {'comment_mode': '1', 'comment_body': 'Ping'},
+            )
+        self._assert_conditional(reverse('tickets:board-column', args=[self.board.id, 'todo']), comment)
+
+    def test_get_themes_304_until_theme_saved(self):
+        theme = UserTheme.objects.create(user=self.user, name='Mine', colors={'primary': '#111111'})
+
+        def rename():
+            theme.name = 'Renamed'
+            theme.save()
+        self._assert_conditional(reverse('tickets:get_themes'), rename)
@@ -0,0 +1,87 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from tickets.models import Board, Ticket, TicketActivity
+
+
+def ticket_updates(ctx):
+    return [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE "tickets_ticket" SET')]
+
+
+class ChangeTrackingTest(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name='Tracked')
+        self.ticket = Ticket.objects.create(title='Original', description='Body', board=self.board)
+
+    def test_loaded_ticket_reports_changes(self):
+        ticket = Ticket.objects.get(pk=self.ticket.pk)
+        self.assertEqual(ticket.changes(), {})
+        ticket.title = 'Renamed'
+        ticket.status = 'done'
+        self.assertEqual(ticket.audited_changes(), {'title': ('Original', 'Renamed'), 'status': ('todo', 'done')})
+
+    def test_full_save_writes_only_changed_columns(self):
+        ticket = Ticket.objects.get(pk=self.ticket.pk)
+        ticket.title = 'Renamed'
+        with CaptureQueriesContext(connection) as ctx:
+            ticket.save()
+        [update] = [sql for sql in ticket_updates(ctx) if 'WHERE "tickets_ticket"."id" = %s' % ticket.pk in sql]
+        self.assertIn('"title"', update)
+        self.assertNotIn('"description"', update)
+        self.assertNotIn('"status"', update)
+        self.assertEqual(Ticket.objects.get(pk=ticket.pk).title, 'Renamed')
+
+    def test_save_refreshes_snapshot(self):
+        ticket = Ticket.objects.get(pk=self.ticket.pk)
+        ticket.title = 'Renamed'
+        ticket.save()
+        self.assertEqual(ticket.changes(), {})
+        self.assertEqual(ticket.loaded_value('title'), 'Renamed')
+
+    def test_importance_change_rewrites_priority_score(self):
+        ticket = Ticket.objects.get(pk=self.ticket.pk)
+        ticket.importance = 9
+        ticket.save()
+        self.assertEqual(Ticket.objects.get(pk=ticket.pk).priority_score, 9 * ticket.urgency)
+
+    def test_deferred_fields_are_written_once_loaded(self):
+        ticket = Ticket.objects.only('id', 'title', 'board_id').get(pk=self.ticket.pk)
+        ticket.description = 'Replaced'
+        ticket.save()
+        self.assertEqual(Ticket.objects.get(pk=ticket.pk).description, 'Replaced')
+
+
+class TicketEditAuditTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='editor', password='pass123')
+        self.client.login(username='editor', password='pass123')
+        self.board = Board.objects.create(name='Edit Board')
+        self.ticket = Ticket.objects.create(title='Original', description='Body', board=self.board)
+
+    def _post(self, **overrides):
+        data = {
+            'title': self.ticket.title, 'description': self.ticket.description, 'status': self.ticket.status,
+            'priority': self.ticket.priority, 'importance': self.ticket.importance, 'urgency': self.ticket.urgency,
+            'ticket_type': self.ticket.ticket_type, 'board': self.board.pk, **overrides,
+        }
+        return self.client.post(reverse('tickets:ticket-edit', args=[self.ticket.pk]), data)
+
+    def test_edit_logs_the_diff(self):
+        response = self._post(title='Renamed', status='done')
+        self.assertEqual(response.status_code, 302)
+        activity = TicketActivity.objects.filter(ticket=self.ticket, activity_type='updated').get()
+        self.assertEqual(activity.description, 'title=Original→Renamed; status=todo→done')
+
+    def test_edit_without_changes_is_logged_as_such(self):
+        self._post()
+        activity = TicketActivity.objects.filter(ticket=self.ticket, activity_type='updated').get()
+        self.assertEqual(activity.description, 'No material field changes')
+
+    def test_edit_does_not_reread_the_ticket_to_save(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self._post(title='Renamed')
+        # The view's get_object_or_404; the search re-index reads by "id IN (...)"
+        reads = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('SELECT') and 'FROM "tickets_ticket" WHERE "tickets_ticket"."id" = ' in q['sql']]
+        self.assertEqual(len(reads), 1)
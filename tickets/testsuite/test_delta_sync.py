@@ -0,0 +1,70 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth.models import User
+from tickets.models import Board, Ticket, TicketActivity, TicketTombstone
+
+
+class DeltaSyncTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='syncer', password='12345')
+        self.client = Client()
+        self.client.login(username='syncer', password='12345')
+        self.board = Board.objects.create(name='Sync Board')
+        self.keep = Ticket.objects.create(title='Keep', board=self.board)
+        self.doomed = Ticket.objects.create(title='Doomed', board=self.board)
+        self.url = reverse('tickets:board-changes', args=[self.board.id])
+
+    def _cursor(self):
+        return Board.objects.get(pk=self.board.pk).version
+
+    def test_changes_since_cursor(self):
+        cursor = self._cursor()
+        self.keep.title = 'Kept'
+        self.keep.save()
+        TicketActivity.objects.create(ticket=self.keep, user=self.user, activity_type='updated', description='renamed')
+        doomed_id = self.doomed.id
+        self.doomed.delete()
+        data = self.client.get(self.url, {'since': cursor}).json()
+        self.assertTrue(data['success'])
+        self.assertEqual([t['title'] for t in data['tickets']], ['Kept'])
+        self.assertEqual(data['deleted'], [doomed_id])
+        self.assertEqual([a['description'] for a in data['activities']], ['renamed'])
+        self.assertEqual(data['cursor'], self._cursor())
+        self.assertFalse(data['has_more'])
+        # Nothing new after the returned cursor
+        again = self.client.get(self.url, {'since': data['cursor']}).json()
+        self.assertEqual((again['tickets'], again['deleted'], again['activities']), ([], [], []))
+
+    def test_limit_pages_through_changes(self):
+        cursor = self._cursor()
+        for i in range(5):
+            Ticket.objects.create(title=f'New {i}', board=self.board)
+        seen = []
+        while True:
+            data = self.client.get(self.url, {'since': cursor, 'limit': 2}).json()
+            seen.extend(t['title'] for t in data['tickets'])
+            cursor = data['cursor']
+            if not data['has_more']:
+                break
+        self.assertEqual(seen, [f'New {i}' for i in range(5)])
+
+    def test_moving_ticket_leaves_tombstone_on_old_board(self):
+        other = Board.objects.create(name='Elsewhere')
+        cursor = self._cursor()
+        ticket = Ticket.objects.get(pk=self.keep.pk)
+        ticket.board = other
+        ticket.save()
+        data = self.client.get(self.url, {'since': cursor}).json()
+        self.assertEqual(data['deleted'], [self.keep.id])
+        self.assertEqual(data['tickets'], [])
+
+    def test_board_delete_cleans_up_tombstones(self):
+        self.doomed.delete()
+        self.assertTrue(TicketTombstone.objects.filter(board_id=self.board.id).exists())
+        board_id = self.board.id
+        self.board.delete()
+        self.assertFalse(TicketTombstone.objects.filter(board_id=board_id).exists())
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'since': 'abc'}).status_code, 400)
@@ -0,0 +1,109 @@
+from django.test import SimpleTestCase, TestCase, Client
+from django.urls import reverse
+from django.contrib.auth.models import User
+from tickets.graph import BoardGraph, get_board_graph
+from tickets.models import Board, Ticket
+
+
+class BoardGraphAnalysisTest(SimpleTestCase):
+    def graph(self, edges, done=()):
+        nodes = {pk for edge in edges for pk in edge}
+        statuses = {pk: 'done' if pk in done else 'todo' for pk in nodes}
+        return BoardGraph(1, 1, statuses, edges)
+
+    def test_transitive_sets_and_order(self):
+        # 1 waits on 2, 2 waits on 3, 4 waits on 3
+        g = self.graph([(1, 2), (2, 3), (4, 3)])
+        self.assertEqual(g.transitive_blockers(1), {2, 3})
+        self.assertEqual(g.transitive_dependents(3), {1, 2, 4})
+        order = g.topological_order
+        self.assertLess(order.index(3), order.index(2))
+        self.assertLess(order.index(2), order.index(1))
+        self.assertEqual(g.critical_path, [3, 2, 1])
+        self.assertEqual(g.blocked, {1, 2, 4})
+        self.assertEqual(g.cycles, [])
+
+    def test_done_blockers_release_dependents(self):
+        g = self.graph([(1, 2), (4, 3)], done={2})
+        self.assertEqual(g.blocked, {4})
+        # A done ticket still passes on the wait for its own open blocker
+        g = self.graph([(1, 2), (2, 3)], done={2})
+        self.assertEqual(g.blocked, {1, 2})
+
+    def test_cycles_are_reported_and_excluded_from_order(self):
+        g = self.graph([(1, 2), (2, 3), (3, 1), (4, 1), (5, 5)])
+        self.assertEqual(g.cycles, [[1, 2, 3], [5]])
+        self.assertEqual(g.topological_order, [4])
+
+
+class DependencyApiTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='deps', password='pass123')
+        self.client = Client()
+        self.client.login(username='deps', password='pass123')
+        self.board = Board.objects.create(name='Deps Board')
+        self.api = Ticket.objects.create(title='API', board=self.board)
+        self.ui = Ticket.objects.create(title='UI', board=self.board)
+        self.docs = Ticket.objects.create(title='Docs', board=self.board)
+        self.ui.related_tickets.add(self.api)
+        self.docs.related_tickets.add(self.ui)
+
+    def test_graph_cached_per_board_version(self):
+        board = Board.objects.get(pk=self.board.pk)
+        graph = get_board_graph(board)
+        self.assertEqual(graph.blocked, {self.ui.id, self.docs.id})
+        with self.assertNumQueries(0):
+            self.assertEqual(get_board_graph(board).blocked, graph.blocked)
+        self.api.status = 'done'
+        self.api.save()
+        self.assertEqual(get_board_graph(self.board.id).blocked, {self.docs.id})
+
+    def test_closing_a_blocker_stamps_its_dependents(self):
+        before = Board.objects.get(pk=self.board.pk).version
+        self.api.status = 'done'
+        self.api.save()
+        seq = Board.objects.get(pk=self.board.pk).version
+        changed = {t['id']: t['blocked'] for t in self.client.get(
+            reverse('tickets:board-changes', args=[self.board.id]), {'since': before},
+        ).json()['tickets']}
+        self.assertEqual(changed, {self.api.id: False, self.ui.id: False, self.docs.id: True})
+        self.assertEqual(set(Ticket.objects.filter(change_seq=seq).values_list('id', flat=True)), {self.ui.id, self.docs.id})
+        # Edits that leave the ticket open or closed don't ripple out.
+        self.api.title = 'API v2'
+        self.api.save()
+        self.assertEqual(Ticket.objects.get(pk=self.docs.pk).change_seq, seq)
+
+    def test_blocker_on_another_board(self):
+        other = Board.objects.create(name='Platform')
+        infra = Ticket.objects.create(title='Infra', board=other)
+        self.api.related_tickets.add(infra)
+        self.assertEqual(get_board_graph(self.board.id).blocked, {self.api.id, self.ui.id, self.docs.id})
+        Ticket.objects.filter(pk=infra.pk).update(status='done')
+        self.assertEqual(get_board_graph(self.board.id).blocked, {self.ui.id, self.docs.id})
+
+    def test_link_changes_advance_version_and_stamp_dependents(self):
+        before = Board.objects.get(pk=self.board.pk).version
+        self.api.related_tickets.add(self.docs)  # closes a cycle
+        board = Board.objects.get(pk=self.board.pk)
+        self.assertGreater(board.version, before)
+        stamped = set(Ticket.objects.filter(change_seq=board.version).values_list('id', flat=True))
+        self.assertEqual(stamped, {self.api.id, self.ui.id, self.docs.id})
+        self.assertEqual(get_board_graph(board).cycles, [sorted([self.api.id, self.ui.id, self.docs.id])])
+        self.ui.related_tickets.clear()
+        self.assertGreater(Board.objects.get(pk=self.board.pk).version, board.version)
+
+    def test_endpoints_and_blocked_cards(self):
+        data = self.client.get(reverse('tickets:board-graph', args=[self.board.id])).json()
+        self.assertEqual(data['blocked'], sorted([self.ui.id, self.docs.id]))
+        self.assertEqual(data['critical_path'], [self.api.id, self.ui.id, self.docs.id])
+
+        data = self.client.get(reverse('tickets:ticket-dependencies', args=[self.docs.id])).json()
+        self.assertEqual(data['transitive_blockers'], sorted([self.api.id, self.ui.id]))
+        self.assertTrue(data['blocked'])
+        self.assertFalse(data['in_cycle'])
+
+        response = self.client.get(reverse('tickets:board-view', args=[self.board.id]))
+        self.assertContains(response, 'ticket-blocked-badge', count=2)
+        column = self.client.get(reverse('tickets:board-column', args=[self.board.id, 'todo'])).json()
+        self.assertEqual({t['id']: t['blocked'] for t in column['tickets']}, {self.api.id: False, self.ui.id: True, self.docs.id: True})
+        self.assertEqual(self.client.get(reverse('tickets:board-graph', args=[999])).status_code, 404)
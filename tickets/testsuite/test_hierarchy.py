@@ -42,3 +42,77 @@ class TicketHierarchyValidationTests(TestCase):
         bug.related_tickets.add(enhancement)
         self.assertIn(enhancement, bug.related_tickets.all())
         self.assertIn(bug, enhancement.related_from.all())
+
+
+class MaterializedPathTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name='Path Board')
+        self.epic = Ticket.objects.create(title='Epic', board=self.board, ticket_type='epic')
+        self.other_epic = Ticket.objects.create(title='Other Epic', board=self.board, ticket_type='epic')
+        self.story = Ticket.objects.create(title='Story', board=self.board, ticket_type='ticket', parent=self.epic)
+        self.bug = Ticket.objects.create(title='Bug', board=self.board, ticket_type='bug', parent=self.story)
+
+    def test_paths_on_create(self):
+        self.assertEqual((self.epic.path, self.epic.depth), ('', 0))
+        self.assertEqual(self.bug.ancestor_ids, [self.epic.id, self.story.id])
+        self.assertEqual(self.bug.depth, 2)
+        self.assertEqual(list(Ticket.objects.ancestors_of(self.bug)), [self.epic, self.story])
+        with self.assertNumQueries(1):
+            bugs = list(Ticket.objects.descendants_of(self.epic).filter(ticket_type='bug'))
+        self.assertEqual(bugs, [self.bug])
+
+    def test_reparent_moves_subtree_in_one_update(self):
+        story = Ticket.objects.get(pk=self.story.pk)
+        story.parent = self.other_epic
+        story.save()
+        bug = Ticket.objects.get(pk=self.bug.pk)
+        self.assertEqual(bug.ancestor_ids, [self.other_epic.id, self.story.id])
+        self.assertEqual(list(Ticket.objects.descendants_of(self.epic)), [])
+        self.assertEqual(set(Ticket.objects.descendants_of(self.other_epic)), {story, bug})
+
+        story.parent = None
+        story.save(update_fields=['parent'])
+        bug.refresh_from_db()
+        self.assertEqual((bug.path, bug.depth), (story.lineage, 1))
+
+    def test_cycle_rejected_without_walking_parents(self):
+        # Make the type rules pass so only the cycle check can object
+        Ticket.objects.filter(pk=self.bug.pk).update(ticket_type='ticket')
+        story = Ticket.objects.get(pk=self.story.pk)
+        story.ticket_type = 'bug'
+        story.parent_id = self.bug.id
+        with self.assertNumQueries(1):  # loading the new parent row only
+            with self.assertRaisesMessage(ValidationError, 'Cyclic'):
+                story.clean()
+        with self.assertRaises(ValueError):
+            story.save()
+
+    def test_bulk_writes_keep_paths(self):
+        created = Ticket.objects.bulk_create([Ticket(title='Bulk Bug', board=self.board, ticket_type='bug', parent=self.story)])
+        self.assertEqual(Ticket.objects.get(pk=created[0].pk).ancestor_ids, [self.epic.id, self.story.id])
+        self.story.parent = self.other_epic
+        Ticket.objects.bulk_update([self.story], ['parent'])
+        self.assertEqual(Ticket.objects.get(pk=self.bug.pk).ancestor_ids, [self.other_epic.id, self.story.id])
+        Ticket.objects.filter(pk=self.bug.pk).update(path='', depth=0)
+        self.assertEqual(Ticket.objects.rebuild_paths(), 1)
+        self.assertEqual(Ticket.objects.get(pk=self.bug.pk).depth, 2)
+
+    def test_queryset_update_of_parent_moves_subtree(self):
+        Ticket.objects.filter(pk=self.story.pk).update(parent=self.other_epic)
+        self.assertEqual(Ticket.objects.get(pk=self.bug.pk).ancestor_ids, [self.other_epic.id, self.story.id])
+        old, new = Ticket.objects.get(pk=self.epic.pk), Ticket.objects.get(pk=self.other_epic.pk)
+        self.assertEqual((old.descendant_count, new.descendant_count, new.open_bug_count), (0, 2, 1))
+
+    def test_bulk_reparent_only_repairs_moved_subtrees(self):
+        elsewhere = Board.objects.create(name='Elsewhere')
+        parent = Ticket.objects.create(title='Far Epic', board=elsewhere, ticket_type='epic')
+        child = Ticket.objects.create(title='Far Story', board=elsewhere, parent=parent)
+        # Drift outside the move is left for recompute_rollups to find.
+        Ticket.objects.filter(pk=child.pk).update(path='', depth=0)
+        Ticket.objects.filter(pk=parent.pk).update(descendant_count=7)
+        self.story.parent = self.other_epic
+        Ticket.objects.bulk_update([self.story], ['parent'])
+        self.assertEqual(Ticket.objects.get(pk=self.bug.pk).ancestor_ids, [self.other_epic.id, self.story.id])
+        self.assertEqual(Ticket.objects.get(pk=self.other_epic.pk).descendant_count, 2)
+        self.assertEqual(Ticket.objects.get(pk=child.pk).path, '')
+        self.assertEqual(Ticket.objects.get(pk=parent.pk).descendant_count, 7)
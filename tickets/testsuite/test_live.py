@@ -0,0 +1,112 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient, Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth.models import User
+from tickets.live import InProcessBroker, get_broker
+from tickets.models import Board, Ticket, TicketComment
+
+
+class RecordingBroker(InProcessBroker):
+    def __init__(self):
+        super().__init__()
+        self.published = []
+
+    def wants(self, board_id):
+        return True
+
+    def publish(self, board_id, event):
+        self.published.append((board_id, event))
+
+
+class InProcessBrokerTest(SimpleTestCase):
+    async def test_fan_out_is_scoped_to_board(self):
+        broker = InProcessBroker()
+        first = broker.subscribe(1, timeout=0.05)
+        second = broker.subscribe(1, timeout=0.05)
+        other = broker.subscribe(2, timeout=0.05)
+        # Prime the generators so they register before publishing
+        self.assertIsNone(await first.__anext__())
+        self.assertIsNone(await second.__anext__())
+        self.assertIsNone(await other.__anext__())
+        self.assertEqual(broker.subscriber_count(1), 2)
+
+        broker.publish(1, {'type': 'ticket', 'ticket': {'id': 7}})
+        await asyncio.sleep(0)
+        self.assertEqual((await first.__anext__())['ticket']['id'], 7)
+        self.assertEqual((await second.__anext__())['ticket']['id'], 7)
+        self.assertIsNone(await other.__anext__())
+
+        for stream in (first, second, other):
+            await stream.aclose()
+        self.assertFalse(broker.wants(1))
+
+    async def test_slow_subscriber_is_told_to_resync(self):
+        broker = InProcessBroker()
+        broker.queue_size = 2
+        stream = broker.subscribe(1, timeout=0.05)
+        await stream.__anext__()
+        for i in range(3):
+            broker.publish(1, {'type': 'ticket', 'ticket': {'id': i}})
+        await asyncio.sleep(0)
+        self.assertEqual(await stream.__anext__(), {'type': 'resync'})
+        await stream.aclose()
+
+
+@override_settings(TICKETS_LIVE_BROKER='tickets.testsuite.test_live.RecordingBroker')
+class LiveEventPublishingTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='watcher', password='12345')
+        self.client = Client()
+        self.client.login(username='watcher', password='12345')
+        self.board = Board.objects.create(name='Live Board')
+        self.ticket = Ticket.objects.create(title='Live', board=self.board)
+        self.broker = get_broker()
+        self.broker.published.clear()
+
+    def test_status_change_and_comment_published_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse('tickets:update-ticket-status'),
+                {'ticket_id': self.ticket.id, 'new_status': 'in_progress'},
+                content_type='application/json',
+            )
+            self.assertEqual(self.broker.published, [])
+        moves = [e for b, e in self.broker.published if e['type'] == 'ticket']
+        self.assertEqual(moves[-1]['ticket']['status'], 'in_progress')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TicketComment.objects.create(ticket=self.ticket, user=self.user, body='Looks good')
+        self.assertEqual(self.broker.published[-1], (self.board.id, {'type': 'comment', 'ticket_id': self.ticket.id, 'user': 'watcher'}))
+
+    def test_delete_published(self):
+        ticket_id = self.ticket.id
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ticket.delete()
+        self.assertIn((self.board.id, {'type': 'ticket_deleted', 'ticket_id': ticket_id}), self.broker.published)
+
+
+class BoardEventStreamTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='streamer', password='12345')
+        self.board = Board.objects.create(name='Stream Board')
+        self.url = reverse('tickets:board-events', args=[self.board.id])
+
+    def test_wsgi_requests_are_told_to_poll(self):
+        client = Client()
+        client.force_login(self.user)
+        response = client.get(self.url)
+        self.assertEqual(response.status_code, 501)
+
+    async def test_stream_opens_with_hello(self):
+        client = AsyncClient()
+        await sync_to_async(client.force_login)(self.user)
+        response = await client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = response.streaming_content
+        self.assertEqual(await stream.__anext__(), b'retry: 3000\n\n')
+        hello = await stream.__anext__()
+        self.assertIn(b'event: hello', hello)
+        await stream.aclose()
@@ -0,0 +1,53 @@
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from tickets.models import Board, Ticket
+
+
+class MatrixApiTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='gridder', password='pass123')
+        self.client = Client()
+        self.client.login(username='gridder', password='pass123')
+        self.board = Board.objects.create(name='Grid Board')
+        for i in range(3):
+            Ticket.objects.create(title=f'Hot {i}', board=self.board, importance=10, urgency=10, sort_order=i)
+        Ticket.objects.create(title='Hot done', board=self.board, importance=10, urgency=10, status='done')
+        Ticket.objects.create(title='Cold bug', board=self.board, importance=1, urgency=1, ticket_type='bug')
+        Ticket.objects.create(title='Elsewhere', board=Board.objects.create(name='Other'), importance=10, urgency=10)
+        self.url = reverse('tickets:board-matrix', args=[self.board.id])
+
+    def _cell(self, data, importance, urgency):
+        return next(c for c in data['cells'] if c['importance'] == importance and c['urgency'] == urgency)
+
+    def test_counts_cover_full_grid_top_right_first(self):
+        data = self.client.get(self.url).json()
+        self.assertEqual(len(data['cells']), 100)
+        self.assertEqual((data['cells'][0]['importance'], data['cells'][0]['urgency']), (10, 1))
+        self.assertEqual(self._cell(data, 10, 10)['count'], 4)
+        self.assertEqual(self._cell(data, 1, 1)['count'], 1)
+        self.assertEqual(self._cell(data, 5, 5)['count'], 0)
+        self.assertEqual(data['total'], 5)
+        self.assertNotIn('tickets', data['cells'][0])
+
+    def test_filters_and_top_k_in_constant_queries(self):
+        data = self.client.get(self.url, {'status': 'todo', 'type': 'ticket'}).json()
+        self.assertEqual(self._cell(data, 10, 10)['count'], 3)
+        self.assertEqual(self._cell(data, 1, 1)['count'], 0)
+
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.client.get(self.url, {'top': 2}).json()
+        hot = self._cell(data, 10, 10)
+        self.assertEqual([t['title'] for t in hot['tickets']], ['Hot 0', 'Hot done'])
+        self.assertEqual(hot['count'], 4)
+        ticket_queries = [q for q in ctx.captured_queries if 'tickets_ticket' in q['sql']]
+        self.assertEqual(len(ticket_queries), 2)
+
+    def test_invalid_input_rejected(self):
+        self.assertEqual(self.client.get(self.url, {'status': 'archived'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'type': 'story'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'top': 'lots'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'top': 500}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('tickets:board-matrix', args=[999])).status_code, 404)
@@ -1,4 +1,6 @@
-from django.test import TestCase, Client
+from django.contrib.admin.sites import site
+from django.test import TestCase, Client, RequestFactory
+from django.db.models import F
 from django.urls import reverse
 from django.contrib.auth.models import User
 from tickets.models import Board, Ticket
@@ -29,4 +31,63 @@ class PriorityScoreTest(TestCase):
         t = Ticket.objects.get(title='Score Ticket')
         self.assertEqual(t.importance, 4)
         self.assertEqual(t.urgency, 7)
-        self.assertEqual(t.importance * t.urgency, 28)
\ No newline at end of file
+        self.assertEqual(t.importance * t.urgency, 28)
+        self.assertEqual(t.priority_score, 28)
+
+class StoredPriorityScoreTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(username='scorer', password='pass123')
+        self.client = Client()
+        self.client.login(username='scorer', password='pass123')
+        self.board = Board.objects.create(name='Score Board')
+
+    def _score(self, ticket):
+        return Ticket.objects.values_list('priority_score', flat=True).get(pk=ticket.pk)
+
+    def test_score_follows_save_update_and_bulk_writes(self):
+        ticket = Ticket.objects.create(title='T', board=self.board, importance=3, urgency=4)
+        self.assertEqual(self._score(ticket), 12)
+
+        ticket.importance = 5
+        ticket.save(update_fields=['importance'])
+        self.assertEqual(self._score(ticket), 20)
+
+        # SET clauses see the old row: the score must use the new urgency
+        Ticket.objects.filter(pk=ticket.pk).update(urgency=10)
+        self.assertEqual(self._score(ticket), 50)
+        Ticket.objects.filter(pk=ticket.pk).update(importance=F('importance') - 1, urgency=2)
+        self.assertEqual(self._score(ticket), 8)
+
+        ticket.refresh_from_db()
+        ticket.urgency = 9
+        Ticket.objects.bulk_update([ticket], ['urgency'])
+        self.assertEqual(self._score(ticket), 36)
+
+        created = Ticket.objects.bulk_create([Ticket(title='B', board=self.board, importance=7, urgency=7)])
+        self.assertEqual(self._score(created[0]), 49)
+
+    def test_column_api_orders_by_priority_with_keyset_cursor(self):
+        for i, (imp, urg) in enumerate([(1, 1), (10, 10), (5, 5), (5, 5), (2, 3)]):
+            Ticket.objects.create(title=f'T{i}', board=self.board, importance=imp, urgency=urg, sort_order=i)
+        url = reverse('tickets:board-column', args=[self.board.id, 'todo'])
+        seen = []
+        cursor = ''
+        while True:
+            data = self.client.get(url, {'order': 'priority', 'limit': 2, 'cursor': cursor}).json()
+            seen += [(t['priority_score'], t['title']) for t in data['tickets']]
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(seen, [(100, 'T1'), (25, 'T2'), (25, 'T3'), (6, 'T4'), (1, 'T0')])
+        self.assertEqual(self.client.get(url, {'order': 'bogus'}).status_code, 400)
+
+    def test_admin_sorts_on_stored_column(self):
+        admin = site._registry[Ticket]
+        self.assertIn('priority_score', admin.get_sortable_by(None))
+        Ticket.objects.create(title='Low', board=self.board, importance=1, urgency=2)
+        Ticket.objects.create(title='High', board=self.board, importance=9, urgency=9)
+        index = admin.list_display.index('priority_score')
+        request = RequestFactory().get('/admin/tickets/ticket/', {'o': f'-{index + 1}'})
+        request.user = self.user
+        changelist = admin.get_changelist_instance(request)
+        self.assertEqual([t.title for t in changelist.get_queryset(request)][:2], ['High', 'Low'])
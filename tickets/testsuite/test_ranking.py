@@ -0,0 +1,87 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from tickets.models import Board, Ticket
+from tickets.ranking import RANK_GAP, RankingError, rank_between, rank_for_drop, rebalance_column
+
+
+def column(board, status='todo'):
+    return list(Ticket.objects.filter(board=board, status=status).order_by('sort_order', 'id').values_list('title', flat=True))
+
+
+class RankBetweenTest(TestCase):
+    def test_midpoints_and_edges(self):
+        self.assertEqual(rank_between(None, None), RANK_GAP)
+        self.assertEqual(rank_between(RANK_GAP, None), 2 * RANK_GAP)
+        self.assertEqual(rank_between(None, RANK_GAP), 0)
+        self.assertEqual(rank_between(10, 20), 15)
+        self.assertIsNone(rank_between(10, 11))
+        self.assertIsNone(rank_between(10, 10))
+
+
+class DropRankingTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='ranker', password='12345')
+        self.client = Client()
+        self.client.login(username='ranker', password='12345')
+        self.board = Board.objects.create(name='Ranked')
+        self.a = Ticket.objects.create(title='A', board=self.board, sort_order=RANK_GAP)
+        self.b = Ticket.objects.create(title='B', board=self.board, sort_order=2 * RANK_GAP)
+        self.c = Ticket.objects.create(title='C', board=self.board, sort_order=3 * RANK_GAP)
+        self.url = reverse('tickets:update-ticket-status')
+
+    def _drop(self, ticket, status='todo', **neighbours):
+        payload = {'ticket_id': ticket.id, 'new_status': status, **neighbours}
+        return self.client.post(self.url, payload, content_type='application/json').json()
+
+    def test_drop_between_neighbours_writes_only_the_moved_row(self):
+        with CaptureQueriesContext(connection) as ctx:
+            data = self._drop(self.c, before_id=self.a.id, after_id=self.b.id)
+        self.assertTrue(data['success'])
+        self.assertEqual(column(self.board), ['A', 'C', 'B'])
+        ticket_writes = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE "tickets_ticket"')]
+        self.assertEqual(len(ticket_writes), 1)
+        self.assertIn('WHERE "tickets_ticket"."id" = %s' % self.c.id, ticket_writes[0])
+
+    def test_drop_into_other_column_with_single_neighbour(self):
+        done = Ticket.objects.create(title='D', board=self.board, status='done', sort_order=RANK_GAP)
+        self._drop(self.a, status='done', after_id=done.id)
+        self.assertEqual(column(self.board, 'done'), ['A', 'D'])
+        # Only the card above known: the hidden card below is looked up, not overtaken
+        self._drop(self.b, status='done', before_id=self.a.id)
+        self.assertEqual(column(self.board, 'done'), ['A', 'B', 'D'])
+
+    def test_exhausted_gap_triggers_rebalance(self):
+        Ticket.objects.filter(pk=self.a.pk).update(sort_order=5)
+        Ticket.objects.filter(pk=self.b.pk).update(sort_order=6)
+        data = self._drop(self.c, before_id=self.a.id, after_id=self.b.id)
+        self.assertTrue(data['success'])
+        self.assertEqual(column(self.board), ['A', 'C', 'B'])
+        ranks = list(Ticket.objects.filter(board=self.board).order_by('sort_order').values_list('sort_order', flat=True))
+        self.assertTrue(all(b - a > 1 for a, b in zip(ranks, ranks[1:])))
+
+    def test_neighbours_must_be_in_target_column(self):
+        with self.assertRaises(RankingError):
+            rank_for_drop(self.board.id, 'done', before_id=self.a.id)
+        data = self._drop(self.c, status='done', before_id=self.a.id)
+        self.assertFalse(data['success'])
+
+    def test_rebalance_command(self):
+        Ticket.objects.filter(board=self.board).update(sort_order=0)
+        out = StringIO()
+        call_command('rebalance_ranks', board=self.board.id, stdout=out)
+        self.assertIn('Rebalanced 1 column(s)', out.getvalue())
+        ranks = list(Ticket.objects.filter(board=self.board).order_by('sort_order').values_list('sort_order', flat=True))
+        self.assertEqual(ranks, [RANK_GAP, 2 * RANK_GAP, 3 * RANK_GAP])
+
+    def test_rebalance_advances_board_version(self):
+        before = Board.objects.get(pk=self.board.pk).version
+        self.assertEqual(rebalance_column(self.board.id, 'todo'), 3)
+        board = Board.objects.get(pk=self.board.pk)
+        self.assertGreater(board.version, before)
+        self.assertEqual(set(Ticket.objects.filter(board=self.board).values_list('change_seq', flat=True)), {board.version})
@@ -0,0 +1,97 @@
+import gzip
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from tickets.models import Board, Ticket, TicketActivity, TicketActivitySummary
+from tickets.retention import archive_activities, restore_activities
+
+
+class ActivityRetentionTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='keeper', password='pass123')
+        self.board = Board.objects.create(name='Retained')
+        self.ticket = Ticket.objects.create(title='Old', board=self.board)
+        self.dir = tempfile.mkdtemp()
+        old = timezone.now() - timedelta(days=200)
+        self.old = [
+            TicketActivity.objects.create(ticket=self.ticket, user=self.user, activity_type='updated',
+                                          description=f'edit {i}', timestamp=old + timedelta(minutes=i))
+            for i in range(5)
+        ]
+        self.recent = TicketActivity.objects.create(ticket=self.ticket, user=self.user, activity_type='updated', description='recent')
+        self.cutoff = timezone.now() - timedelta(days=90)
+
+    def test_archive_moves_old_rows_to_a_compressed_file(self):
+        path, count = archive_activities(self.cutoff, directory=self.dir, chunk_size=2)
+        self.assertEqual(count, 5)
+        self.assertEqual(list(TicketActivity.objects.values_list('id', flat=True)), [self.recent.id])
+        with gzip.open(path, 'rt') as archive:
+            rows = [json.loads(line) for line in archive]
+        self.assertEqual([row['id'] for row in rows], [a.id for a in self.old])
+        self.assertEqual(rows[0]['board_id'], self.board.id)
+
+    def test_archive_keeps_daily_summaries(self):
+        archive_activities(self.cutoff, directory=self.dir, chunk_size=2)
+        summary = TicketActivitySummary.objects.get()
+        self.assertEqual((summary.ticket_id, summary.board_id, summary.activity_type), (self.ticket.id, self.board.id, 'updated'))
+        self.assertEqual(summary.count, 5)
+        self.assertEqual(summary.first_at, self.old[0].timestamp)
+        self.assertEqual(summary.last_at, self.old[-1].timestamp)
+
+    def test_archive_and_restore_bump_each_board_once(self):
+        version = Board.objects.get(pk=self.board.pk).version
+        path, _ = archive_activities(self.cutoff, directory=self.dir, chunk_size=2)
+        self.assertEqual(Board.objects.get(pk=self.board.pk).version, version + 1)
+        restore_activities(path, chunk_size=2)
+        self.assertEqual(Board.objects.get(pk=self.board.pk).version, version + 2)
+
+    def test_board_etag_changes_after_archive(self):
+        self.client.login(username='keeper', password='pass123')
+        url = reverse('tickets:board-view', args=[self.board.id])
+        etag = self.client.get(url)['ETag']
+        archive_activities(self.cutoff, directory=self.dir)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '5 updated')
+
+    def test_nothing_to_archive(self):
+        path, count = archive_activities(timezone.now() - timedelta(days=1000), directory=self.dir)
+        self.assertEqual((path, count), (None, 0))
+
+    def test_restore_brings_rows_back_and_reverses_summaries(self):
+        path, _ = archive_activities(self.cutoff, directory=self.dir, chunk_size=2)
+        self.assertEqual(restore_activities(path, chunk_size=2), 5)
+        self.assertEqual(TicketActivity.objects.count(), 6)
+        restored = TicketActivity.objects.get(pk=self.old[2].pk)
+        self.assertEqual((restored.description, restored.timestamp, restored.ticket_id), ('edit 2', self.old[2].timestamp, self.ticket.id))
+        self.assertFalse(TicketActivitySummary.objects.exists())
+        # Restoring twice is a no-op
+        self.assertEqual(restore_activities(path), 0)
+
+    def test_commands(self):
+        out = StringIO()
+        call_command('archive_activity', '--days', '90', '--dir', self.dir, stdout=out)
+        self.assertIn('Archived 5 activity row(s)', out.getvalue())
+        path = out.getvalue().rsplit(' to ', 1)[1].strip()
+        out = StringIO()
+        call_command('restore_activity', path, stdout=out)
+        self.assertIn('Restored 5 activity row(s)', out.getvalue())
+
+    def test_board_view_after_archive(self):
+        archive_activities(self.cutoff, directory=self.dir)
+        self.client.login(username='keeper', password='pass123')
+        response = self.client.get(reverse('tickets:board-view', args=[self.board.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([a.id for a in response.context['recent_activity']], [self.recent.id])
+        self.assertEqual([(s.count, s.ticket_id) for s in response.context['archived_activity']], [(5, self.ticket.id)])
+        self.assertContains(response, '5 updated')
+        response = self.client.get(reverse('tickets:ticket-edit', args=[self.ticket.id]))
+        self.assertEqual([s.count for s in response.context['archived_activity']], [5])
+        self.assertContains(response, 'Archived activity')
@@ -0,0 +1,71 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from tickets.models import ROLLUP_FIELDS, Board, Ticket
+
+
+def rollups(ticket):
+    return Ticket.objects.values_list(*ROLLUP_FIELDS).get(pk=ticket.pk)
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name='Rollup Board')
+        self.epic = Ticket.objects.create(title='Epic', board=self.board, ticket_type='epic')
+        self.story = Ticket.objects.create(title='Story', board=self.board, parent=self.epic, importance=2, urgency=3)
+        self.bug = Ticket.objects.create(title='Bug', board=self.board, ticket_type='bug', parent=self.story, importance=4, urgency=5)
+
+    def test_create_adds_to_every_ancestor(self):
+        # (descendants, done, open bugs, score sum)
+        self.assertEqual(rollups(self.epic), (2, 0, 1, 26))
+        self.assertEqual(rollups(self.story), (1, 0, 1, 20))
+        self.assertEqual(rollups(self.bug), (0, 0, 0, 0))
+
+    def test_status_and_score_changes_are_incremental(self):
+        bug = Ticket.objects.get(pk=self.bug.pk)
+        bug.status = 'done'
+        bug.urgency = 1
+        bug.save()
+        self.assertEqual(rollups(self.epic), (2, 1, 0, 10))
+        self.assertEqual(rollups(self.story), (1, 1, 0, 4))
+        # A full save of a stale ancestor copy must not clobber the rollups
+        self.epic.title = 'Renamed'
+        self.epic.save()
+        self.assertEqual(rollups(self.epic), (2, 1, 0, 10))
+
+    def test_queryset_and_bulk_writes(self):
+        Ticket.objects.filter(pk=self.bug.pk).update(status='done')
+        self.assertEqual(rollups(self.epic), (2, 1, 0, 26))
+        bug = Ticket.objects.get(pk=self.bug.pk)
+        bug.status = 'todo'
+        Ticket.objects.bulk_update([bug], ['status'])
+        self.assertEqual(rollups(self.epic), (2, 0, 1, 26))
+        Ticket.objects.bulk_create([Ticket(title='Bulk bug', board=self.board, ticket_type='bug', parent=self.story)])
+        self.assertEqual(rollups(self.epic), (3, 0, 2, 27))
+
+    def test_reparent_moves_subtree_totals(self):
+        other = Ticket.objects.create(title='Other Epic', board=self.board, ticket_type='epic')
+        story = Ticket.objects.get(pk=self.story.pk)
+        story.parent = other
+        story.save()
+        self.assertEqual(rollups(self.epic), (0, 0, 0, 0))
+        self.assertEqual(rollups(other), (2, 0, 1, 26))
+
+    def test_delete_refreshes_surviving_ancestors(self):
+        Ticket.objects.get(pk=self.bug.pk).delete()
+        self.assertEqual(rollups(self.epic), (1, 0, 0, 6))
+        Ticket.objects.create(title='Bug 2', board=self.board, ticket_type='bug', parent=self.story)
+        Ticket.objects.get(pk=self.story.pk).delete()  # cascades to its bug
+        self.assertEqual(rollups(self.epic), (0, 0, 0, 0))
+
+    def test_command_verifies_and_repairs(self):
+        call_command('recompute_rollups', check=True, stdout=StringIO())
+        Ticket.objects.filter(pk=self.epic.pk).update(descendant_count=99)
+        with self.assertRaisesMessage(CommandError, '1 ticket(s) have drifted'):
+            call_command('recompute_rollups', check=True, stdout=StringIO())
+        out = StringIO()
+        call_command('recompute_rollups', board=self.board.id, stdout=out)
+        self.assertIn('fixed 1 ticket(s)', out.getvalue())
+        self.assertEqual(rollups(self.epic), (2, 0, 1, 26))
@@ -0,0 +1,78 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from tickets.models import Board, Ticket, TicketComment
+from tickets.search import SEARCH_TABLE, FallbackSearchBackend, search_ticket_ids, ticket_search_filter
+
+
+class TicketSearchTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(username='finder', password='pass123', email='f@example.com')
+        self.client = Client()
+        self.client.login(username='finder', password='pass123')
+        self.board = Board.objects.create(name='Search Board')
+        self.other_board = Board.objects.create(name='Other Board')
+        self.login = Ticket.objects.create(title='Login page crashes', description='Stack trace attached', board=self.board)
+        self.docs = Ticket.objects.create(title='Write docs', description='Mention the login flow', board=self.board)
+        self.elsewhere = Ticket.objects.create(title='Login audit', board=self.other_board)
+
+    def test_ranked_and_board_scoped(self):
+        # Title matches outrank description matches
+        self.assertEqual(search_ticket_ids('login', board_id=self.board.id), [self.login.id, self.docs.id])
+        self.assertEqual(set(search_ticket_ids('login')), {self.login.id, self.docs.id, self.elsewhere.id})
+        self.assertEqual(search_ticket_ids('crash'), [self.login.id])  # stemmed / prefix
+        self.assertEqual(search_ticket_ids('login trace'), [self.login.id])
+        self.assertEqual(search_ticket_ids('"OR" NOT *'), [])
+
+    def test_index_follows_writes(self):
+        self.docs.title = 'Publish handbook'
+        self.docs.description = ''
+        self.docs.save()
+        self.assertEqual(set(search_ticket_ids('login')), {self.login.id, self.elsewhere.id})
+        TicketComment.objects.create(ticket=self.docs, user=self.user, body='Blocked on the handbook login screenshots')
+        self.assertIn(self.docs.id, search_ticket_ids('screenshots'))
+        Ticket.objects.filter(pk=self.login.pk).update(title='Signin page crashes')
+        self.assertEqual(search_ticket_ids('signin'), [self.login.id])
+        self.docs.comments.all().delete()
+        self.assertEqual(search_ticket_ids('screenshots'), [])
+        self.elsewhere.delete()
+        self.assertEqual(search_ticket_ids('audit'), [])
+
+    def test_non_search_saves_skip_reindexing(self):
+        ticket = Ticket.objects.get(pk=self.login.pk)
+        ticket.status = 'done'
+        with CaptureQueriesContext(connection) as ctx:
+            ticket.save()
+        self.assertFalse([q for q in ctx.captured_queries if SEARCH_TABLE in q['sql']])
+
+    def test_reindex_command(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        self.assertEqual(search_ticket_ids('login'), [])
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+        self.assertIn('Indexed 3 ticket(s)', out.getvalue())
+        self.assertEqual(len(search_ticket_ids('login')), 3)
+
+    def test_board_search_api_and_admin(self):
+        url = reverse('tickets:board-search', args=[self.board.id])
+        data = self.client.get(url, {'q': 'login'}).json()
+        self.assertEqual([t['id'] for t in data['tickets']], [self.login.id, self.docs.id])
+        self.assertEqual(self.client.get(url, {'q': '  '}).status_code, 400)
+        response = self.client.get(reverse('admin:tickets_ticket_changelist'), {'q': 'trace'})
+        self.assertEqual([t.id for t in response.context['cl'].result_list], [self.login.id])
+
+    def test_filter_is_a_subquery(self):
+        tickets = Ticket.objects.filter(ticket_search_filter('login'))
+        with CaptureQueriesContext(connection) as ctx:
+            ids = set(tickets.values_list('id', flat=True))
+        self.assertEqual(ids, {self.login.id, self.docs.id, self.elsewhere.id})
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertIn(SEARCH_TABLE, ctx.captured_queries[0]['sql'])
+        fallback = FallbackSearchBackend(connection).matches('login trace')
+        self.assertEqual(list(Ticket.objects.filter(fallback).values_list('id', flat=True)), [self.login.id])
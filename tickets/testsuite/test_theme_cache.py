@@ -0,0 +1,96 @@
+import json
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from tickets.context_processors import active_theme
+from tickets.models import Board
+from tickets.models_theme import ThemePreference, UserTheme
+
+
+def theme_queries(ctx):
+    return [q['sql'] for q in ctx.captured_queries if 'tickets_usertheme' in q['sql'] or 'tickets_themepreference' in q['sql']]
+
+
+class ThemeCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='painter', password='pass123')
+        self.other = User.objects.create_user(username='sharer', password='pass123')
+        self.client.login(username='painter', password='pass123')
+        self.board = Board.objects.create(name='Themed')
+        self.own = UserTheme.objects.create(user=self.user, name='Mine', colors={'primary_color': '#111111'})
+        self.shared = UserTheme.objects.create(user=self.other, name='Shared', colors={'primary': '#222222'}, is_public=True)
+        self.url = reverse('tickets:board-view', args=[self.board.id])
+
+    def _board(self):
+        return self.client.get(self.url)
+
+    def _page_css(self, response):
+        return self.client.get(response.context['global_theme_css_url']).content.decode()
+
+    def test_board_page_only_stamps_the_theme_once_cached(self):
+        self._board()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self._board()
+        self.assertEqual(response.status_code, 200)
+        # The key's stamp: one aggregate, shared by the ETag, view and context processor
+        self.assertEqual(len(theme_queries(ctx)), 1)
+        self.assertIn('COUNT(DISTINCT', theme_queries(ctx)[0])
+        self.assertEqual(response.context['user_theme']['id'], self.own.id)
+        self.assertIsNone(response.context['active_public_theme'])
+
+    def test_first_load_resolves_once_per_request(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self._board()
+        # stamp, then preference + own themes, shared by the ETag, view and context processor
+        self.assertEqual(len(theme_queries(ctx)), 3)
+
+    def test_page_css_uses_normalized_colors(self):
+        response = self._board()
+        self.assertEqual(response.context['global_active_theme_id'], self.own.id)
+        css = self._page_css(response)
+        self.assertIn('--primary-color: #111111;', css)
+        self.assertIn('--info-color: #8bb4fe;', css)
+
+    def test_preference_change_invalidates(self):
+        self._board()
+        self.client.post(reverse('tickets:set_theme_preference'), data=json.dumps({'theme_id': self.shared.id}), content_type='application/json')
+        response = self._board()
+        self.assertEqual(response.context['user_theme']['id'], self.shared.id)
+        self.assertEqual(response.context['active_public_theme']['id'], self.shared.id)
+        self.assertIn('--primary-color: #222222;', self._page_css(response))
+
+    def test_followed_theme_edit_invalidates_followers(self):
+        ThemePreference.objects.create(user=self.user, theme=self.shared)
+        self._board()
+        self.shared.colors = {'primary': '#333333'}
+        self.shared.save()
+        self.assertIn('--primary-color: #333333;', self._page_css(self._board()))
+
+    def test_deleting_active_theme_falls_back(self):
+        ThemePreference.objects.create(user=self.user, theme=self.shared)
+        self._board()
+        self.shared.delete()
+        response = self._board()
+        self.assertEqual(response.context['user_theme']['id'], self.own.id)
+        self.assertIsNone(response.context['active_public_theme'])
+
+    def test_anonymous_requests_get_default_css(self):
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        context = active_theme(request)
+        self.assertIsNone(context['global_active_theme_id'])
+        self.client.logout()
+        self.assertIn('--primary-color: #bb86fc;', self.client.get(context['global_theme_css_url']).content.decode())
+
+    def test_entries_follow_writes_from_other_workers(self):
+        self._board()
+        # Another worker's write: no invalidation reaches this process's cache
+        UserTheme.objects.filter(pk=self.own.pk).update(name='Renamed', updated_at=timezone.now())
+        response = self._board()
+        self.assertEqual(response.context['user_theme']['name'], 'Renamed')
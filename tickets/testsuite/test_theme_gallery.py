@@ -0,0 +1,109 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from tickets.models_theme import ThemePreference, UserTheme
+
+
+class ThemeGalleryTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='browser', password='pass123')
+        self.client.login(username='browser', password='pass123')
+        owner = User.objects.create_user(username='maker', password='pass123')
+        self.themes = {
+            name: UserTheme.objects.create(user=owner, name=name, colors={'primary': '#123456'}, is_public=True)
+            for name in ('Dusk', 'Aurora', 'Moss', 'Coral')
+        }
+        UserTheme.objects.create(user=owner, name='Private', colors={}, is_public=False)
+        for i, name in enumerate(('Moss', 'Moss', 'Coral')):
+            fan = User.objects.create_user(username=f'fan{i}', password='pass123')
+            ThemePreference.objects.create(user=fan, theme=self.themes[name])
+        self.url = reverse('tickets:public-themes')
+
+    def _get(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def _names(self, **params):
+        return [t['name'] for t in self._get(**params)['results']]
+
+    def test_popular_order_follows_preferences(self):
+        self.assertEqual(self._names(), ['Moss', 'Coral', 'Dusk', 'Aurora'])
+        self.assertEqual(UserTheme.objects.get(pk=self.themes['Moss'].pk).preference_count, 2)
+
+    def test_preference_count_follows_switches_and_deletes(self):
+        pref = ThemePreference.objects.get(user__username='fan2')
+        pref.theme = self.themes['Aurora']
+        pref.save()
+        self.assertEqual(UserTheme.objects.get(pk=self.themes['Coral'].pk).preference_count, 0)
+        self.assertEqual(UserTheme.objects.get(pk=self.themes['Aurora'].pk).preference_count, 1)
+        pref.delete()
+        self.assertEqual(UserTheme.objects.get(pk=self.themes['Aurora'].pk).preference_count, 0)
+
+    def test_theme_save_keeps_preference_count(self):
+        theme = UserTheme.objects.get(pk=self.themes['Moss'].pk)
+        ThemePreference.objects.create(user=self.user, theme=theme)
+        theme.name = 'Moss 2'
+        theme.save()
+        self.assertEqual(UserTheme.objects.get(pk=theme.pk).preference_count, 3)
+
+    def test_name_order_and_search(self):
+        self.assertEqual(self._names(order='name'), ['Aurora', 'Coral', 'Dusk', 'Moss'])
+        self.assertEqual(self._names(q='us'), ['Dusk'])
+        self.assertNotIn('Private', self._names(q='Priv'))
+
+    def test_cursor_pages_cover_every_theme_once(self):
+        for order in ('popular', 'name'):
+            names, cursor = [], None
+            while True:
+                params = {'order': order, 'limit': 3}
+                if cursor:
+                    params['cursor'] = cursor
+                page = self._get(**params)
+                names += [t['name'] for t in page['results']]
+                cursor = page['next_cursor']
+                if not cursor:
+                    break
+            self.assertEqual(sorted(names), ['Aurora', 'Coral', 'Dusk', 'Moss'])
+
+    def test_results_include_stylesheet_url(self):
+        first = self._get(limit=1)['results'][0]
+        self.assertEqual(first['owner'], 'maker')
+        self.assertEqual(self.client.get(first['css_url']).status_code, 200)
+
+    def test_pages_are_cached_until_a_write(self):
+        self._get()
+        with CaptureQueriesContext(connection) as ctx:
+            self._get()
+        # Only the version token's two aggregates, shared by the ETag and the page
+        theme_queries = [q['sql'] for q in ctx.captured_queries if 'theme' in q['sql']]
+        self.assertEqual(len(theme_queries), 2)
+        self.assertTrue(all('COUNT(' in sql for sql in theme_queries))
+        self.themes['Dusk'].name = 'Nightfall'
+        self.themes['Dusk'].save()
+        self.assertIn('Nightfall', self._names())
+
+    def test_version_follows_writes_from_other_workers(self):
+        self._get()
+        # No signal or cache delete reaches this process for a write made elsewhere
+        UserTheme.objects.filter(pk=self.themes['Aurora'].pk).update(name='Borealis', updated_at=timezone.now())
+        self.assertIn('Borealis', self._names())
+
+    def test_etag_revalidates(self):
+        etag = self.client.get(self.url).headers['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.client.post(reverse('tickets:set_theme_preference'), data=json.dumps({'theme_id': self.themes['Dusk'].id}), content_type='application/json')
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_bad_parameters(self):
+        for params in ({'order': 'newest'}, {'cursor': 'not-a-cursor'}, {'limit': '0'}, {'limit': 'x'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertFalse(response.json()['success'])
@@ -15,13 +15,20 @@ class ThemePreferenceTests(TestCase):
         self.user_theme = UserTheme.objects.create(user=self.user, name='Alice Dark', colors={'primary':'#000','text':'#fff'}, is_public=False)
         self.public_other_theme = UserTheme.objects.create(user=self.other, name='Bob Public', colors={'primary':'#111','text':'#eee'}, is_public=True)
 
-    def test_get_themes_lists_user_and_public(self):
+    def test_get_themes_lists_own_and_gallery_lists_public(self):
         url = reverse('tickets:get_themes')
         resp = self.client.get(url)
         self.assertEqual(resp.status_code, 200)
         data = resp.json()
         self.assertTrue(any(t['name']==self.user_theme.name for t in data['user_themes']))
-        self.assertTrue(any(t['name']==self.public_other_theme.name for t in data['public_themes']))
+        self.assertNotIn('public_themes', data)
+        etag = resp['ETag']
+        # Someone else's theme edit doesn't touch this user's list
+        self.public_other_theme.name = 'Bob Renamed'
+        self.public_other_theme.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        gallery = self.client.get(reverse('tickets:public-themes')).json()
+        self.assertEqual([t['name'] for t in gallery['results']], ['Bob Renamed'])
 
     def test_get_single_theme(self):
         url = reverse('tickets:get_single_theme', args=[self.user_theme.id])
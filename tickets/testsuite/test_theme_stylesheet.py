@@ -0,0 +1,57 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from tickets.models import Board
+from tickets.models_theme import UserTheme
+from tickets.themes import DEFAULT_THEME_CSS_HASH, compile_theme_css
+
+
+class ThemeStylesheetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='stylist', password='pass123')
+        self.client.login(username='stylist', password='pass123')
+        self.theme = UserTheme.objects.create(user=self.user, name='Ocean', colors={'primary': '#0077be', 'text': '#ffffff'})
+
+    def test_theme_is_compiled_on_save(self):
+        css_hash, css = compile_theme_css({'primary': '#0077be', 'text': '#ffffff'})
+        self.assertEqual((self.theme.css_hash, self.theme.compiled_css), (css_hash, css))
+        self.assertIn('--primary-color: #0077be;', css)
+
+    def test_save_theme_changes_hash(self):
+        old_hash = self.theme.css_hash
+        response = self.client.post(reverse('tickets:save_theme'), data=json.dumps({'theme_id': self.theme.id, 'colors': {'primary': '#123456'}}), content_type='application/json')
+        self.theme.refresh_from_db()
+        self.assertNotEqual(self.theme.css_hash, old_hash)
+        self.assertEqual(response.json()['css_url'], reverse('tickets:theme-css', args=[self.theme.css_hash]))
+
+    def test_stylesheet_is_immutable(self):
+        response = self.client.get(reverse('tickets:theme-css', args=[self.theme.css_hash]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/css; charset=utf-8')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(response.content.decode(), self.theme.compiled_css)
+
+    def test_default_and_unknown_hashes(self):
+        self.assertEqual(self.client.get(reverse('tickets:theme-css', args=[DEFAULT_THEME_CSS_HASH])).status_code, 200)
+        self.assertEqual(self.client.get(reverse('tickets:theme-css', args=['0' * 32])).status_code, 404)
+
+    def test_pages_link_instead_of_inlining(self):
+        board = Board.objects.create(name='Styled')
+        response = self.client.get(reverse('tickets:board-view', args=[board.id]))
+        self.assertContains(response, f'href="{reverse("tickets:theme-css", args=[self.theme.css_hash])}"')
+        self.assertNotContains(response, '--primary-color: #0077be')
+
+    def test_preference_switch_returns_new_url(self):
+        other = UserTheme.objects.create(user=self.user, name='Forest', colors={'primary': '#228b22'})
+        response = self.client.post(reverse('tickets:set_theme_preference'), data=json.dumps({'theme_id': other.id}), content_type='application/json')
+        self.assertEqual(response.json()['css_url'], reverse('tickets:theme-css', args=[other.css_hash]))
+
+    def test_unsafe_values_fall_back_to_defaults(self):
+        _, css = compile_theme_css({'primary': 'red;} body { display: none', 'text': 'rgb(1, 2, 3)'})
+        self.assertIn('--primary-color: #bb86fc;', css)
+        self.assertIn('--text-color: rgb(1, 2, 3);', css)
+        self.assertNotIn('display', css)
@@ -0,0 +1,128 @@
+import io
+import json
+import os
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+from tickets.importer import TicketImportError, import_tickets
+from tickets.models import Board, Ticket, TicketActivity
+from tickets.search import search_ticket_ids
+
+CSV = '''key,title,type,status,importance,urgency,assignee,parent,related
+E-1,Platform epic,epic,todo,5,5,,,
+T-1,Login flow,ticket,in_progress,4,3,importer,E-1,T-2
+B-1,Crash on submit,bug,todo,2,2,,T-1,
+T-2,Signup flow,ticket,done,1,1,,E-1,"T-1, B-1"
+'''
+
+
+def jsonl(*rows):
+    return ''.join(json.dumps(row) + '\n' for row in rows)
+
+
+class TicketImportTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='importer', password='pass123')
+        self.board = Board.objects.create(name='Imported')
+
+    def _import(self, text, fmt='csv', **kwargs):
+        return import_tickets(self.board, io.StringIO(text), fmt, user=self.user, **kwargs)
+
+    def test_csv_import_resolves_hierarchy_and_links(self):
+        result = self._import(CSV, chunk_size=2)
+        self.assertEqual((result.rows, result.created, result.parented, result.related), (4, 4, 3, 3))
+        tickets = {t.title: t for t in Ticket.objects.filter(board=self.board)}
+        epic, login, bug, signup = (tickets[t] for t in ('Platform epic', 'Login flow', 'Crash on submit', 'Signup flow'))
+        self.assertEqual(bug.parent_id, login.id)
+        self.assertEqual(bug.ancestor_ids, [epic.id, login.id])
+        self.assertEqual(login.assignee, self.user)
+        self.assertEqual(login.priority_score, 12)
+        self.assertEqual(set(signup.related_tickets.values_list('id', flat=True)), {login.id, bug.id})
+        self.assertEqual((epic.descendant_count, epic.descendant_done_count, epic.open_bug_count), (3, 1, 1))
+        self.assertEqual(Ticket.objects.recompute_rollups(commit=False), [])
+        self.assertEqual(TicketActivity.objects.filter(activity_type='created').count(), 4)
+        self.assertEqual(search_ticket_ids('crash', board_id=self.board.id), [bug.id])
+
+    def test_one_board_version_for_the_whole_import(self):
+        self._import(CSV)
+        board = Board.objects.get(pk=self.board.pk)
+        self.assertEqual(board.version, 1)
+        self.assertEqual(set(Ticket.objects.values_list('change_seq', flat=True)), {1})
+
+    def test_ranks_append_to_existing_columns(self):
+        existing = Ticket.objects.create(board=self.board, title='Already here', sort_order=5 << 16)
+        self._import(jsonl({'title': 'A'}, {'title': 'B'}), fmt='jsonl')
+        ranks = list(Ticket.objects.filter(status='todo').order_by('sort_order').values_list('title', flat=True))
+        self.assertEqual(ranks, [existing.title, 'A', 'B'])
+
+    def test_hierarchy_rules_checked_for_every_row(self):
+        rows = jsonl(
+            {'key': 'E', 'title': 'Epic', 'type': 'epic', 'parent': 'T'},
+            {'key': 'T', 'title': 'Ticket', 'type': 'ticket'},
+            {'key': 'B', 'title': 'Orphan bug', 'type': 'bug'},
+            {'key': 'B2', 'title': 'Bug under epic', 'type': 'bug', 'parent': 'E'},
+            {'key': 'X', 'title': 'Dangling', 'parent': 'nope', 'related': ['gone']},
+        )
+        with self.assertRaises(TicketImportError) as ctx:
+            self._import(rows, fmt='jsonl')
+        self.assertEqual(ctx.exception.errors, [
+            (1, 'Epics cannot have a parent.'),
+            (3, 'A bug must have a ticket as parent.'),
+            (4, 'A bug must have a ticket as parent.'),
+            (5, "Unknown parent key 'nope'"),
+            (5, "Unknown related key 'gone'"),
+        ])
+        self.assertFalse(Ticket.objects.exists())
+        self.assertEqual(Board.objects.get(pk=self.board.pk).version, 0)
+
+    def test_invalid_rows_are_all_reported_and_nothing_written(self):
+        rows = jsonl(
+            {'key': 'A', 'title': 'Fine'},
+            {'key': 'A', 'title': 'Duplicate'},
+            {'title': ''},
+            {'title': 'Too important', 'importance': 11},
+            {'title': 'Who', 'assignee': 'ghost'},
+        ) + 'not json\n'
+        with self.assertRaises(TicketImportError) as ctx:
+            self._import(rows, fmt='jsonl', chunk_size=1)
+        self.assertEqual([number for number, _ in ctx.exception.errors], [2, 3, 4, 5, 6])
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_dry_run_rolls_back(self):
+        result = self._import(CSV, dry_run=True)
+        self.assertEqual(result.created, 4)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_progress_reported_per_chunk(self):
+        seen = []
+        self._import(CSV, chunk_size=3, progress=lambda r: seen.append(r.rows))
+        self.assertEqual(seen, [3, 4])
+
+    def test_command(self):
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'w') as f:
+            f.write(CSV)
+        out = io.StringIO()
+        call_command('import_tickets', str(self.board.id), path, '--user', 'importer', stdout=out)
+        self.assertIn('Imported 4 ticket(s), 3 parent link(s) and 3 related link(s)', out.getvalue())
+        self.assertEqual(Ticket.objects.filter(updated_by=self.user).count(), 4)
+        with self.assertRaises(CommandError):
+            call_command('import_tickets', '9999', path, stdout=io.StringIO())
+
+    def test_upload_endpoint(self):
+        self.client.login(username='importer', password='pass123')
+        url = reverse('tickets:board-import', args=[self.board.id])
+        response = self.client.post(url, {'file': SimpleUploadedFile('board.csv', CSV.encode())})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['created'], 4)
+        bad = jsonl({'title': 'Bug', 'type': 'bug'})
+        response = self.client.post(url, {'file': SimpleUploadedFile('board.ndjson', bad.encode())})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'], [{'row': 1, 'error': 'A bug must have a ticket as parent.'}])
+        response = self.client.post(url, {'file': SimpleUploadedFile('board.xml', b'<x/>')})
+        self.assertEqual(response.status_code, 400)
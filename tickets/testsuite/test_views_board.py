@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth.models import User
 from tickets.models import Board, Ticket
@@ -40,6 +42,49 @@ class BoardViewTest(TestCase):
         self.assertIn('data-ticket-type="ticket"', html)
         self.assertIn('data-ticket-type="bug"', html)
 
+class BoardQueryBudgetTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='budget', password='12345')
+        self.client = Client()
+        self.client.login(username='budget', password='12345')
+        self.board = Board.objects.create(name='Budget Board')
+        self.url = reverse('tickets:board-view', args=[self.board.id])
+
+    def _add_tickets(self, count):
+        epic = Ticket.objects.create(title='Epic', board=self.board, ticket_type='epic')
+        statuses = ['todo', 'in_progress', 'done']
+        for i in range(count):
+            story = Ticket.objects.create(
+                title=f'Story {i}', board=self.board, ticket_type='ticket',
+                parent=epic, status=statuses[i % 3], sort_order=i,
+            )
+            Ticket.objects.create(
+                title=f'Bug {i}', board=self.board, ticket_type='bug',
+                parent=story, status=statuses[i % 3], sort_order=i,
+            )
+
+    def _count_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_does_not_grow_with_ticket_count(self):
+        self._add_tickets(2)
+        small = self._count_queries()
+        self._add_tickets(30)
+        large = self._count_queries()
+        self.assertEqual(small, large)
+
+    def test_columns_render_parent_badges(self):
+        self._add_tickets(3)
+        response = self.client.get(self.url)
+        grouped = response.context['grouped']
+        self.assertEqual(len(grouped['tickets']), 7)
+        self.assertEqual(len(grouped['by_type']['bug']), 3)
+        self.assertContains(response, 'ticket-parent-badge', count=6)
+
+
 class HomeViewTest(TestCase):
     def setUp(self):
         self.user = User.objects.create_user(username='testuser', password='12345')
@@ -0,0 +1,104 @@
+"""Paginated public theme gallery behind ``api/themes/public/``.
+
+Pages are keyset-paginated over an index (``-preference_count, id`` for
+"popular", ``name, id`` for "name") so a page costs one bounded query
+however many public themes exist. Each page is cached under the gallery
+version token (``themes.gallery_version``), derived from the public themes
+and preferences so every worker sees a write at once; the same token feeds
+the endpoint's ETag.
+"""
+import base64
+import binascii
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from .models_theme import UserTheme
+from .themes import gallery_version, theme_css_url
+
+GALLERY_PAGE_SIZE = 24
+MAX_GALLERY_PAGE_SIZE = 100
+GALLERY_CACHE_TIMEOUT = 5 * 60
+
+# order name -> (sort field, descending)
+GALLERY_ORDERINGS = {
+    'popular': ('preference_count', True),
+    'name': ('name', False),
+}
+DEFAULT_GALLERY_ORDER = 'popular'
+
+
+def _encode(value, pk):
+    raw = json.dumps([value, pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _decode(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as exc:
+        raise ValueError('Invalid cursor') from exc
+    if not isinstance(pk, int):
+        raise ValueError('Invalid cursor')
+    return value, pk
+
+
+def serialize_gallery_theme(theme):
+    return {
+        'id': theme.id,
+        'name': theme.name,
+        'owner': theme.user.username,
+        'preference_count': theme.preference_count,
+        'css_url': theme_css_url(theme.css_hash),
+    }
+
+
+def gallery_page(term='', order=DEFAULT_GALLERY_ORDER, cursor=None, limit=None):
+    """One page of public themes: ``{'themes': [...], 'next_cursor': str | None}``.
+
+    Raises ``ValueError`` on an unknown order or a bad cursor.
+    """
+    if order not in GALLERY_ORDERINGS:
+        raise ValueError('Invalid order')
+    field, descending = GALLERY_ORDERINGS[order]
+    limit = min(limit or GALLERY_PAGE_SIZE, MAX_GALLERY_PAGE_SIZE)
+    queryset = (
+        UserTheme.objects.filter(is_public=True)
+        .select_related('user')
+        .only('id', 'name', 'preference_count', 'css_hash', 'user__username')
+    )
+    if term:
+        queryset = queryset.filter(name__icontains=term)
+    if cursor:
+        value, pk = _decode(cursor)
+        if not isinstance(value, str if field == 'name' else int):
+            raise ValueError('Invalid cursor')
+        past = f'{field}__lt' if descending else f'{field}__gt'
+        queryset = queryset.filter(Q(**{past: value}) | Q(**{field: value, 'id__gt': pk}))
+    rows = list(queryset.order_by(f'-{field}' if descending else field, 'id')[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode(getattr(rows[-1], field), rows[-1].id)
+    return {'themes': [serialize_gallery_theme(t) for t in rows], 'next_cursor': next_cursor}
+
+
+def gallery_key(term, order, cursor, limit, version=None):
+    params = json.dumps([term, order, cursor, limit])
+    return f'theme:gallery:{version or gallery_version()}:{hashlib.md5(params.encode()).hexdigest()}'
+
+
+def cached_gallery_page(term='', order=DEFAULT_GALLERY_ORDER, cursor=None, limit=None, version=None):
+    """``gallery_page`` through the cache; errors are not cached.
+
+    ``version`` is a ``gallery_version()`` the caller already read.
+    """
+    key = gallery_key(term, order, cursor, limit, version)
+    page = cache.get(key)
+    if page is None:
+        page = gallery_page(term, order, cursor, limit)
+        cache.set(key, page, GALLERY_CACHE_TIMEOUT)
+    return page
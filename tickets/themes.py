@@ -0,0 +1,168 @@
+"""Resolved per-user theme: which theme applies, its colors and stylesheet.
+
+The active theme is the user's ``ThemePreference`` or, failing that, their
+most recently updated own theme. Resolving it takes two queries; the result
+(plain dicts, plus the user's theme list for the board's picker) is cached
+and memoized on the request, so the context processor, the board page ETag
+and the views share one lookup.
+
+Entries are keyed on a stamp of the rows they are built from (one
+aggregate query over the user's preference, the theme it points at and
+their own themes), so a write is seen by every worker at once, whatever
+the cache backend. Public gallery pages are cached the same way, under a
+version token derived from the public themes and the preferences.
+
+Each theme's ``:root`` CSS is compiled once, when the theme is saved, and
+stored with a hash of its content. Pages link to ``/themes/css/<hash>.css``,
+which is served with far-future immutable caching; switching themes only
+changes that URL.
+"""
+import hashlib
+import json
+import re
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Count, Max, Sum
+from django.urls import reverse
+
+from .models_theme import ThemePreference, UserTheme
+
+THEME_CACHE_TIMEOUT = 60 * 60
+
+THEME_COLOR_KEYS = ('primary', 'secondary', 'background', 'surface', 'text', 'accent', 'border', 'danger', 'success', 'info')
+DEFAULT_THEME_COLORS = {
+    'primary': '#bb86fc',
+    'secondary': '#6649a8',
+    'background': '#1a1625',
+    'surface': '#251f35',
+    'text': '#e1e1e6',
+    'accent': '#985eff',
+    'border': '#332b45',
+    'danger': '#cf6679',
+    'success': '#03dac6',
+    'info': '#8bb4fe',
+}
+
+
+def normalize_colors(raw):
+    """Theme colors keyed by the simple names (``primary_color`` -> ``primary``), empty values dropped."""
+    normalized = {}
+    for key, value in (raw or {}).items():
+        normalized[key[:-6] if key.endswith('_color') else key] = value
+    return {k: normalized[k] for k in THEME_COLOR_KEYS if normalized.get(k)}
+
+
+# Hex, rgb()/hsl() and named colors; anything else could break out of the rule.
+_SAFE_COLOR_RE = re.compile(r'^[#\w\s(),.%-]{1,64}$')
+
+
+def theme_css(colors):
+    """``:root`` custom properties for ``colors``, defaults filling the gaps."""
+    lines = [':root {']
+    for k in THEME_COLOR_KEYS:
+        value = colors.get(k)
+        if not isinstance(value, str) or not _SAFE_COLOR_RE.match(value):
+            value = DEFAULT_THEME_COLORS[k]
+        lines.append(f'    --{k}-color: {value};')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def compile_theme_css(colors):
+    """``(css_hash, css)`` of the stylesheet for raw theme ``colors``."""
+    css = theme_css(normalize_colors(colors))
+    return hashlib.sha256(css.encode()).hexdigest()[:32], css
+
+
+def compile_theme(theme):
+    """Refresh ``theme.css_hash``/``compiled_css`` from its colors (before it is saved)."""
+    theme.css_hash, theme.compiled_css = compile_theme_css(theme.colors if isinstance(theme.colors, dict) else {})
+
+
+DEFAULT_THEME_CSS_HASH, DEFAULT_THEME_CSS = compile_theme_css({})
+
+
+def theme_css_url(css_hash):
+    return reverse('tickets:theme-css', args=[css_hash or DEFAULT_THEME_CSS_HASH])
+
+
+def stylesheet(css_hash):
+    """Compiled CSS stored under ``css_hash``, or ``None``."""
+    if css_hash == DEFAULT_THEME_CSS_HASH:
+        return DEFAULT_THEME_CSS
+    return UserTheme.objects.filter(css_hash=css_hash).values_list('compiled_css', flat=True).first()
+
+
+def _fingerprint(data):
+    return hashlib.md5(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def theme_stamp(user_id):
+    """Changes whenever the user's preference, the theme it points at or any of their own themes changes."""
+    return _fingerprint(User.objects.filter(pk=user_id).aggregate(
+        own=Count('themes', distinct=True),
+        own_at=Max('themes__updated_at'),
+        theme=Max('theme_preference__theme_id'),
+        chosen_at=Max('theme_preference__updated_at'),
+        theme_at=Max('theme_preference__theme__updated_at'),
+    ))
+
+
+def user_key(user_id):
+    return f'theme:user:{user_id}:{theme_stamp(user_id)}'
+
+
+def _resolve(user):
+    pref = ThemePreference.objects.filter(user=user).select_related('theme').first()
+    own = list(UserTheme.objects.filter(user=user).order_by('-updated_at').values('id', 'name', 'colors', 'css_hash'))
+    if pref is not None and pref.theme is not None:
+        theme = pref.theme
+        active = {'id': theme.id, 'name': theme.name, 'colors': theme.colors, 'css_hash': theme.css_hash}
+    else:
+        active = own[0] if own else None
+    resolved = {
+        'theme': active,
+        'colors': normalize_colors(active['colors'] if active else None),
+        'css_url': theme_css_url(active['css_hash'] if active else None),
+        'own_themes': [{'id': t['id'], 'name': t['name']} for t in own],
+    }
+    resolved['fingerprint'] = _fingerprint(resolved)
+    return resolved
+
+
+def resolved_theme_for(user):
+    """Cached resolved theme of ``user``: ``theme`` (dict or None), ``colors``, ``css_url``, ``own_themes``, ``fingerprint``."""
+    key = user_key(user.pk)
+    resolved = cache.get(key)
+    if resolved is None:
+        resolved = _resolve(user)
+        cache.set(key, resolved, THEME_CACHE_TIMEOUT)
+    return resolved
+
+
+def resolve_theme(request):
+    """``resolved_theme_for(request.user)``, looked up at most once per request."""
+    resolved = getattr(request, '_resolved_theme', None)
+    if resolved is None:
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            resolved = {'theme': None, 'colors': {}, 'css_url': theme_css_url(None), 'own_themes': [], 'fingerprint': '-'}
+        else:
+            resolved = resolved_theme_for(user)
+        request._resolved_theme = resolved
+    return resolved
+
+
+def gallery_version():
+    """Token naming the current state of the public theme gallery (see ``theme_gallery.py``).
+
+    Public theme edits, publishing, deletes and preference-count moves
+    change the theme aggregate; a preference switching between two themes
+    (counts moving by one each way) changes the preference one.
+    """
+    themes = UserTheme.objects.filter(is_public=True).aggregate(
+        n=Count('id'), latest=Max('updated_at'), preferences=Sum('preference_count'),
+    )
+    preferences = ThemePreference.objects.aggregate(n=Count('id'), latest=Max('updated_at'))
+    return _fingerprint([themes, preferences])
@@ -0,0 +1,48 @@
+"""Board hierarchy as a nested tree (epic → ticket → bug).
+
+The whole board is read in one flat ``values_list`` query ordered by depth,
+so every parent is seen before its children and the tree is assembled in a
+single pass without model instances or recursive ORM access.
+"""
+from .models import Ticket, ancestor_ids_from_path
+
+TREE_FIELDS = (
+    'id', 'parent_id', 'path', 'title', 'status', 'ticket_type', 'priority_score', 'sort_order',
+    'descendant_count', 'descendant_done_count', 'open_bug_count',
+)
+
+
+def board_tree(board_id, statuses=None, types=None, max_depth=None):
+    """Nested ``[{..., 'children': [...]}]`` roots of a board's hierarchy.
+
+    With ``statuses``/``types`` only matching tickets are kept, together
+    with their ancestors so each match stays reachable from its root.
+    ``max_depth`` drops everything deeper (roots are depth 0). Siblings are
+    in board rank order. A ticket whose parent lives on another board is
+    returned as a root.
+    """
+    qs = Ticket.objects.filter(board_id=board_id)
+    if max_depth is not None:
+        qs = qs.filter(depth__lte=max_depth)
+    rows = list(qs.order_by('depth', 'sort_order', 'id').values_list(*TREE_FIELDS))
+
+    keep = None
+    if statuses or types:
+        keep = set()
+        for pk, _, path, _, status, ticket_type, *_ in rows:
+            if (not statuses or status in statuses) and (not types or ticket_type in types):
+                keep.add(pk)
+                keep.update(ancestor_ids_from_path(path))
+
+    nodes = {}
+    roots = []
+    for row in rows:
+        node = dict(zip(TREE_FIELDS, row))
+        if keep is not None and node['id'] not in keep:
+            continue
+        del node['path'], node['sort_order']
+        node['children'] = []
+        nodes[node['id']] = node
+        parent = nodes.get(node['parent_id'])
+        (parent['children'] if parent else roots).append(node)
+    return roots
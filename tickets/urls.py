@@ -1,6 +1,6 @@
 from django.urls import path
 from django.contrib.auth.views import LogoutView
-from . import views, views_theme, views_position
+from . import views, views_board, views_live, views_theme, views_position
 
 urlpatterns = [
     path('', views.home, name='home'),
@@ -8,10 +8,26 @@ urlpatterns = [
     path('board/<int:board_id>/ticket/new/', views.ticket_new, name='ticket_new'),
     path('ticket/<int:ticket_id>/edit/', views.ticket_edit, name='ticket-edit'),
     path('update-ticket-status/', views.update_ticket_status, name='update-ticket-status'),
+
+    # Board JSON API
+    path('api/boards/<int:board_id>/columns/<str:status>/', views_board.board_column, name='board-column'),
+    path('api/boards/<int:board_id>/changes/', views_board.board_changes_since, name='board-changes'),
+    path('api/boards/<int:board_id>/matrix/', views_board.board_matrix, name='board-matrix'),
+    path('api/boards/<int:board_id>/tree/', views_board.board_hierarchy, name='board-tree'),
+    path('api/boards/<int:board_id>/graph/', views_board.board_dependency_graph, name='board-graph'),
+    path('api/tickets/<int:ticket_id>/dependencies/', views_board.ticket_dependencies, name='ticket-dependencies'),
+    path('api/boards/<int:board_id>/search/', views_board.board_search, name='board-search'),
+    path('api/boards/<int:board_id>/autocomplete/parents/', views_board.parent_autocomplete, name='parent-autocomplete'),
+    path('api/autocomplete/users/', views_board.assignee_autocomplete, name='assignee-autocomplete'),
+    path('api/boards/<int:board_id>/export/', views_board.board_export, name='board-export'),
+    path('api/boards/<int:board_id>/import/', views_board.board_import, name='board-import'),
+    path('api/boards/<int:board_id>/events/', views_live.board_events, name='board-events'),
     
     # Theme management endpoints
     path('themes/create/', views_theme.theme_creator, name='theme-creator'),
+    path('themes/css/<str:css_hash>.css', views_theme.theme_stylesheet, name='theme-css'),
     path('api/themes/', views_theme.get_themes, name='get_themes'),
+    path('api/themes/public/', views_theme.public_themes, name='public-themes'),
     path('api/themes/<int:theme_id>/', views_theme.get_single_theme, name='get_single_theme'),
     path('api/themes/save/', views_theme.save_theme, name='save_theme'),
     path('api/themes/set-preference/', views_theme.set_theme_preference, name='set_theme_preference'),
@@ -19,6 +35,7 @@ urlpatterns = [
     
     # Ticket position management
     path('api/tickets/update-position/', views_position.update_ticket_position, name='update-ticket-position'),
+    path('api/tickets/batch-move/', views_position.batch_move_tickets, name='batch-move-tickets'),
     
     # Authentication
     path('logout/', LogoutView.as_view(next_page='/'), name='logout'),
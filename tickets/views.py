@@ -3,9 +3,16 @@ from django.http import JsonResponse
 import json
 from django.contrib.auth.decorators import login_required
 from django.urls import reverse
+from django.views.decorators.http import etag
+from .activity import record_activity
+from .audit import describe_changes
+from .board_loader import COLUMN_ORDERINGS, DEFAULT_COLUMN_ORDER, column_page_size, load_board
+from .etags import board_page_etag
 from .forms import TicketForm
-from .models import Board, Ticket, TicketActivity, TicketComment
-from .models_theme import ThemePreference, UserTheme
+from .graph import get_board_graph
+from .models import Board, Ticket, TicketActivity, TicketActivitySummary, TicketComment
+from .ranking import next_rank, rank_for_drop
+from .themes import resolve_theme
 from django.utils.timezone import now
 from django import template
 
@@ -21,12 +28,11 @@ def ticket_new(request, board_id):
             ticket.board = board
             # 'created_by' field was removed from the Ticket model; keep updated_by for audit trail if needed
             ticket.updated_by = request.user
+            ticket.sort_order = next_rank(board.id, ticket.status)
             ticket.save()
-            TicketActivity.objects.create(
-                ticket=ticket,
-                user=request.user,
-                activity_type='created',
-                description=f'Created {ticket.ticket_type} {ticket.title}'
+            record_activity(
+                ticket, request.user, 'created',
+                f'Created {ticket.ticket_type} {ticket.title}',
             )
             return redirect('tickets:board-view', board_id=board.id)
     else:
@@ -61,44 +67,36 @@ def get_importance_label(ticket):
     return labels.get(ticket.importance, '')
 
 @login_required
+@etag(board_page_etag)
 def board_view(request, board_id):
     board = get_object_or_404(Board, id=board_id)
-    tickets = Ticket.objects.filter(board=board).order_by('sort_order')
-    user_theme = None
-    # Accessing reverse one-to-one relation can raise ThemePreference.DoesNotExist
-    try:
-        pref = request.user.theme_preference  # reverse OneToOne descriptor
-    except ThemePreference.DoesNotExist:  # type: ignore[attr-defined]
-        pref = None
-    if pref and getattr(pref, 'theme', None):
-        user_theme = pref.theme
-    else:
-        # fallback: latest user-owned theme
-        user_theme = UserTheme.objects.filter(user=request.user).order_by('-updated_at').first()
-    all_user_themes = list(UserTheme.objects.filter(user=request.user).values('id','name'))
-    public_themes = list(UserTheme.objects.filter(is_public=True).exclude(user=request.user).values('id','name'))
-    grouped = {
-        'tickets': tickets,
-        'by_status': {
-            'todo': tickets.filter(status='todo'),
-            'in_progress': tickets.filter(status='in_progress'),
-            'done': tickets.filter(status='done'),
-        },
-        'by_type': {
-            'epic': tickets.filter(ticket_type='epic'),
-            'ticket': tickets.filter(ticket_type='ticket'),
-            'bug': tickets.filter(ticket_type='bug'),
-        }
-    }
-    recent_activity = TicketActivity.objects.filter(ticket__board=board).select_related('ticket', 'user').order_by('-timestamp')[:10]
+    # Cached per user (see themes.py); the board ETag already resolved it for this request
+    resolved = resolve_theme(request)
+    user_theme = resolved['theme']
+    all_user_themes = resolved['own_themes']
+    # Other public themes load lazily from the gallery API; only the one in use is rendered.
+    own_ids = {t['id'] for t in all_user_themes}
+    active_public_theme = user_theme if user_theme and user_theme['id'] not in own_ids else None
+    order = request.GET.get('order')
+    if order not in COLUMN_ORDERINGS:
+        order = DEFAULT_COLUMN_ORDER
+    grouped = load_board(board, column_limit=column_page_size(), order=order)
+    get_board_graph(board).mark_blocked(grouped['tickets'])
+    recent_activity = list(TicketActivity.objects.filter(board=board).select_related('user').order_by('-timestamp')[:10])
+    # Older days live on as archive summaries; they fill the feed once the rows run out.
+    archived_activity = []
+    if len(recent_activity) < 10:
+        archived_activity = TicketActivitySummary.objects.filter(board=board).order_by('-day', '-last_at')[:10 - len(recent_activity)]
     return render(request, 'tickets/board.html', {
         'board': board,
         'grouped': grouped,
+        'column_order': order,
         'recent_activity': recent_activity,
+        'archived_activity': archived_activity,
         'user_theme': user_theme,
         'available_user_themes': all_user_themes,
-        'available_public_themes': public_themes,
-        'active_theme_colors': getattr(user_theme, 'colors', {}) if user_theme else {}
+        'active_public_theme': active_public_theme,
+        'active_theme_colors': user_theme['colors'] if user_theme else {}
     })
 
 @login_required
@@ -109,28 +107,20 @@ def ticket_edit(request, ticket_id):
         body = request.POST.get('comment_body', '').strip()
         if body:
             TicketComment.objects.create(ticket=ticket, user=request.user, body=body)
-            TicketActivity.objects.create(
-                ticket=ticket,
-                user=request.user,
-                activity_type='commented',
-                description=f'Comment added ({len(body)} chars)'
+            record_activity(
+                ticket, request.user, 'commented',
+                f'Comment added ({len(body)} chars)',
             )
         return redirect('tickets:ticket-edit', ticket_id=ticket.id)
     if request.method == "POST" and not comment_mode:
         form = TicketForm(request.POST, instance=ticket)
         if form.is_valid():
-            before = {f: getattr(ticket, f) for f in ['title','description','status','priority','importance','urgency','ticket_type','assignee_id','parent_id']}
+            # The form has already applied its values; diff them against the loaded row
+            description = describe_changes(ticket.audited_changes())
             updated = form.save()
-            after = {f: getattr(updated, f) for f in before}
-            changed_parts = []
-            for k in before:
-                if before[k] != after[k]:
-                    changed_parts.append(f"{k}={before[k]}→{after[k]}")
-            TicketActivity.objects.create(
-                ticket=updated,
-                user=request.user,
-                activity_type='updated',
-                description=('; '.join(changed_parts) if changed_parts else 'No material field changes')
+            record_activity(
+                updated, request.user, 'updated',
+                description or 'No material field changes',
             )
             return redirect('tickets:board-view', board_id=updated.board.id)
     else:
@@ -140,6 +130,7 @@ def ticket_edit(request, ticket_id):
         'form': form,
         'ticket': ticket,
         'comments': comments,
+        'archived_activity': ticket.activity_summaries.order_by('-day', 'activity_type'),
         'action': 'Edit',
         'title': 'Edit Ticket'
     })
@@ -153,6 +144,8 @@ def update_ticket_status(request):
         ticket_id = data.get('ticket_id')
         new_status = data.get('new_status')
         new_sort_order = data.get('sort_order')
+        # Preferred: neighbour ids from the drop target, ranked server-side
+        reposition = 'before_id' in data or 'after_id' in data
         if not ticket_id or not new_status:
             return JsonResponse({'success': False, 'error': 'Missing ticket_id or new_status'})
         valid_statuses = dict(Ticket.STATUS_CHOICES).keys()
@@ -164,20 +157,24 @@ def update_ticket_status(request):
             old_status = ticket.status
             ticket.status = new_status
             changes.append(f'Status changed from {old_status} to {new_status}')
-        if new_sort_order is not None:
-            old_order = ticket.sort_order
+        if reposition:
+            ticket.sort_order = rank_for_drop(
+                ticket.board_id, new_status,
+                before_id=data.get('before_id'), after_id=data.get('after_id'),
+                exclude_id=ticket.id,
+            )
+            changes.append('Priority reordered')
+        elif new_sort_order is not None:
             ticket.sort_order = new_sort_order
             changes.append('Priority reordered')
         ticket.updated_by = request.user
-        ticket.save()
+        ticket.save(update_fields=['status', 'sort_order', 'updated_by'])
         if changes:
-            TicketActivity.objects.create(
-                ticket=ticket,
-                user=request.user,
-                activity_type='updated',
-                description=', '.join(changes)
+            record_activity(
+                ticket, request.user, 'updated',
+                ', '.join(changes),
             )
-        return JsonResponse({'success': True})
+        return JsonResponse({'success': True, 'sort_order': ticket.sort_order})
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)})
 
@@ -0,0 +1,291 @@
+import io
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import etag, require_http_methods
+from .autocomplete import parent_choices, serialize_parent, serialize_user, user_choices
+from .board_loader import COLUMN_ORDERINGS, DEFAULT_COLUMN_ORDER, column_page, serialize_ticket
+from .etags import board_data_etag
+from .exporter import BoardExport, ExportError, parse_since
+from .graph import get_board_graph
+from .importer import TicketImportError, import_tickets, normalize_format
+from .matrix import MAX_MATRIX_TOP, build_matrix
+from .models import Board, Ticket
+from .search import DEFAULT_SEARCH_LIMIT, search_tickets, search_tokens
+from .sync import board_changes
+from .tree import board_tree
+
+
+def _requested_values(request, param):
+    """Collect ``?<param>=`` filters, accepting repeated params or a comma list."""
+    values = []
+    for raw in request.GET.getlist(param):
+        values.extend(v for v in raw.split(',') if v)
+    return values
+
+
+@login_required
+@require_http_methods(["GET"])
+@etag(board_data_etag)
+def board_column(request, board_id, status):
+    """One page of a board column, keyset-paginated in ``?order=`` (rank or priority)."""
+    board = get_object_or_404(Board, id=board_id)
+    if status not in dict(Ticket.STATUS_CHOICES):
+        return JsonResponse({'success': False, 'error': 'Invalid status'}, status=400)
+    types = _requested_values(request, 'type')
+    valid_types = dict(Ticket.TICKET_TYPE_CHOICES)
+    if any(t not in valid_types for t in types):
+        return JsonResponse({'success': False, 'error': 'Invalid ticket type'}, status=400)
+    try:
+        limit = int(request.GET['limit']) if request.GET.get('limit') else None
+        if limit is not None and limit < 1:
+            raise ValueError
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid limit'}, status=400)
+    order = request.GET.get('order') or DEFAULT_COLUMN_ORDER
+    if order not in COLUMN_ORDERINGS:
+        return JsonResponse({'success': False, 'error': 'Invalid order'}, status=400)
+    try:
+        tickets, next_cursor = column_page(board, status, types=types, cursor=request.GET.get('cursor'), limit=limit, order=order)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    get_board_graph(board).mark_blocked(tickets)
+    return JsonResponse({
+        'success': True,
+        'status': status,
+        'order': order,
+        'tickets': [serialize_ticket(t) for t in tickets],
+        'next_cursor': next_cursor,
+    })
+
+
+@login_required
+@require_http_methods(["GET"])
+@etag(board_data_etag)
+def board_changes_since(request, board_id):
+    """Delta sync: tickets, deletions and activities after ``?since=<cursor>``."""
+    try:
+        since = int(request.GET['since'])
+        limit = int(request.GET['limit']) if request.GET.get('limit') else None
+        if since < 0 or (limit is not None and limit < 1):
+            raise ValueError
+    except (KeyError, ValueError):
+        return JsonResponse({'success': False, 'error': 'since must be a non-negative integer cursor'}, status=400)
+    changes = board_changes(board_id, since, limit=limit)
+    if changes is None:
+        return JsonResponse({'success': False, 'error': 'Board not found'}, status=404)
+    return JsonResponse({'success': True, **changes})
+
+
+@login_required
+@require_http_methods(["GET"])
+@etag(board_data_etag)
+def board_matrix(request, board_id):
+    """Importance × urgency cell counts, optionally with the ``?top=K`` tickets per cell."""
+    if not Board.objects.filter(pk=board_id).exists():
+        return JsonResponse({'success': False, 'error': 'Board not found'}, status=404)
+    statuses = _requested_values(request, 'status')
+    if any(s not in dict(Ticket.STATUS_CHOICES) for s in statuses):
+        return JsonResponse({'success': False, 'error': 'Invalid status'}, status=400)
+    types = _requested_values(request, 'type')
+    if any(t not in dict(Ticket.TICKET_TYPE_CHOICES) for t in types):
+        return JsonResponse({'success': False, 'error': 'Invalid ticket type'}, status=400)
+    try:
+        top = int(request.GET.get('top') or 0)
+        if not 0 <= top <= MAX_MATRIX_TOP:
+            raise ValueError
+    except ValueError:
+        return JsonResponse({'success': False, 'error': f'top must be between 0 and {MAX_MATRIX_TOP}'}, status=400)
+    return JsonResponse({'success': True, **build_matrix(board_id, statuses=statuses, types=types, top=top)})
+
+
+@login_required
+@require_http_methods(["GET"])
+@etag(board_data_etag)
+def board_hierarchy(request, board_id):
+    """The board's epic → ticket → bug tree, prunable by ``?status=``, ``?type=`` and ``?depth=``."""
+    if not Board.objects.filter(pk=board_id).exists():
+        return JsonResponse({'success': False, 'error': 'Board not found'}, status=404)
+    statuses = _requested_values(request, 'status')
+    if any(s not in dict(Ticket.STATUS_CHOICES) for s in statuses):
+        return JsonResponse({'success': False, 'error': 'Invalid status'}, status=400)
+    types = _requested_values(request, 'type')
+    if any(t not in dict(Ticket.TICKET_TYPE_CHOICES) for t in types):
+        return JsonResponse({'success': False, 'error': 'Invalid ticket type'}, status=400)
+    try:
+        max_depth = int(request.GET['depth']) if request.GET.get('depth') else None
+        if max_depth is not None and max_depth < 0:
+            raise ValueError
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'depth must be a non-negative integer'}, status=400)
+    return JsonResponse({'success': True, 'tree': board_tree(board_id, statuses=statuses, types=types, max_depth=max_depth)})
+
+
+@login_required
+@require_http_methods(["GET"])
+@etag(board_data_etag)
+def board_dependency_graph(request, board_id):
+    """Dependency analysis of a board: blocked tickets, topological order, cycles, critical path."""
+    graph = get_board_graph(board_id)
+    if graph is None:
+        return JsonResponse({'success': False, 'error': 'Board not found'}, status=404)
+    return JsonResponse({'success': True, **graph.as_dict()})
+
+
+@login_required
+@require_http_methods(["GET"])
+def ticket_dependencies(request, ticket_id):
+    """Direct and transitive blockers/dependents of one ticket."""
+    ticket = get_object_or_404(Ticket.objects.only('id', 'board_id'), id=ticket_id)
+    graph = get_board_graph(ticket.board_id)
+    return JsonResponse({
+        'success': True,
+        'ticket_id': ticket.id,
+        'version': graph.version,
+        'blocked': ticket.id in graph.blocked,
+        'blockers': sorted(graph.blockers.get(ticket.id, ())),
+        'transitive_blockers': sorted(graph.transitive_blockers(ticket.id)),
+        'dependents': sorted(graph.dependents.get(ticket.id, ())),
+        'transitive_dependents': sorted(graph.transitive_dependents(ticket.id)),
+        'in_cycle': any(ticket.id in cycle for cycle in graph.cycles),
+    })
+
+
+def _autocomplete_limit(request):
+    """``?limit=`` as a positive int (``None`` for the default); raises ``ValueError``."""
+    limit = int(request.GET['limit']) if request.GET.get('limit') else None
+    if limit is not None and limit < 1:
+        raise ValueError('Invalid limit')
+    return limit
+
+
+@login_required
+@require_http_methods(["GET"])
+@etag(board_data_etag)
+def parent_autocomplete(request, board_id):
+    """Page of tickets on this board that can parent a ``?type=`` ticket, matching ``?q=``."""
+    if not Board.objects.filter(id=board_id).exists():
+        return JsonResponse({'success': False, 'error': 'Board not found'}, status=404)
+    ticket_type = request.GET.get('type') or 'ticket'
+    if ticket_type not in dict(Ticket.TICKET_TYPE_CHOICES):
+        return JsonResponse({'success': False, 'error': 'Invalid ticket type'}, status=400)
+    try:
+        limit = _autocomplete_limit(request)
+        exclude_id = int(request.GET['exclude']) if request.GET.get('exclude') else None
+        tickets, next_cursor = parent_choices(
+            board_id, ticket_type, term=request.GET.get('q', '').strip(),
+            cursor=request.GET.get('cursor'), limit=limit, exclude_id=exclude_id,
+        )
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    return JsonResponse({'success': True, 'results': [serialize_parent(t) for t in tickets], 'next_cursor': next_cursor})
+
+
+@login_required
+@require_http_methods(["GET"])
+def assignee_autocomplete(request):
+    """Page of active users matching ``?q=``, ordered by username."""
+    try:
+        users, next_cursor = user_choices(
+            term=request.GET.get('q', '').strip(), cursor=request.GET.get('cursor'), limit=_autocomplete_limit(request),
+        )
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    return JsonResponse({'success': True, 'results': [serialize_user(u) for u in users], 'next_cursor': next_cursor})
+
+
+@login_required
+@require_http_methods(["GET"])
+@etag(board_data_etag)
+def board_search(request, board_id):
+    """Tickets on this board matching ``?q=`` in title, description or comments, best match first."""
+    if not Board.objects.filter(id=board_id).exists():
+        return JsonResponse({'success': False, 'error': 'Board not found'}, status=404)
+    query = request.GET.get('q', '').strip()
+    if not search_tokens(query):
+        return JsonResponse({'success': False, 'error': 'Search query is required'}, status=400)
+    try:
+        limit = int(request.GET['limit']) if request.GET.get('limit') else DEFAULT_SEARCH_LIMIT
+        if limit < 1:
+            raise ValueError
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid limit'}, status=400)
+    tickets = search_tickets(query, board_id=board_id, limit=limit)
+    return JsonResponse({'success': True, 'query': query, 'tickets': [serialize_ticket(t) for t in tickets]})
+
+
+@login_required
+@require_http_methods(["POST"])
+def board_import(request, board_id):
+    """Import an uploaded CSV or JSON-lines ``file`` into this board (see ``tickets.importer``).
+
+    ``format`` defaults to the file's extension; ``dry_run=1`` validates and
+    rolls back. Invalid rows are listed under ``errors`` and nothing is written.
+    """
+    board = get_object_or_404(Board, id=board_id)
+    upload = request.FILES.get('file')
+    if upload is None:
+        return JsonResponse({'success': False, 'error': 'A file upload is required'}, status=400)
+    try:
+        fmt = normalize_format(request.POST.get('format'), upload.name)
+        result = import_tickets(
+            board, io.TextIOWrapper(upload.file, encoding='utf-8', newline=''), fmt,
+            user=request.user, dry_run=request.POST.get('dry_run') in ('1', 'true'),
+        )
+    except TicketImportError as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e),
+            'error_count': e.error_count,
+            'errors': [{'row': number, 'error': message} for number, message in e.errors],
+        }, status=400)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    return JsonResponse({'success': True, **result.as_dict()})
+
+
+async def _async_chunks(chunks):
+    # Advance the sync generator one block at a time on the thread holding its
+    # cursor; ASGI would otherwise read the whole export into a list first.
+    done = object()
+    while True:
+        chunk = await sync_to_async(next, thread_sensitive=True)(chunks, done)
+        if chunk is done:
+            return
+        yield chunk
+
+
+@login_required
+@require_http_methods(["GET"])
+def board_export(request, board_id):
+    """Stream this board's records as CSV or JSON lines (see ``tickets.exporter``).
+
+    ``?format=csv|jsonl`` (``ndjson`` too), ``?include=tickets,comments,activities``
+    (CSV takes one), ``?columns=``, ``?status=``, ``?type=`` and
+    ``?updated_since=`` (ISO date or datetime).
+    """
+    if not Board.objects.filter(id=board_id).exists():
+        return JsonResponse({'success': False, 'error': 'Board not found'}, status=404)
+    try:
+        since = request.GET.get('updated_since')
+        export = BoardExport(
+            board_id,
+            fmt=request.GET.get('format') or 'csv',
+            kinds=_requested_values(request, 'include'),
+            columns=_requested_values(request, 'columns'),
+            statuses=_requested_values(request, 'status'),
+            types=_requested_values(request, 'type'),
+            since=parse_since(since) if since else None,
+        )
+    except ExportError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    chunks = export.chunks()
+    if isinstance(request, ASGIRequest):
+        chunks = _async_chunks(chunks)
+    response = StreamingHttpResponse(chunks, content_type=export.content_type)
+    response['Content-Disposition'] = f'attachment; filename="{export.filename}"'
+    response['Cache-Control'] = 'no-store'
+    return response
@@ -0,0 +1,50 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from .live import get_broker
+from .models import Board
+
+KEEPALIVE_SECONDS = 15
+
+
+def _sse(event, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+async def _event_stream(board_id, version):
+    yield 'retry: 3000\n\n'
+    yield _sse('hello', {'board_id': board_id, 'version': version})
+    async for event in get_broker().subscribe(board_id, timeout=KEEPALIVE_SECONDS):
+        if event is None:
+            yield ': keep-alive\n\n'
+            continue
+        seq = (event.get('ticket') or {}).get('change_seq')
+        yield _sse(event['type'], event, event_id=seq)
+
+
+async def board_events(request, board_id):
+    """Server-sent event stream of live changes on a board.
+
+    Needs the ASGI entry point (``odyssey.asgi``): under WSGI a streaming
+    response would pin a worker thread forever, so clients are told to fall
+    back to polling the delta-sync endpoint instead.
+    """
+    is_authenticated = await sync_to_async(lambda: request.user.is_authenticated)()
+    if not is_authenticated:
+        return JsonResponse({'success': False, 'error': 'Authentication required'}, status=401)
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'success': False, 'error': 'Live updates require the ASGI server'}, status=501)
+    version = await Board.objects.filter(pk=board_id).values_list('version', flat=True).afirst()
+    if version is None:
+        return JsonResponse({'success': False, 'error': 'Board not found'}, status=404)
+    response = StreamingHttpResponse(_event_stream(board_id, version), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
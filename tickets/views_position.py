@@ -1,7 +1,9 @@
 from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_http_methods
+from .board_loader import serialize_ticket
 from .models import Ticket
+from .moves import MoveError, apply_moves
 import json
 
 @login_required
@@ -47,4 +49,22 @@ def update_ticket_position(request):
         return JsonResponse({
             'success': False,
             'error': str(e)
-        })
\ No newline at end of file
+        })
+
+@login_required
+@require_http_methods(["POST"])
+def batch_move_tickets(request):
+    """Apply several drag-and-drop moves in one transaction.
+
+    Body: ``{"moves": [{"ticket_id", "status", "before_id"?, "after_id"?}]}``.
+    Returns the new state of every moved ticket.
+    """
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid JSON'}, status=400)
+    try:
+        moved = apply_moves(data.get('moves') if isinstance(data, dict) else None, request.user)
+    except MoveError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    return JsonResponse({'success': True, 'tickets': [serialize_ticket(t) for t in moved]})
@@ -1,11 +1,14 @@
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import etag, require_http_methods
+from .etags import public_themes_etag, themes_etag
 from .models_theme import UserTheme, ThemePreference
 from .models import Ticket
+from .theme_gallery import DEFAULT_GALLERY_ORDER, cached_gallery_page
+from .themes import resolve_theme, stylesheet, theme_css_url
 import json
 
 @login_required
@@ -52,15 +55,7 @@ def theme_creator(request):
         return redirect('board-view', board_id=board_id)
         
     # Use active theme if one is set (preference then latest user theme) for prefill
-    active = None
-    try:
-        pref = request.user.theme_preference
-        if pref and pref.theme:
-            active = pref.theme
-    except ThemePreference.DoesNotExist:  # type: ignore[attr-defined]
-        active = None
-    if not active:
-        active = UserTheme.objects.filter(user=request.user).order_by('-updated_at').first()
+    active = resolve_theme(request)['theme']
     base_defaults = {
         'primary': '#007bff',
         'secondary': '#6c757d',
@@ -69,9 +64,9 @@ def theme_creator(request):
         'text': '#212529',
         'accent': '#28a745'
     }
-    if active and isinstance(active.colors, dict):
+    if active and isinstance(active['colors'], dict):
         # Merge active colors over defaults (supports partial dicts)
-        merged = {**base_defaults, **active.colors}
+        merged = {**base_defaults, **active['colors']}
     else:
         merged = base_defaults
     return render(request, 'tickets/theme_creator.html', {
@@ -79,6 +74,16 @@ def theme_creator(request):
         'active_theme': active
     })
 
+@require_http_methods(["GET", "HEAD"])
+def theme_stylesheet(request, css_hash):
+    """Compiled theme CSS. The URL changes with the content, so it can be cached forever."""
+    css = stylesheet(css_hash)
+    if css is None:
+        return HttpResponse(status=404, content_type='text/css')
+    response = HttpResponse(css, content_type='text/css; charset=utf-8')
+    response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
 @login_required
 def save_theme(request):
     """API endpoint for updating existing themes"""
@@ -99,7 +104,8 @@ def save_theme(request):
         
         return JsonResponse({
             'success': True,
-            'message': 'Theme updated successfully'
+            'message': 'Theme updated successfully',
+            'css_url': theme_css_url(theme.css_hash),
         })
         
     except UserTheme.DoesNotExist:
@@ -108,26 +114,41 @@ def save_theme(request):
         return JsonResponse({'success': False, 'error': str(e)})
 
 @login_required
+@etag(themes_etag)
 def get_themes(request):
-    # Get user's themes
+    # The user's own themes; public ones are paged from the gallery (public_themes)
     user_themes = UserTheme.objects.filter(user=request.user)
     
-    # Get public themes from other users
-    public_themes = UserTheme.objects.filter(
-        is_public=True
-    ).exclude(user=request.user)
-    
     themes = {
         'user_themes': list(user_themes.values('id', 'name', 'colors', 'is_public')),
-        'public_themes': list(public_themes.values('id', 'name', 'colors', 'user__username'))
     }
     
     return JsonResponse(themes)
 
+@login_required
+@require_http_methods(["GET"])
+@etag(public_themes_etag)
+def public_themes(request):
+    """Page of public themes matching ``?q=``, ``?order=popular|name``, continued with ``?cursor=``."""
+    try:
+        limit = int(request.GET['limit']) if request.GET.get('limit') else None
+        if limit is not None and limit < 1:
+            raise ValueError('Invalid limit')
+        page = cached_gallery_page(
+            term=request.GET.get('q', '').strip(),
+            order=request.GET.get('order') or DEFAULT_GALLERY_ORDER,
+            cursor=request.GET.get('cursor'),
+            limit=limit,
+            version=getattr(request, '_gallery_version', None),
+        )
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    return JsonResponse({'success': True, 'results': page['themes'], 'next_cursor': page['next_cursor']})
+
 @login_required
 def get_single_theme(request, theme_id):
     theme = get_object_or_404(UserTheme, id=theme_id)
-    return JsonResponse({'id': theme.id, 'name': theme.name, 'colors': theme.colors, 'is_public': theme.is_public, 'owner': theme.user.username})
+    return JsonResponse({'id': theme.id, 'name': theme.name, 'colors': theme.colors, 'is_public': theme.is_public, 'owner': theme.user.username, 'css_url': theme_css_url(theme.css_hash)})
 
 @login_required
 def set_theme_preference(request):
@@ -144,7 +165,8 @@ def set_theme_preference(request):
         pref, _ = ThemePreference.objects.get_or_create(user=request.user)
         pref.theme = theme
         pref.save()
-        return JsonResponse({'success': True})
+        # Pages swap their theme <link> to this URL; nothing is rebuilt
+        return JsonResponse({'success': True, 'css_url': resolve_theme(request)['css_url']})
     except UserTheme.DoesNotExist:
         return JsonResponse({'success': False, 'error': 'Theme not found'})
     except Exception as e: